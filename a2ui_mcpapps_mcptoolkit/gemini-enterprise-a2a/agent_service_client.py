@@ -0,0 +1,63 @@
+"""Async client for the Java agent-service review/approval API."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import httpx
+
+
+class AgentServiceClient:
+    """Async client for the Java agent-service review/approval API.
+
+    One keep-alive connection pool is shared by every A2A task on the worker,
+    and a semaphore bounds how many agent-service calls run at once so a
+    burst of Gemini sessions cannot exhaust the service.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30.0,
+        max_concurrency: int = 16,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def post(self, path: str, values: dict[str, Any]) -> dict[str, Any]:
+        async with self._semaphore:
+            response = await self._http().post(path, data=values)
+        if response.is_error:
+            try:
+                message = response.json().get("error")
+            except Exception:
+                message = None
+            raise ValueError(
+                message
+                or f"HTTP Error {response.status_code}: {response.reason_phrase}"
+            )
+        return response.json()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -2,14 +2,11 @@
 
 from __future__ import annotations
 
-import asyncio
 import json
 import os
 import re
+from contextlib import asynccontextmanager
 from typing import Any
-from urllib.error import HTTPError
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 
 import uvicorn
 from a2a.server.agent_execution import AgentExecutor
@@ -37,10 +34,17 @@ from a2ui.a2a.parts import create_a2ui_part
 from a2ui.schema.constants import VERSION_0_8
 
 from a2ui_payloads import result_messages, review_messages
+from agent_service_client import AgentServiceClient
 
 AGENT_SERVICE_URL = os.environ.get(
     "AGENT_SERVICE_URL", "http://127.0.0.1:8080"
 ).rstrip("/")
+AGENT_SERVICE_TIMEOUT_SECONDS = float(
+    os.environ.get("AGENT_SERVICE_TIMEOUT_SECONDS", "30")
+)
+AGENT_SERVICE_MAX_CONCURRENCY = int(
+    os.environ.get("AGENT_SERVICE_MAX_CONCURRENCY", "16")
+)
 BIND_HOST = os.environ.get("BIND_HOST", "0.0.0.0")
 PORT = int(
     os.environ.get(
@@ -137,6 +141,11 @@ def build_agent_card() -> AgentCard:
     )
 
 
+agent_service = AgentServiceClient(
+    AGENT_SERVICE_URL, AGENT_SERVICE_TIMEOUT_SECONDS, AGENT_SERVICE_MAX_CONCURRENCY
+)
+
+
 class SupplyChainExecutor(AgentExecutor):
     async def execute(self, context, event_queue) -> None:
         updater = TaskUpdater(event_queue, context.task_id, context.context_id)
@@ -151,8 +160,7 @@ class SupplyChainExecutor(AgentExecutor):
             else:
                 prompt = context.get_user_input("")
                 minimum_risk, maximum_rows = _query_parameters(prompt)
-                review = await asyncio.to_thread(
-                    _post_agent,
+                review = await agent_service.post(
                     "/api/reviews",
                     {
                         "minimumStockoutRisk": minimum_risk,
@@ -209,8 +217,7 @@ async def _handle_action(
         notes = str(values.get("approvalNotes", "")).strip()
         if len(notes) < 10:
             raise ValueError("Approval notes must contain at least 10 characters")
-        result = await asyncio.to_thread(
-            _post_agent,
+        result = await agent_service.post(
             "/api/approve",
             {
                 "approvalId": _required(values, "approvalId"),
@@ -237,8 +244,7 @@ async def _handle_action(
             ),
         ]
     if name == "rejectInventoryTransferReview":
-        await asyncio.to_thread(
-            _post_agent,
+        await agent_service.post(
             "/api/reject",
             {
                 "approvalId": _required(values, "approvalId"),
@@ -296,25 +302,6 @@ def _query_parameters(prompt: str) -> tuple[float, int]:
     return minimum_risk, maximum_rows
 
 
-def _post_agent(path: str, values: dict[str, Any]) -> dict[str, Any]:
-    request = Request(
-        f"{AGENT_SERVICE_URL}{path}",
-        data=urlencode(values).encode("utf-8"),
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-        method="POST",
-    )
-    try:
-        with urlopen(request, timeout=30) as response:
-            return json.load(response)
-    except HTTPError as exc:
-        try:
-            payload = json.load(exc)
-            message = payload.get("error", str(exc))
-        except Exception:
-            message = str(exc)
-        raise ValueError(message) from exc
-
-
 def _required(values: dict[str, Any], name: str) -> str:
     value = str(values.get(name, "")).strip()
     if not value:
@@ -327,10 +314,18 @@ handler = DefaultRequestHandler(
     task_store=InMemoryTaskStore(),
     push_config_store=InMemoryPushNotificationConfigStore(),
 )
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    yield
+    await agent_service.aclose()
+
+
 app = A2AStarletteApplication(
     agent_card=build_agent_card(),
     http_handler=handler,
-).build()
+).build(lifespan=lifespan)
 
 if __name__ == "__main__":
     uvicorn.run(app, host=BIND_HOST, port=PORT)
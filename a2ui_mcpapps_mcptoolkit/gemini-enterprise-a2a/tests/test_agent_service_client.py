@@ -0,0 +1,78 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_service_client import AgentServiceClient
+
+
+def client_for(handler, max_concurrency=16):
+    return AgentServiceClient(
+        "http://agent-service.test",
+        max_concurrency=max_concurrency,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+class AgentServiceClientTests(unittest.IsolatedAsyncioTestCase):
+    async def test_posts_form_values_and_returns_json(self):
+        seen = []
+
+        def handler(request):
+            seen.append((request.url.path, request.content.decode()))
+            return httpx.Response(200, json={"reviewHandle": "h-1"})
+
+        client = client_for(handler)
+        try:
+            result = await client.post("/api/reviews", {"maximumRows": 5})
+        finally:
+            await client.aclose()
+
+        self.assertEqual({"reviewHandle": "h-1"}, result)
+        self.assertEqual([("/api/reviews", "maximumRows=5")], seen)
+
+    async def test_error_payload_becomes_value_error(self):
+        client = client_for(
+            lambda request: httpx.Response(409, json={"error": "Review expired"})
+        )
+        try:
+            with self.assertRaisesRegex(ValueError, "^Review expired$"):
+                await client.post("/api/approvals", {})
+        finally:
+            await client.aclose()
+
+    async def test_error_without_payload_reports_status(self):
+        client = client_for(lambda request: httpx.Response(502, text="bad gateway"))
+        try:
+            with self.assertRaisesRegex(ValueError, "^HTTP Error 502: Bad Gateway$"):
+                await client.post("/api/reviews", {})
+        finally:
+            await client.aclose()
+
+    async def test_concurrent_calls_are_bounded(self):
+        active = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return httpx.Response(200, json={})
+
+        client = client_for(handler, max_concurrency=2)
+        try:
+            await asyncio.gather(*(client.post("/api/reviews", {}) for _ in range(6)))
+        finally:
+            await client.aclose()
+
+        self.assertEqual(2, peak)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Semantic cache lookup latency benchmark.
+
+Compares the original per-entry Python cosine scan with the flat and IVF
+vector indexes at 1k, 10k and 100k cached prompts.
+
+    python benchmarks/semantic_cache_benchmark.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.vector_index import FlatVectorIndex, IVFVectorIndex  # noqa: E402
+
+
+def linear_scan(query, entries):
+    """Baseline: the pre-index SemanticCache._semantic_get loop."""
+    best_key, best_similarity = None, 0.0
+    for key, vector in entries:
+        dot = sum(a * b for a, b in zip(query, vector))
+        m1 = sum(a * a for a in query) ** 0.5
+        m2 = sum(b * b for b in vector) ** 0.5
+        similarity = dot / (m1 * m2)
+        if similarity > best_similarity:
+            best_key, best_similarity = key, similarity
+    return best_key, best_similarity
+
+
+def time_lookups(lookup, queries):
+    """Return per-lookup latencies in milliseconds."""
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        lookup(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, size, latencies):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<12} {size:>8} {p50:>10.3f} {p99:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--linear-max", type=int, default=10000,
+                        help="Skip the pure-Python baseline above this size")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'index':<12} {'entries':>8} {'p50 ms':>10} {'p99 ms':>10}")
+
+    for size in args.sizes:
+        # Clustered data so IVF behaves like real prompt embeddings
+        centers = rng.standard_normal((max(1, size // 100), args.dimension)).astype(np.float32)
+        data = centers[rng.integers(0, len(centers), size)]
+        data += 0.3 * rng.standard_normal(data.shape).astype(np.float32)
+        queries = data[rng.integers(0, size, args.queries)] + 0.05 * rng.standard_normal(
+            (args.queries, args.dimension)).astype(np.float32)
+
+        if size <= args.linear_max:
+            entries = [(str(i), row.tolist()) for i, row in enumerate(data)]
+            query_lists = [q.tolist() for q in queries]
+            report("linear", size, time_lookups(lambda q: linear_scan(q, entries), query_lists))
+
+        flat = FlatVectorIndex(args.dimension)
+        for i, row in enumerate(data):
+            flat.add(str(i), row)
+        report("flat", size, time_lookups(lambda q: flat.search(q, k=1), queries))
+
+        ivf = IVFVectorIndex(args.dimension, nprobe=8)
+        for i, row in enumerate(data):
+            ivf.add(str(i), row)
+        ivf.train()
+        ivf_latencies = time_lookups(lambda q: ivf.search(q, k=1), queries)
+        report("ivf", size, ivf_latencies)
+
+        recall = np.mean([ivf.search(q, 1)[0][0] == flat.search(q, 1)[0][0] for q in queries])
+        print(f"{'ivf recall@1':<12} {size:>8} {recall:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""OCI tool-call parser accuracy and throughput benchmark.
+
+Parses every response shape in data/oci_tool_call_corpus.json both in one
+piece and streamed in small chunks, checks the calls against the expected
+ones, then times parsing as responses grow with surrounding prose.
+
+    python benchmarks/tool_call_parser_benchmark.py [--chunk-size 7] [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm.tool_call_parser import ToolCallParser  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "oci_tool_call_corpus.json")
+
+# Schemas as exposed by RealDatabaseSession.list_tools
+TOOLS = [
+    {"type": "function", "function": {"name": "mcp_oracle-sqlcl-mcp_list-connections",
+                                      "parameters": {"type": "object", "properties": {}}}},
+    {"type": "function", "function": {"name": "mcp_oracle-sqlcl-mcp_connect",
+                                      "parameters": {"type": "object",
+                                                     "properties": {"connection_name": {"type": "string"}},
+                                                     "required": ["connection_name"]}}},
+    {"type": "function", "function": {"name": "mcp_oracle-sqlcl-mcp_disconnect",
+                                      "parameters": {"type": "object", "properties": {}}}},
+    {"type": "function", "function": {"name": "mcp_oracle-sqlcl-mcp_run-sql",
+                                      "parameters": {"type": "object",
+                                                     "properties": {"sql": {"type": "string"}},
+                                                     "required": ["sql"]}}},
+]
+
+
+def simplify(calls):
+    return [{"name": call["function"]["name"], "arguments": call["function"]["arguments"]} for call in calls]
+
+
+def parse_streamed(content, chunk_size):
+    parser = ToolCallParser(TOOLS)
+    calls = []
+    for i in range(0, len(content), chunk_size):
+        calls.extend(parser.feed(content[i:i + chunk_size]))
+    calls.extend(parser.finish())
+    return calls
+
+
+def check_corpus(corpus, chunk_size):
+    failures = 0
+    for case in corpus:
+        whole = simplify(ToolCallParser.parse(case["content"], TOOLS))
+        streamed = simplify(parse_streamed(case["content"], chunk_size))
+        ok = whole == case["expected"] and streamed == case["expected"]
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':<5} {case['name']}")
+        if not ok:
+            print(f"      expected {case['expected']}\n      whole    {whole}\n      streamed {streamed}")
+    return failures
+
+
+def time_parse(content, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ToolCallParser.parse(content, TOOLS)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=7, help="Characters per streamed chunk")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(CORPUS) as f:
+        corpus = json.load(f)
+
+    failures = check_corpus(corpus, args.chunk_size)
+    print(f"\n{len(corpus) - failures}/{len(corpus)} corpus cases parsed as expected\n")
+
+    # Long answers: analysis prose around a couple of tool calls
+    calls = "\n".join(case["content"] for case in corpus[:3])
+    prose = "The AWR snapshot shows elevated db file sequential read waits on SALES. " * 20
+    print(f"{'response chars':>14} {'p50 ms':>10} {'MB/s':>8}")
+    for paragraphs in (1, 10, 100):
+        content = prose * paragraphs + calls + prose * paragraphs
+        p50 = time_parse(content, max(5, args.repeat // paragraphs))
+        print(f"{len(content):>14} {p50:>10.3f} {len(content) / (p50 / 1000) / 1e6:>8.1f}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,7 +10,7 @@ from collections import defaultdict
 from .rag_system import RAGSystem, OracleRAGSystem
 from .advanced_search import AdvancedSearchEngine, SearchQuery, SearchStrategy
 from .semantic_cache import SemanticCache, CacheConfig, CacheStrategy, CacheManager
-from .performance_monitor import PerformanceMonitor, monitor_performance
+from .performance_monitor import PerformanceMonitor, monitor_performance, set_trace_id, reset_trace_id
 from vector_db.rag_retriever import RAGRetriever
 from vector_db.models import SearchResult, RetrievalResult
 from .config import get_config_value
@@ -69,9 +69,9 @@ class AdvancedRAGSystem(RAGSystem):
         self.config = config or AdvancedRAGConfig()
         
         # Initialize components
-        self.search_engine = AdvancedSearchEngine(rag_retriever)
-        self.cache_manager = CacheManager()
         self.performance_monitor = PerformanceMonitor() if self.config.monitoring_enabled else None
+        self.search_engine = AdvancedSearchEngine(rag_retriever, self.performance_monitor)
+        self.cache_manager = CacheManager()
         
         # Initialize caches
         if self.config.cache_enabled:
@@ -147,7 +147,8 @@ class AdvancedRAGSystem(RAGSystem):
         query_id = str(uuid.uuid4())
         search_strategy = strategy or self.config.default_search_strategy
         
-        # Start performance monitoring
+        # Start performance monitoring; metrics recorded for this query carry its id as exemplar
+        trace_token = set_trace_id(query_id)
         if self.performance_monitor:
             self.performance_monitor.start_query_timer(query_id, query_text, search_strategy.value)
         
@@ -216,6 +217,7 @@ class AdvancedRAGSystem(RAGSystem):
                     query_id, results_count, relevance_scores
                 )
                 logger.debug(f"Query completed in {duration:.2f}ms")
+            reset_trace_id(trace_token)
     
     async def _rerank_results(self, results: List[SearchResult], query: str) -> List[SearchResult]:
         """Rerank search results for better relevance."""
@@ -12,6 +12,8 @@ from concurrent.futures import ThreadPoolExecutor
 from vector_db.models import SearchResult
 from vector_db.rag_retriever import RAGRetriever, RetrievalResult
 from .config import get_config_value
+from .performance_monitor import PerformanceMonitor
+from .embedding_service import get_embedding_service
 
 logger = logging.getLogger(__name__)
 
@@ -245,6 +247,65 @@ class SemanticSearch(SearchAlgorithm):
         return min(base_similarity + length_boost, 1.0)
 
 
+def mmr_select(relevance: np.ndarray, embeddings: np.ndarray, k: int,
+               diversity_threshold: float = 0.0) -> List[int]:
+    """Select up to k rows by Maximal Marginal Relevance.
+    
+    Each pick maximizes ``relevance - penalty`` where the penalty is the
+    cosine similarity to the closest already selected row, halved when that
+    similarity is below ``diversity_threshold``. The similarity matrix is
+    computed once and the closest-selected vector is updated incrementally,
+    so a selection costs one matrix product plus k vector passes.
+    
+    Args:
+        relevance: Relevance score per row, shape (n,)
+        embeddings: L2-normalized embeddings, shape (n, d)
+        k: Number of rows to select
+        diversity_threshold: Similarity below which the penalty is halved
+        
+    Returns:
+        Selected row indexes in pick order
+    """
+    n = len(relevance)
+    if n == 0 or k <= 0:
+        return []
+    
+    relevance = np.asarray(relevance, dtype=np.float32)
+    similarity = embeddings @ embeddings.T
+    max_similarity = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    selected: List[int] = []
+    
+    # Start with the most relevant row
+    best = int(np.argmax(relevance))
+    while True:
+        selected.append(best)
+        available[best] = False
+        if len(selected) >= min(k, n):
+            break
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+        penalty = np.where(max_similarity < diversity_threshold, max_similarity * 0.5, max_similarity)
+        scores = np.where(available, relevance - penalty, -np.inf)
+        best = int(np.argmax(scores))
+    
+    return selected
+
+
+def _hashed_term_vectors(texts: List[str], dimension: int = 1024) -> np.ndarray:
+    """Hash texts into normalized bag-of-words vectors.
+    
+    Fallback for results without embeddings; the cosine of two rows
+    approximates their word overlap.
+    """
+    matrix = np.zeros((len(texts), dimension), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in set(text.lower().split()):
+            matrix[row, hash(word) % dimension] = 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
 class MaximalMarginalRelevanceSearch(SearchAlgorithm):
     """Maximal Marginal Relevance search for diverse results."""
     
@@ -255,6 +316,9 @@ class MaximalMarginalRelevanceSearch(SearchAlgorithm):
             rag_retriever: RAG retriever for base search
         """
         self.rag_retriever = rag_retriever
+        self.embedding_service = get_embedding_service(
+            getattr(rag_retriever, 'embedding_provider', None)
+        )
     
     async def search(self, query: SearchQuery, context: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
         """Execute MMR search."""
@@ -267,7 +331,7 @@ class MaximalMarginalRelevanceSearch(SearchAlgorithm):
             )
             
             # Apply MMR algorithm
-            mmr_results = self._apply_mmr_algorithm(
+            mmr_results = await self._apply_mmr_algorithm(
                 initial_results.results, query.text, query.k, query.diversity_threshold
             )
             
@@ -281,99 +345,97 @@ class MaximalMarginalRelevanceSearch(SearchAlgorithm):
         """Get algorithm name."""
         return "mmr"
     
-    def _apply_mmr_algorithm(self, results: List[SearchResult], query: str, k: int, diversity_threshold: float) -> List[SearchResult]:
+    async def _apply_mmr_algorithm(self, results: List[SearchResult], query: str, k: int, diversity_threshold: float) -> List[SearchResult]:
         """Apply Maximal Marginal Relevance algorithm."""
         if not results:
             return []
         
-        # Start with the most relevant result
-        selected = [results[0]]
-        remaining = results[1:]
+        embeddings = await self._get_result_embeddings(results)
+        relevance = np.array([result.relevance_score for result in results], dtype=np.float32)
+        selected = mmr_select(relevance, embeddings, k, diversity_threshold)
+        return [results[index] for index in selected]
+    
+    async def _get_result_embeddings(self, results: List[SearchResult]) -> np.ndarray:
+        """Get a normalized embedding matrix for the results.
         
-        while len(selected) < k and remaining:
-            mmr_scores = []
-            
-            for result in remaining:
-                # Calculate MMR score: relevance - diversity penalty
-                relevance = result.relevance_score
-                diversity = self._calculate_diversity_penalty(result, selected, diversity_threshold)
-                mmr_score = relevance - diversity
-                mmr_scores.append((result, mmr_score))
-            
-            # Select result with highest MMR score
-            if mmr_scores:
-                best_result = max(mmr_scores, key=lambda x: x[1])[0]
-                selected.append(best_result)
-                remaining.remove(best_result)
-            else:
-                break
-        
-        return selected[:k]
-    
-    def _calculate_diversity_penalty(self, candidate: SearchResult, selected: List[SearchResult], threshold: float) -> float:
-        """Calculate diversity penalty for MMR."""
-        if not selected:
-            return 0.0
+        Uses embeddings carried in result metadata, embeds the rest through
+        the shared embedding service, and falls back to hashed term vectors
+        when any result still has no usable embedding.
+        """
+        texts = [result.prompt or "" for result in results]
+        vectors: List[Optional[List[float]]] = [
+            (result.metadata or {}).get('embedding') for result in results
+        ]
+        
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing and self.embedding_service:
+            embedded = await self.embedding_service.embed_many([texts[index] for index in missing])
+            for index, vector in zip(missing, embedded):
+                vectors[index] = vector
+        
+        try:
+            if any(vector is None for vector in vectors):
+                raise ValueError("missing embeddings")
+            matrix = np.asarray(vectors, dtype=np.float32)
+            if matrix.ndim != 2:
+                raise ValueError("inconsistent embedding dimensions")
+        except ValueError as e:
+            logger.debug(f"MMR falling back to term vectors: {e}")
+            return _hashed_term_vectors(texts)
         
-        # Calculate average similarity to already selected results
-        similarities = []
-        for selected_result in selected:
-            if candidate.prompt and selected_result.prompt:
-                similarity = self._calculate_content_similarity(candidate.prompt, selected_result.prompt)
-                similarities.append(similarity)
-        
-        if similarities:
-            avg_similarity = sum(similarities) / len(similarities)
-            # Apply threshold: if similarity is below threshold, reduce penalty
-            if avg_similarity < threshold:
-                return avg_similarity * 0.5  # Reduced penalty for diverse content
-            else:
-                return avg_similarity  # Full penalty for similar content
-        
-        return 0.0
-    
-    def _calculate_content_similarity(self, text1: str, text2: str) -> float:
-        """Calculate content similarity between two texts."""
-        # Simple similarity using word overlap
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        
-        return intersection / union if union > 0 else 0.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class FusionMethod(Enum):
+    """Score fusion methods for hybrid search."""
+    RRF = "rrf"  # Reciprocal rank fusion, uses ranks only
+    ZSCORE = "zscore"  # Weighted sum of per-retriever standardized scores
 
 
 class HybridSearch(SearchAlgorithm):
-    """Hybrid search combining multiple algorithms."""
+    """Hybrid search fusing several retrievers under latency budgets.
     
-    def __init__(self, rag_retriever: RAGRetriever):
+    Retrievers run concurrently, each with its own deadline; a late or
+    failing retriever is dropped and the query is answered from the others.
+    Rankings are fused by reciprocal rank (default) or weighted z-score.
+    With RRF, pending retrievers are cancelled as soon as no possible
+    contribution from them could change the top-k.
+    """
+    
+    def __init__(self, rag_retriever: RAGRetriever, fusion: Optional[FusionMethod] = None,
+                 rrf_k: Optional[int] = None, retriever_timeouts_ms: Optional[Dict[str, float]] = None):
         """Initialize hybrid search.
         
         Args:
             rag_retriever: RAG retriever for base operations
+            fusion: Fusion method (defaults to rag.hybrid_fusion)
+            rrf_k: RRF rank offset (defaults to rag.hybrid_rrf_k)
+            retriever_timeouts_ms: Latency budget per retriever name
+                (defaults to rag.hybrid_retriever_timeout_ms for each)
         """
         self.rag_retriever = rag_retriever
         self.vector_search = VectorSimilaritySearch(rag_retriever)
         self.keyword_search = KeywordMatchingSearch(rag_retriever)
         self.semantic_search = SemanticSearch(rag_retriever)
+        self.retrievers: Dict[str, SearchAlgorithm] = {
+            algorithm.get_algorithm_name(): algorithm
+            for algorithm in (self.vector_search, self.keyword_search, self.semantic_search)
+        }
+        
+        self.fusion = fusion or FusionMethod(get_config_value('rag.hybrid_fusion', 'rrf'))
+        self.rrf_k = rrf_k if rrf_k is not None else get_config_value('rag.hybrid_rrf_k', 60)
+        default_timeout_ms = get_config_value('rag.hybrid_retriever_timeout_ms', 2000)
+        self.retriever_timeouts_ms = {name: default_timeout_ms for name in self.retrievers}
+        self.retriever_timeouts_ms.update(retriever_timeouts_ms or {})
     
     async def search(self, query: SearchQuery, context: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
         """Execute hybrid search."""
         try:
-            # Execute all search algorithms concurrently
-            tasks = [
-                self.vector_search.search(query, context),
-                self.keyword_search.search(query, context),
-                self.semantic_search.search(query, context)
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Combine and rank results
-            combined_results = self._combine_results(results, query.alpha)
-            
-            return combined_results[:query.k]
+            weights = self._retriever_weights(query.alpha)
+            rankings = await self._collect_rankings(query, context, weights)
+            return self._fuse(rankings, weights)[:query.k]
             
         except Exception as e:
             logger.error(f"Hybrid search failed: {e}")
@@ -383,66 +445,151 @@ class HybridSearch(SearchAlgorithm):
         """Get algorithm name."""
         return "hybrid"
     
-    def _combine_results(self, results: List[Union[List[SearchResult], Exception]], alpha: float) -> List[SearchResult]:
-        """Combine results from multiple search algorithms."""
-        combined = []
-        result_scores = {}
+    def _retriever_weights(self, alpha: float) -> Dict[str, float]:
+        """Weight the vector retriever by alpha and the lexical ones by 1 - alpha."""
+        return {
+            name: alpha if algorithm is self.vector_search else 1.0 - alpha
+            for name, algorithm in self.retrievers.items()
+        }
+    
+    async def _run_retriever(self, name: str, query: SearchQuery,
+                             context: Optional[Dict[str, Any]]) -> List[SearchResult]:
+        """Run one retriever within its latency budget."""
+        timeout = self.retriever_timeouts_ms[name] / 1000
+        return await asyncio.wait_for(self.retrievers[name].search(query, context), timeout=timeout)
+    
+    async def _collect_rankings(self, query: SearchQuery, context: Optional[Dict[str, Any]],
+                                weights: Dict[str, float]) -> Dict[str, List[SearchResult]]:
+        """Gather retriever rankings as they arrive, stopping early when possible."""
+        tasks = {
+            asyncio.create_task(self._run_retriever(name, query, context)): name
+            for name in self.retrievers
+        }
+        rankings: Dict[str, List[SearchResult]] = {}
+        pending = set(tasks)
         
-        # Process results from each algorithm
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.warning(f"Search algorithm {i} failed: {result}")
-                continue
-            
-            for search_result in result:
-                if search_result.record_id not in result_scores:
-                    result_scores[search_result.record_id] = {
-                        'result': search_result,
-                        'scores': [],
-                        'count': 0
-                    }
-                
-                # Add score from this algorithm
-                result_scores[search_result.record_id]['scores'].append(search_result.relevance_score)
-                result_scores[search_result.record_id]['count'] += 1
-        
-        # Calculate combined scores
-        for result_id, data in result_scores.items():
-            if data['count'] > 0:
-                # Weighted average of scores
-                avg_score = sum(data['scores']) / len(data['scores'])
-                # Boost for results found by multiple algorithms
-                diversity_boost = min(data['count'] * 0.1, 0.3)  # Max 30% boost
-                combined_score = avg_score + diversity_boost
-                
-                # Create new result with combined score
-                combined_result = SearchResult(
-                    record_id=data['result'].record_id,
-                    prompt=data['result'].prompt,
-                    corrected_answer=data['result'].corrected_answer,
-                    context=data['result'].context,
-                    tags=data['result'].tags,
-                    distance=1.0 - combined_score,  # Convert score to distance
-                    metadata=data['result'].metadata
-                )
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks[task]
+                    try:
+                        rankings[name] = task.result()
+                    except asyncio.TimeoutError:
+                        logger.warning(f"Hybrid retriever {name} exceeded "
+                                       f"{self.retriever_timeouts_ms[name]:.0f}ms budget; using partial results")
+                    except Exception as e:
+                        logger.warning(f"Hybrid retriever {name} failed: {e}")
                 
-                combined.append((combined_result, combined_score))
+                if pending and self._top_k_is_stable(rankings, weights, [tasks[t] for t in pending], query.k):
+                    logger.debug(f"Hybrid top-{query.k} stable; skipping {len(pending)} pending retrievers")
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
         
-        # Sort by combined score
-        combined.sort(key=lambda x: x[1], reverse=True)
-        return [result for result, score in combined]
+        return rankings
+    
+    def _top_k_is_stable(self, rankings: Dict[str, List[SearchResult]], weights: Dict[str, float],
+                         pending: List[str], k: int) -> bool:
+        """Check whether the pending retrievers could still change the fused top-k.
+        
+        Only RRF has a bounded per-retriever contribution (weight / (rrf_k + 1)),
+        so z-score fusion always waits for every retriever or its deadline.
+        """
+        if self.fusion != FusionMethod.RRF or not rankings:
+            return False
+        
+        scores = sorted(self._rrf_scores(rankings, weights).values(), reverse=True)
+        if len(scores) < k:
+            return False
+        
+        max_remaining = sum(weights[name] for name in pending) / (self.rrf_k + 1)
+        kth = scores[k - 1]
+        challenger = scores[k] if len(scores) > k else 0.0
+        # Both a seen result below the cut and an unseen one must be unable to overtake
+        return kth > challenger + max_remaining and kth > max_remaining
+    
+    def _rrf_scores(self, rankings: Dict[str, List[SearchResult]],
+                    weights: Dict[str, float]) -> Dict[str, float]:
+        """Weighted reciprocal rank fusion scores by record id."""
+        scores: Dict[str, float] = {}
+        for name, results in rankings.items():
+            weight = weights.get(name, 1.0)
+            for rank, result in enumerate(results, start=1):
+                scores[result.record_id] = scores.get(result.record_id, 0.0) + weight / (self.rrf_k + rank)
+        return scores
+    
+    def _zscore_scores(self, rankings: Dict[str, List[SearchResult]],
+                       weights: Dict[str, float]) -> Dict[str, float]:
+        """Weighted sum of relevance scores standardized per retriever."""
+        scores: Dict[str, float] = {}
+        for name, results in rankings.items():
+            if not results:
+                continue
+            raw = np.array([result.relevance_score for result in results], dtype=np.float64)
+            std = raw.std()
+            standardized = (raw - raw.mean()) / std if std > 0 else np.zeros_like(raw)
+            weight = weights.get(name, 1.0)
+            for result, z in zip(results, standardized):
+                scores[result.record_id] = scores.get(result.record_id, 0.0) + weight * float(z)
+        return scores
+    
+    def _fuse(self, rankings: Dict[str, List[SearchResult]], weights: Dict[str, float]) -> List[SearchResult]:
+        """Fuse retriever rankings into one list, best first."""
+        if self.fusion == FusionMethod.ZSCORE:
+            scores = self._zscore_scores(rankings, weights)
+        else:
+            scores = self._rrf_scores(rankings, weights)
+        
+        # Keep one copy of each record, preferring the vector retriever's. Rankings
+        # arrive in completion order, so walk them in retriever order instead.
+        representatives: Dict[str, SearchResult] = {}
+        order = [name for name in self.retrievers if name in rankings]
+        order += [name for name in rankings if name not in self.retrievers]
+        for name in order:
+            for result in rankings[name]:
+                representatives.setdefault(result.record_id, result)
+        
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        # Min-max normalize so relevance_score (1 - distance) follows the fused
+        # order and later reranking starts from it, not from one retriever's score
+        high = ranked[0][1] if ranked else 0.0
+        low = ranked[-1][1] if ranked else 0.0
+        spread = high - low
+        fused = []
+        for record_id, score in ranked:
+            result = representatives[record_id]
+            normalized = (score - low) / spread if spread > 0 else 1.0
+            metadata = dict(result.metadata or {})
+            metadata['fusion_score'] = score
+            metadata['retriever_distance'] = result.distance
+            metadata['fusion_method'] = self.fusion.value
+            metadata['fused_retrievers'] = sorted(rankings)
+            fused.append(SearchResult(
+                record_id=result.record_id,
+                prompt=result.prompt,
+                corrected_answer=result.corrected_answer,
+                context=result.context,
+                tags=result.tags,
+                distance=1.0 - normalized,
+                metadata=metadata
+            ))
+        return fused
 
 
 class AdvancedSearchEngine:
     """Advanced search engine orchestrating multiple search algorithms."""
     
-    def __init__(self, rag_retriever: RAGRetriever):
+    def __init__(self, rag_retriever: RAGRetriever, performance_monitor: Optional[PerformanceMonitor] = None):
         """Initialize advanced search engine.
         
         Args:
             rag_retriever: RAG retriever for base operations
+            performance_monitor: Optional performance monitor for per-strategy latency
         """
         self.rag_retriever = rag_retriever
+        self.performance_monitor = performance_monitor
         self.algorithms = {
             SearchStrategy.VECTOR_SIMILARITY: VectorSimilaritySearch(rag_retriever),
             SearchStrategy.KEYWORD_MATCHING: KeywordMatchingSearch(rag_retriever),
@@ -491,6 +638,8 @@ class AdvancedSearchEngine:
             
             # Store metrics
             self.metrics[query.text] = metrics
+            if self.performance_monitor:
+                self.performance_monitor.record_search_duration(query.strategy.value, metrics.query_time * 1000)
             
             return results, metrics
             
@@ -27,6 +27,22 @@ class LLMConfig(BaseModel):
     local: Dict[str, str] = Field(default_factory=dict)
 
 
+class DatabaseSessionConfig(BaseModel):
+    """Connection pools behind the database tool session (one pool per named connection)."""
+    
+    pool_min: int = Field(default=1, description="Connections opened when a pool is created")
+    pool_max: int = Field(default=4, description="Maximum connections per named connection")
+    pool_increment: int = Field(default=1, description="Connections added when the pool grows")
+    statement_cache_size: int = Field(default=50, description="Statements cached per connection")
+    arraysize: int = Field(default=500, description="Rows fetched per round trip by run-sql")
+    prefetchrows: int = Field(default=501, description="Rows returned with the execute round trip")
+    acquire_timeout: int = Field(default=30, description="Seconds to wait for a pooled connection")
+    autocommit: bool = Field(
+        default=True,
+        description="Commit each DML statement; when false, DML stays on a pinned connection until COMMIT or ROLLBACK"
+    )
+
+
 class VectorDBConfig(BaseModel):
     """Vector database configuration."""
     
@@ -57,6 +73,14 @@ class RAGEmbeddingConfig(BaseModel):
     batch_size: int = Field(default=5, description="Batch size for embeddings")
 
 
+class EmbeddingServiceConfig(BaseModel):
+    """Shared micro-batching embedding service."""
+    
+    max_batch_size: int = Field(default=32, description="Maximum texts per provider call")
+    max_wait_ms: float = Field(default=5, description="Milliseconds to wait for more requests before flushing")
+    cache_size: int = Field(default=2048, description="Text to vector results kept in the LRU cache")
+
+
 class RAGConfig(BaseModel):
     """RAG system configuration - simplified with search settings flattened."""
     
@@ -71,6 +95,9 @@ class RAGConfig(BaseModel):
     search_timeout: int = Field(default=15, description="Search timeout in seconds")
     enable_hybrid_search: bool = Field(default=True, description="Enable hybrid search")
     enable_mmr: bool = Field(default=False, description="Enable Maximal Marginal Relevance")
+    hybrid_fusion: str = Field(default="rrf", description="Hybrid search fusion method (rrf or zscore)")
+    hybrid_rrf_k: int = Field(default=60, description="Rank offset for reciprocal rank fusion")
+    hybrid_retriever_timeout_ms: int = Field(default=2000, description="Latency budget per hybrid retriever in milliseconds")
     
     # Other settings
     enabled: bool = Field(default=True, description="Whether RAG is enabled")
@@ -81,6 +108,18 @@ class RAGConfig(BaseModel):
     cache_size: int = Field(default=100, description="Cache size")
 
 
+class RAGCacheSettings(BaseModel):
+    """Prompt result cache of the task orchestrator (L1 in memory, optional shared L2)."""
+    
+    max_size: int = Field(default=1000, description="Entries kept in the in-memory L1 cache")
+    default_ttl_seconds: int = Field(default=3600, description="TTL of entries cached without an explicit one")
+    cleanup_interval_seconds: int = Field(default=300, description="Seconds between expired-entry sweeps")
+    l2_connection_string: str = Field(
+        default="",
+        description="Shared L2 store, e.g. sqlite:////var/tmp/rag_cache.db; empty disables L2"
+    )
+
+
 class PerformanceConfig(BaseModel):
     """Performance monitoring configuration."""
     
@@ -89,6 +128,12 @@ class PerformanceConfig(BaseModel):
     cache_hit_rate_minimum: float = Field(default=0.5, description="Minimum acceptable cache hit rate")
     memory_usage_warning: float = Field(default=0.8, description="Memory usage warning threshold (80%)")
     cpu_usage_warning: float = Field(default=0.8, description="CPU usage warning threshold (80%)")
+    histogram_relative_error: float = Field(default=0.01, description="Relative error of latency histogram quantiles")
+    rate_window_seconds: int = Field(default=60, description="Sliding window for metric rates in seconds")
+    max_series_per_metric: int = Field(default=256, description="Label sets tracked per metric before folding into an overflow series")
+    metrics_enabled: bool = Field(default=False, description="Serve the metrics scrape endpoint from the task orchestrator")
+    metrics_host: str = Field(default="127.0.0.1", description="Bind address of the metrics scrape endpoint")
+    metrics_port: int = Field(default=9464, description="Port of the metrics scrape endpoint")
 
 
 class ParallelConfig(BaseModel):
@@ -101,6 +146,11 @@ class ParallelConfig(BaseModel):
     enable_result_caching: bool = Field(default=True, description="Enable result caching")
     enable_adaptive_concurrency: bool = Field(default=True, description="Enable adaptive concurrency control")
     min_concurrent_queries: int = Field(default=1, description="Minimum number of concurrent queries")
+    max_concurrent_tasks: int = Field(default=8, description="Maximum plan tasks running at once")
+    tool_concurrency_limits: Dict[str, int] = Field(
+        default_factory=lambda: {"mcp_oracle-sqlcl-mcp_connect": 1},
+        description="Concurrent calls allowed per tool and database"
+    )
 
 
 class BatchConfig(BaseModel):
@@ -126,8 +176,11 @@ class AppConfig(BaseModel):
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     llm: LLMConfig
     databases: Dict[str, str] = Field(..., description="Database connection strings")
+    database_session: DatabaseSessionConfig = Field(default_factory=DatabaseSessionConfig)
     vector_db: VectorDBConfig = Field(default_factory=VectorDBConfig)
     rag: RAGConfig = Field(default_factory=RAGConfig)
+    rag_cache: RAGCacheSettings = Field(default_factory=RAGCacheSettings)
+    embedding_service: EmbeddingServiceConfig = Field(default_factory=EmbeddingServiceConfig)
     performance: PerformanceConfig = Field(default_factory=PerformanceConfig)
     parallel: ParallelConfig = Field(default_factory=ParallelConfig)
     batch: BatchConfig = Field(default_factory=BatchConfig)
@@ -1,10 +1,11 @@
 """Dependency analysis and execution planning for task-centric system."""
 
 from dataclasses import dataclass
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Union
 from abc import ABC, abstractmethod
 
 from .task_system import Task
+from .dependency_graph import DependencyGraph
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -32,6 +33,19 @@ class ExecutionPlan(ABC):
         """Initialize execution plan."""
         self.plan_type = plan_type
         self.phases = phases
+        # Filled in by record_execution once the plan has run
+        self.actual_time_savings: Optional[float] = None
+        self.critical_path: List[str] = []
+    
+    def record_execution(self, time_savings: float, critical_path: List[str]) -> None:
+        """Record how the plan actually ran.
+        
+        Args:
+            time_savings: Measured fraction of sequential time saved (0-1 scale)
+            critical_path: Task ids on the path that determined the finish time
+        """
+        self.actual_time_savings = time_savings
+        self.critical_path = list(critical_path)
         
     @property
     def total_tasks(self) -> int:
@@ -45,7 +59,12 @@ class ExecutionPlan(ABC):
     
     @property
     def estimated_time_savings(self) -> float:
-        """Estimate time savings from parallelization (0-1 scale)."""
+        """Estimate time savings from parallelization (0-1 scale).
+        
+        Once the plan has run, this is the measured saving instead.
+        """
+        if self.actual_time_savings is not None:
+            return self.actual_time_savings
         if not self.phases:
             return 0.0
             
@@ -70,7 +89,10 @@ class ExecutionPlan(ABC):
         ]
         
         if self.estimated_time_savings > 0:
-            summary_parts.append(f"Estimated time savings: {self.estimated_time_savings:.1%}")
+            label = "Actual" if self.actual_time_savings is not None else "Estimated"
+            summary_parts.append(f"{label} time savings: {self.estimated_time_savings:.1%}")
+        if self.critical_path:
+            summary_parts.append(f"Critical path: {' -> '.join(self.critical_path)}")
         
         # Add phase details
         for phase in self.phases:
@@ -84,14 +106,13 @@ class ExecutionPlan(ABC):
 class SequentialPlan(ExecutionPlan):
     """Execution plan where all tasks run sequentially."""
     
-    def __init__(self, tasks: List[Task]):
-        """Create sequential plan from tasks."""
+    def __init__(self, tasks: List[Task], graph: Optional[DependencyGraph] = None):
+        """Create sequential plan from tasks (and their graph, if already built)."""
         if not tasks:
             phases = []
         else:
             # Sort tasks by dependencies (validation should be done before this)
-            analyzer = DependencyAnalyzer()
-            sorted_tasks = analyzer._topological_sort(tasks)
+            sorted_tasks = (graph or DependencyGraph(tasks)).topological_order()
             
             # Create one phase per task
             phases = [
@@ -128,65 +149,43 @@ class ParallelPlan(ExecutionPlan):
 class MixedPlan(ExecutionPlan):
     """Execution plan with mixed sequential and parallel phases."""
     
-    def __init__(self, tasks: List[Task], dependency_graph: Dict[str, Set[str]]):
+    def __init__(self, tasks: List[Task], dependency_graph: Union[DependencyGraph, Dict[str, Set[str]]]):
         """Create mixed plan from tasks and dependency graph."""
         phases = self._group_by_dependency_level(tasks, dependency_graph)
         super().__init__("mixed", phases)
     
-    def _group_by_dependency_level(self, tasks: List[Task], graph: Dict[str, Set[str]]) -> List[ExecutionPhase]:
+    def _group_by_dependency_level(self, tasks: List[Task],
+                                   graph: Union[DependencyGraph, Dict[str, Set[str]]]) -> List[ExecutionPhase]:
         """Group tasks by dependency level into execution phases."""
         if not tasks:
             return []
-            
-        # Create task lookup
-        task_map = {task.id: task for task in tasks}
-        
-        # Find tasks with no dependencies (level 0)
-        remaining_tasks = set(task.id for task in tasks)
-        completed_tasks = set()
-        phases = []
-        phase_number = 1
         
-        while remaining_tasks:
-            # Find tasks that can run now (all dependencies completed)
-            ready_tasks = []
-            for task_id in remaining_tasks:
-                dependencies = graph.get(task_id, set())
-                if dependencies.issubset(completed_tasks):
-                    ready_tasks.append(task_map[task_id])
-            
-            if not ready_tasks:
-                # This shouldn't happen if there are no circular dependencies
-                remaining_task_list = list(remaining_tasks)
-                raise ValueError(f"Circular dependency detected involving tasks: {remaining_task_list}")
-            
-            # Create phase for ready tasks
-            can_parallel = len(ready_tasks) > 1
-            phase = ExecutionPhase(
-                phase_number=phase_number,
-                tasks=ready_tasks,
-                can_parallel=can_parallel
+        if not isinstance(graph, DependencyGraph):
+            graph = DependencyGraph(tasks, [
+                (task_id, dep_id) for task_id, dependencies in graph.items() for dep_id in dependencies
+            ])
+        
+        # Levels are maintained by the graph; each level becomes one phase
+        return [
+            ExecutionPhase(
+                phase_number=i + 1,
+                tasks=level_tasks,
+                can_parallel=len(level_tasks) > 1
             )
-            phases.append(phase)
-            
-            # Mark these tasks as completed
-            for task in ready_tasks:
-                completed_tasks.add(task.id)
-                remaining_tasks.remove(task.id)
-            
-            phase_number += 1
-        
-        return phases
+            for i, level_tasks in enumerate(graph.phases())
+        ]
 
 
 class DependencyAnalyzer:
     """Analyzes task dependencies and creates execution plans."""
     
-    def analyze(self, tasks: List[Task]) -> ExecutionPlan:
+    def analyze(self, tasks: List[Task], graph: Optional[DependencyGraph] = None) -> ExecutionPlan:
         """Analyze tasks and create optimal execution plan.
         
         Args:
             tasks: List of tasks to analyze
+            graph: Dependency graph of the tasks, e.g. as updated by the rule
+                engine; built from the tasks when omitted
             
         Returns:
             Execution plan (Sequential, Parallel, or Mixed)
@@ -200,16 +199,17 @@ class DependencyAnalyzer:
         logger.info(f"🔄 Planning execution for {len(tasks)} tasks")
         
         # Build dependency graph and validate first
-        graph = self._build_dependency_graph(tasks)
+        if graph is None:
+            graph = self._build_dependency_graph(tasks)
         logger.info(f"📊 Built dependency graph with {len(graph)} nodes")
         
-        self._validate_dependencies(tasks, graph)
+        self._validate_dependencies(graph)
         logger.info("✅ Dependencies validated")
         
         if len(tasks) == 1:
-            if tasks[0].dependencies:
+            if graph.dependencies(tasks[0].id):
                 logger.info("📈 Creating SEQUENTIAL plan (single task with dependencies)")
-                return SequentialPlan(tasks)
+                return SequentialPlan(tasks, graph)
             else:
                 logger.info("📈 Creating PARALLEL plan (single task without dependencies)")
                 return ParallelPlan(tasks)
@@ -217,7 +217,7 @@ class DependencyAnalyzer:
         # Determine plan type
         if self._is_sequential(graph):
             logger.info("📈 Creating SEQUENTIAL plan")
-            return SequentialPlan(tasks)
+            return SequentialPlan(tasks, graph)
         elif self._is_parallel(graph):
             logger.info("📈 Creating PARALLEL plan")
             return ParallelPlan(tasks)
@@ -225,45 +225,34 @@ class DependencyAnalyzer:
             logger.info("📈 Creating MIXED plan")
             return MixedPlan(tasks, graph)
     
-    def _build_dependency_graph(self, tasks: List[Task]) -> Dict[str, Set[str]]:
+    def _build_dependency_graph(self, tasks: List[Task]) -> DependencyGraph:
         """Build dependency graph from tasks.
         
         Args:
             tasks: List of tasks
             
         Returns:
-            Dictionary mapping task ID to set of dependency IDs
+            Indexed dependency graph of the tasks
         """
-        graph = {}
-        
-        for task in tasks:
-            graph[task.id] = set(task.dependencies)
-        
-        return graph
+        return DependencyGraph(tasks)
     
-    def _validate_dependencies(self, tasks: List[Task], graph: Dict[str, Set[str]]) -> None:
+    def _validate_dependencies(self, graph: DependencyGraph) -> None:
         """Validate that all dependencies exist and there are no cycles.
         
         Args:
-            tasks: List of tasks
             graph: Dependency graph
             
         Raises:
             ValueError: If validation fails
         """
-        task_ids = {task.id for task in tasks}
-        
         # Check for missing dependencies
-        for task_id, dependencies in graph.items():
-            for dep_id in dependencies:
-                if dep_id not in task_ids:
-                    raise ValueError(f"Missing dependency: task '{task_id}' depends on '{dep_id}' which doesn't exist")
+        for task_id, dep_id in graph.missing_dependencies():
+            raise ValueError(f"Missing dependency: task '{task_id}' depends on '{dep_id}' which doesn't exist")
         
-        # Check for circular dependencies using DFS
         self._detect_cycles(graph)
     
-    def _detect_cycles(self, graph: Dict[str, Set[str]]) -> None:
-        """Detect circular dependencies using DFS.
+    def _detect_cycles(self, graph: DependencyGraph) -> None:
+        """Raise if the graph recorded a circular dependency.
         
         Args:
             graph: Dependency graph
@@ -271,36 +260,11 @@ class DependencyAnalyzer:
         Raises:
             ValueError: If circular dependency detected
         """
-        WHITE = 0  # Unvisited
-        GRAY = 1   # Visiting (in current path)
-        BLACK = 2  # Visited (completely processed)
-        
-        colors = {task_id: WHITE for task_id in graph}
-        
-        def dfs(task_id: str, path: List[str]) -> None:
-            if colors[task_id] == GRAY:
-                # Found a cycle
-                cycle_start = path.index(task_id)
-                cycle = path[cycle_start:] + [task_id]
-                raise ValueError(f"Circular dependency detected: {' -> '.join(cycle)}")
-            
-            if colors[task_id] == BLACK:
-                return  # Already processed
-            
-            colors[task_id] = GRAY
-            path.append(task_id)
-            
-            for dep_id in graph[task_id]:
-                dfs(dep_id, path)
-            
-            path.pop()
-            colors[task_id] = BLACK
-        
-        for task_id in graph:
-            if colors[task_id] == WHITE:
-                dfs(task_id, [])
+        cycle = graph.find_cycle()
+        if cycle:
+            raise ValueError(f"Circular dependency detected: {' -> '.join(cycle)}")
     
-    def _is_sequential(self, graph: Dict[str, Set[str]]) -> bool:
+    def _is_sequential(self, graph: DependencyGraph) -> bool:
         """Check if all tasks must run sequentially.
         
         Args:
@@ -310,50 +274,12 @@ class DependencyAnalyzer:
             True if sequential execution required
         """
         if len(graph) <= 1:
-            return len(graph) == 1 and list(graph.values())[0]  # Single task with dependencies
-            
-        # Sequential if we can form a single chain
-        # Find task with no dependencies
-        roots = [task_id for task_id, deps in graph.items() if not deps]
+            return len(graph) == 1 and bool(graph.dependencies(graph.tasks[0].id))
         
-        if len(roots) != 1:
-            return False  # Multiple roots or no roots means not purely sequential
-        
-        # Check if we can form a single chain from root
-        return self._can_form_single_chain(graph, roots[0])
+        # Sequential if the tasks form a single chain
+        return graph.is_chain()
     
-    def _can_form_single_chain(self, graph: Dict[str, Set[str]], start: str) -> bool:
-        """Check if tasks can form a single dependency chain.
-        
-        Args:
-            graph: Dependency graph
-            start: Starting task ID
-            
-        Returns:
-            True if single chain possible
-        """
-        visited = {start}
-        current = start
-        
-        while True:
-            # Find tasks that depend only on current task
-            next_tasks = [
-                task_id for task_id, deps in graph.items()
-                if deps == {current} and task_id not in visited
-            ]
-            
-            if len(next_tasks) == 0:
-                # End of chain - check if we visited all tasks
-                return len(visited) == len(graph)
-            elif len(next_tasks) == 1:
-                # Continue chain
-                current = next_tasks[0]
-                visited.add(current)
-            else:
-                # Multiple tasks depend on current - not a single chain
-                return False
-    
-    def _is_parallel(self, graph: Dict[str, Set[str]]) -> bool:
+    def _is_parallel(self, graph: DependencyGraph) -> bool:
         """Check if all tasks can run in parallel.
         
         Args:
@@ -363,7 +289,7 @@ class DependencyAnalyzer:
             True if parallel execution possible
         """
         # Parallel if no task has dependencies
-        return all(not deps for deps in graph.values())
+        return not graph.missing_dependencies() and all(not graph.dependencies(task.id) for task in graph.tasks)
     
     def _topological_sort(self, tasks: List[Task]) -> List[Task]:
         """Sort tasks in topological order based on dependencies.
@@ -377,46 +303,13 @@ class DependencyAnalyzer:
         if not tasks:
             return []
         
-        # Build graph and in-degree count
-        graph = self._build_dependency_graph(tasks)
-        task_map = {task.id: task for task in tasks}
-        
-        # Build reverse graph (who depends on whom)
-        reverse_graph = {task_id: set() for task_id in graph}
-        in_degree = {task_id: 0 for task_id in graph}
-        
-        for task_id, dependencies in graph.items():
-            in_degree[task_id] = len(dependencies)
-            for dep_id in dependencies:
-                if dep_id in reverse_graph:  # Only add if dependency exists
-                    reverse_graph[dep_id].add(task_id)
-        
-        # Kahn's algorithm
-        queue = [task_id for task_id, degree in in_degree.items() if degree == 0]
-        result = []
-        
-        while queue:
-            # Sort queue for deterministic results
-            queue.sort()
-            current = queue.pop(0)
-            result.append(task_map[current])
-            
-            # Remove edges from current task
-            for dependent in reverse_graph[current]:
-                in_degree[dependent] -= 1
-                if in_degree[dependent] == 0:
-                    queue.append(dependent)
-        
-        if len(result) != len(tasks):
-            raise ValueError("Circular dependency detected during topological sort")
-        
-        return result
+        return self._build_dependency_graph(tasks).topological_order()
     
-    def _find_task_by_id(self, tasks: List[Task], task_id: str) -> Task:
-        """Find task by ID in task list.
+    def _find_task_by_id(self, tasks: Union[DependencyGraph, List[Task]], task_id: str) -> Task:
+        """Find task by ID.
         
         Args:
-            tasks: List of tasks to search
+            tasks: Dependency graph (constant-time lookup) or list of tasks to search
             task_id: ID to find
             
         Returns:
@@ -425,8 +318,13 @@ class DependencyAnalyzer:
         Raises:
             ValueError: If task not found
         """
-        for task in tasks:
-            if task.id == task_id:
+        if isinstance(tasks, DependencyGraph):
+            task = tasks.get(task_id)
+            if task is not None:
                 return task
+        else:
+            for task in tasks:
+                if task.id == task_id:
+                    return task
         
-        raise ValueError(f"Task with id '{task_id}' not found")
\ No newline at end of file
+        raise ValueError(f"Task with id '{task_id}' not found")
@@ -0,0 +1,290 @@
+"""Indexed task dependency graph shared by planning components."""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .task_system import Task
+
+Dependency = Tuple[str, str]  # (task_id, dependency_id): task_id runs after dependency_id
+
+
+class DependencyGraph:
+    """Task dependency graph with id lookups and incrementally maintained levels.
+
+    Nodes are tasks keyed by id; an edge ``(task_id, dependency_id)`` means
+    the task runs after the dependency. Edges come from each task's
+    ``dependencies`` plus any added with :meth:`add_dependency` (the tasks
+    themselves are never modified). Edges to ids not in the graph are kept
+    as missing dependencies and connected once a task with that id is added.
+
+    The level of a task is the length of the longest dependency chain below
+    it. Levels are updated incrementally as nodes and edges are added, so
+    rule-driven injections do not trigger a full recomputation; an edge that
+    closes a cycle is recorded and reported by :meth:`find_cycle`.
+    """
+
+    def __init__(self, tasks: Optional[Iterable[Task]] = None,
+                 dependencies: Optional[Iterable[Dependency]] = None):
+        """Initialize dependency graph.
+
+        Args:
+            tasks: Tasks to add, in order
+            dependencies: Additional (task_id, dependency_id) edges
+        """
+        self._tasks: Dict[str, Task] = {}
+        self._dependencies: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._missing: Dict[str, Set[str]] = {}  # unknown dependency id -> waiting task ids
+        self._levels: Optional[Dict[str, int]] = {}
+        self._has_cycle = False
+        self.duplicate_ids: List[str] = []
+
+        for task in tasks or []:
+            self.add_task(task)
+        for task_id, dependency_id in dependencies or []:
+            self.add_dependency(task_id, dependency_id)
+
+    def add_task(self, task: Task) -> bool:
+        """Add a task and its declared dependencies.
+
+        Returns:
+            False if a task with the same id is already present
+        """
+        if task.id in self._tasks:
+            self.duplicate_ids.append(task.id)
+            return False
+
+        self._tasks[task.id] = task
+        self._dependencies[task.id] = set()
+        self._dependents[task.id] = set()
+        if self._levels is not None:
+            self._levels[task.id] = 0
+
+        for dependency_id in task.dependencies:
+            self.add_dependency(task.id, dependency_id)
+
+        # Tasks that were waiting on this id now have a real edge
+        for waiting_id in self._missing.pop(task.id, set()):
+            self._missing_edge_resolved(waiting_id, task.id)
+        return True
+
+    def add_dependency(self, task_id: str, dependency_id: str) -> bool:
+        """Add an edge making ``task_id`` run after ``dependency_id``.
+
+        Returns:
+            True if the edge is new
+        """
+        if task_id not in self._tasks:
+            raise KeyError(f"Task with id '{task_id}' not found")
+        if dependency_id in self._dependencies[task_id]:
+            return False
+        if dependency_id not in self._tasks:
+            waiting = self._missing.setdefault(dependency_id, set())
+            if task_id in waiting:
+                return False
+            waiting.add(task_id)
+            return True
+        self._link(task_id, dependency_id)
+        return True
+
+    def _missing_edge_resolved(self, task_id: str, dependency_id: str) -> None:
+        if dependency_id not in self._dependencies[task_id]:
+            self._link(task_id, dependency_id)
+
+    def _link(self, task_id: str, dependency_id: str) -> None:
+        """Store an edge between known tasks and update levels."""
+        if task_id == dependency_id or self._depends_on(dependency_id, task_id):
+            self._has_cycle = True
+            self._levels = None
+
+        self._dependencies[task_id].add(dependency_id)
+        self._dependents[dependency_id].add(task_id)
+
+        if self._levels is not None:
+            self._raise_level(task_id, self._levels[dependency_id] + 1)
+
+    def _raise_level(self, task_id: str, level: int) -> None:
+        """Raise a task's level and push the change to its dependents."""
+        levels = self._levels
+        stack = [(task_id, level)]
+        while stack:
+            current, new_level = stack.pop()
+            if levels[current] >= new_level:
+                continue
+            levels[current] = new_level
+            stack.extend((dependent, new_level + 1) for dependent in self._dependents[current])
+
+    def _depends_on(self, task_id: str, target_id: str) -> bool:
+        """Whether ``task_id`` transitively depends on ``target_id``."""
+        if self._levels is not None and self._levels.get(task_id, 0) <= self._levels.get(target_id, 0):
+            # Dependencies always sit on strictly lower levels
+            return False
+        seen = {task_id}
+        stack = [task_id]
+        while stack:
+            current = stack.pop()
+            for dependency_id in self._dependencies[current]:
+                if dependency_id == target_id:
+                    return True
+                if dependency_id not in seen:
+                    seen.add(dependency_id)
+                    stack.append(dependency_id)
+        return False
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """Get task by id."""
+        return self._tasks.get(task_id)
+
+    @property
+    def tasks(self) -> List[Task]:
+        """Tasks in insertion order."""
+        return list(self._tasks.values())
+
+    def dependencies(self, task_id: str) -> Set[str]:
+        """Ids the task depends on (known tasks only)."""
+        return self._dependencies[task_id]
+
+    def dependents(self, task_id: str) -> Set[str]:
+        """Ids of tasks that depend on the task."""
+        return self._dependents[task_id]
+
+    def edges(self) -> Set[Dependency]:
+        """All (task_id, dependency_id) edges between known tasks."""
+        return {(task_id, dep) for task_id, deps in self._dependencies.items() for dep in deps}
+
+    def as_dict(self) -> Dict[str, Set[str]]:
+        """Adjacency mapping of task id to dependency ids, including missing ones."""
+        graph = {task_id: set(deps) for task_id, deps in self._dependencies.items()}
+        for dependency_id, waiting in self._missing.items():
+            for task_id in waiting:
+                graph[task_id].add(dependency_id)
+        return graph
+
+    def roots(self) -> List[str]:
+        """Ids of tasks without dependencies."""
+        return [task_id for task_id, deps in self._dependencies.items()
+                if not deps and not self._is_waiting(task_id)]
+
+    def _is_waiting(self, task_id: str) -> bool:
+        return any(task_id in waiting for waiting in self._missing.values())
+
+    def missing_dependencies(self) -> List[Dependency]:
+        """(task_id, dependency_id) edges whose dependency is not in the graph."""
+        return [(task_id, dependency_id)
+                for dependency_id, waiting in self._missing.items()
+                for task_id in sorted(waiting)]
+
+    @property
+    def has_cycle(self) -> bool:
+        return self._has_cycle
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """Return one dependency cycle as a list of ids (first id repeated last), or None."""
+        if not self._has_cycle:
+            return None
+        white, gray, black = 0, 1, 2
+        colors = {task_id: white for task_id in self._tasks}
+        for start in self._tasks:
+            if colors[start] != white:
+                continue
+            path = [start]
+            iterators = [iter(self._dependencies[start])]
+            colors[start] = gray
+            while iterators:
+                next_id = next(iterators[-1], None)
+                if next_id is None:
+                    colors[path.pop()] = black
+                    iterators.pop()
+                elif colors[next_id] == gray:
+                    return path[path.index(next_id):] + [next_id]
+                elif colors[next_id] == white:
+                    colors[next_id] = gray
+                    path.append(next_id)
+                    iterators.append(iter(self._dependencies[next_id]))
+        return None
+
+    def levels(self) -> Dict[str, int]:
+        """Dependency level of each task (0 for tasks without dependencies).
+
+        Raises:
+            ValueError: If the graph has a cycle
+        """
+        if self._levels is None:
+            cycle = self.find_cycle()
+            if cycle:
+                raise ValueError(f"Circular dependency detected: {' -> '.join(cycle)}")
+            self._levels = self._compute_levels()
+        return self._levels
+
+    def _compute_levels(self) -> Dict[str, int]:
+        """Kahn-style longest-path levels."""
+        in_degree = {task_id: len(deps) for task_id, deps in self._dependencies.items()}
+        levels = {task_id: 0 for task_id in self._tasks}
+        frontier = [task_id for task_id, degree in in_degree.items() if degree == 0]
+        while frontier:
+            next_frontier = []
+            for task_id in frontier:
+                for dependent in self._dependents[task_id]:
+                    levels[dependent] = max(levels[dependent], levels[task_id] + 1)
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        next_frontier.append(dependent)
+            frontier = next_frontier
+        return levels
+
+    def phases(self) -> List[List[Task]]:
+        """Tasks grouped by level, each group in insertion order."""
+        levels = self.levels()
+        if not levels:
+            return []
+        groups: List[List[Task]] = [[] for _ in range(max(levels.values()) + 1)]
+        for task_id, task in self._tasks.items():
+            groups[levels[task_id]].append(task)
+        return groups
+
+    def topological_order(self) -> List[Task]:
+        """Tasks in dependency order, ties broken by id.
+
+        Raises:
+            ValueError: If the graph has a cycle
+        """
+        in_degree = {task_id: len(deps) for task_id, deps in self._dependencies.items()}
+        heap = [task_id for task_id, degree in in_degree.items() if degree == 0]
+        heapq.heapify(heap)
+        order = []
+        while heap:
+            current = heapq.heappop(heap)
+            order.append(self._tasks[current])
+            for dependent in self._dependents[current]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    heapq.heappush(heap, dependent)
+        if len(order) != len(self._tasks):
+            raise ValueError("Circular dependency detected during topological sort")
+        return order
+
+    def is_chain(self) -> bool:
+        """Whether the tasks form a single chain, each depending only on the previous one."""
+        if not self._tasks or self._missing:
+            return False
+        roots = self.roots()
+        if len(roots) != 1:
+            return False
+        current = roots[0]
+        visited = 1
+        while True:
+            dependents = self._dependents[current]
+            if not dependents:
+                return visited == len(self._tasks)
+            if len(dependents) != 1:
+                return False
+            (current,) = dependents
+            if len(self._dependencies[current]) != 1:
+                return False
+            visited += 1
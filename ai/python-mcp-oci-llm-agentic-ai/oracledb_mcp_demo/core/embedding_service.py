@@ -0,0 +1,204 @@
+"""Shared micro-batching embedding service."""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .config import get_config_value
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingEmbeddingService:
+    """Collects concurrent embed() calls and sends them as one batch.
+
+    Requests arriving within ``max_wait_ms`` of each other are grouped into
+    a single provider call of at most ``max_batch_size`` texts. Identical
+    texts pending at the same time share one slot, and recent results are
+    served from an LRU cache. The service exposes the same ``embed(text)``
+    coroutine as an embedding provider, so it can be passed wherever a
+    provider is expected.
+    """
+
+    def __init__(self, provider: Any, max_batch_size: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None, cache_size: Optional[int] = None):
+        """Initialize embedding service.
+
+        Args:
+            provider: Embedding provider with ``embed``, and optionally
+                ``embed_batch`` or ``embed_documents``
+            max_batch_size: Maximum texts per provider call
+            max_wait_ms: How long to wait for more requests before flushing
+            cache_size: Number of text→vector results to keep
+        """
+        self.provider = provider
+        self.max_batch_size = max_batch_size or get_config_value('embedding_service.max_batch_size', 32)
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else get_config_value(
+            'embedding_service.max_wait_ms', 5)
+        self.cache_size = cache_size if cache_size is not None else get_config_value(
+            'embedding_service.cache_size', 2048)
+
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._pending: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        self.stats = {
+            'requests': 0,
+            'cache_hits': 0,
+            'deduplicated': 0,
+            'batches': 0,
+            'texts_embedded': 0,
+            'errors': 0
+        }
+
+    async def embed(self, text: str) -> Optional[List[float]]:
+        """Get the embedding for one text.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector, or None if the provider failed
+        """
+        self.stats['requests'] += 1
+
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            self.stats['cache_hits'] += 1
+            return cached
+
+        future = self._pending.get(text)
+        if future is not None:
+            self.stats['deduplicated'] += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[text] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._schedule_flush(immediate=True)
+            else:
+                self._schedule_flush()
+
+        return await asyncio.shield(future)
+
+    async def embed_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Get embeddings for several texts, batched and deduplicated.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vector or None for each text, in order
+        """
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _schedule_flush(self, immediate: bool = False) -> None:
+        """Arrange for pending texts to be sent to the provider."""
+        loop = asyncio.get_running_loop()
+        if immediate:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            loop.create_task(self._flush())
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self.max_wait_ms / 1000, lambda: loop.create_task(self._flush()))
+
+    async def _flush(self) -> None:
+        """Send up to one batch of pending texts to the provider."""
+        self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch: Dict[str, asyncio.Future] = {}
+        while self._pending and len(batch) < self.max_batch_size:
+            text, future = self._pending.popitem(last=False)
+            batch[text] = future
+        if self._pending:
+            self._schedule_flush(immediate=len(self._pending) >= self.max_batch_size)
+
+        texts = list(batch.keys())
+        self.stats['batches'] += 1
+        try:
+            vectors = await self._embed_batch(texts)
+        except Exception as e:
+            logger.error(f"Batch embedding of {len(texts)} texts failed: {e}")
+            self.stats['errors'] += 1
+            vectors = [None] * len(texts)
+
+        if len(vectors) != len(texts):
+            # Never leave a caller waiting on a text the provider skipped
+            logger.error(f"Provider returned {len(vectors)} embeddings for {len(texts)} texts")
+            self.stats['errors'] += 1
+            vectors = [None] * len(texts)
+
+        for text, vector in zip(texts, vectors):
+            if vector is not None:
+                self._remember(text, vector)
+                self.stats['texts_embedded'] += 1
+            future = batch[text]
+            if not future.done():
+                future.set_result(vector)
+
+    async def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed texts with the provider's best available batch API."""
+        if hasattr(self.provider, 'embed_batch'):
+            return list(await self.provider.embed_batch(texts))
+
+        if hasattr(self.provider, 'embed_documents'):
+            result = self.provider.embed_documents(texts)
+            if asyncio.iscoroutine(result):
+                return list(await result)
+            return list(result)
+
+        # No batch API: still one gather per batch instead of one await per caller
+        results = await asyncio.gather(
+            *(self.provider.embed(text) for text in texts), return_exceptions=True)
+        return [None if isinstance(result, Exception) else result for result in results]
+
+    def _remember(self, text: str, vector: List[float]) -> None:
+        """Store a result in the LRU cache."""
+        if self.cache_size <= 0:
+            return
+        self._cache[text] = vector
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        average_batch = self.stats['texts_embedded'] / self.stats['batches'] if self.stats['batches'] else 0.0
+        return {
+            **self.stats,
+            'average_batch_size': average_batch,
+            'cached_vectors': len(self._cache),
+            'pending': len(self._pending)
+        }
+
+
+_services: Dict[int, BatchingEmbeddingService] = {}
+
+
+def get_embedding_service(provider: Any) -> Optional[BatchingEmbeddingService]:
+    """Get the shared embedding service for a provider.
+
+    Every caller using the same provider object shares one batching queue
+    and one result cache.
+
+    Args:
+        provider: Embedding provider, or an existing service
+
+    Returns:
+        Shared service, or None if no provider is given
+    """
+    if provider is None:
+        return None
+    if isinstance(provider, BatchingEmbeddingService):
+        return provider
+
+    service = _services.get(id(provider))
+    if service is None or service.provider is not provider:
+        service = BatchingEmbeddingService(provider)
+        _services[id(provider)] = service
+    return service
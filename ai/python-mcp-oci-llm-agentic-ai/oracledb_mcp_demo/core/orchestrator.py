@@ -3,7 +3,7 @@
 import asyncio
 import logging
 import subprocess
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
@@ -117,12 +117,15 @@ class Orchestrator:
         except Exception as e:
             logger.warning(f"Error stopping database session: {e}")
     
-    async def process_prompt(self, prompt: str, use_feedback_loop: Optional[bool] = None) -> dict:
+    async def process_prompt(self, prompt: str, use_feedback_loop: Optional[bool] = None,
+                             on_token: Optional[Callable[[str], None]] = None) -> dict:
         """Process user prompt using database tools.
         
         Args:
             prompt: User prompt
             use_feedback_loop: Whether to use feedback loop (overrides default)
+            on_token: Called with each text delta as the LLM streams (single
+                prompt processing only)
             
         Returns:
             Response dictionary with results and explanation
@@ -181,13 +184,43 @@ class Orchestrator:
         
         # Original processing logic for simple prompts
         logger.info("Using single prompt processing for simple prompt")
-        return await self._process_prompt_single(prompt)
+        return await self._process_prompt_single(prompt, on_token=on_token)
+    
+    async def stream_prompt(self, prompt: str, use_feedback_loop: Optional[bool] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Process a prompt, yielding LLM text as it is generated.
+        
+        Args:
+            prompt: User prompt
+            use_feedback_loop: Whether to use feedback loop (overrides default)
+            
+        Yields:
+            ``{"delta": text}`` events while the LLM streams, then
+            ``{"result": response}`` with the same response as ``process_prompt``
+        """
+        deltas: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(
+            self.process_prompt(prompt, use_feedback_loop, on_token=deltas.put_nowait)
+        )
+        try:
+            while not task.done() or not deltas.empty():
+                get_delta = asyncio.ensure_future(deltas.get())
+                await asyncio.wait({get_delta, task}, return_when=asyncio.FIRST_COMPLETED)
+                if get_delta.done():
+                    yield {"delta": get_delta.result()}
+                else:
+                    get_delta.cancel()
+            yield {"result": task.result()}
+        finally:
+            if not task.done():
+                task.cancel()
      
-    async def _process_prompt_single(self, prompt: str) -> dict:
+    async def _process_prompt_single(self, prompt: str, on_token: Optional[Callable[[str], None]] = None) -> dict:
         """Process prompt without feedback loop (original logic).
         
         Args:
             prompt: User prompt
+            on_token: Called with each text delta when streaming; the response
+                is generated in one call when omitted
             
         Returns:
             Response dictionary with results and explanation
@@ -224,7 +257,10 @@ class Orchestrator:
                 ]
             
             # Let the LLM decide what to do with the prompt
-            llm_response = self.llm_provider.generate(prompt, context, tools=mcp_tools if mcp_tools else None)
+            if on_token is None:
+                llm_response = self.llm_provider.generate(prompt, context, tools=mcp_tools if mcp_tools else None)
+            else:
+                llm_response = await self._generate_streaming(prompt, context, mcp_tools or None, on_token)
             
             # Execute any tool calls from the LLM
             results = None
@@ -255,6 +291,20 @@ class Orchestrator:
             logger.error(f"Failed to process prompt: {e}")
             raise
     
+    async def _generate_streaming(self, prompt: str, context: List[str],
+                                  tools: Optional[List[Dict[str, Any]]],
+                                  on_token: Callable[[str], None]):
+        """Stream an LLM response, forwarding text deltas, and return the complete response."""
+        async for chunk in self.llm_provider.stream(prompt, context, tools=tools):
+            if chunk.delta:
+                on_token(chunk.delta)
+            if chunk.done:
+                metadata = chunk.response.metadata
+                if metadata.get("time_to_first_token_ms") is not None:
+                    logger.info(f"LLM time to first token: {metadata['time_to_first_token_ms']:.0f}ms")
+                return chunk.response
+        raise RuntimeError("LLM stream ended without a response")
+    
     def _build_mcp_context(self, tools: List[Dict[str, Any]]) -> List[str]:
         """Build context with MCP tools information.
         
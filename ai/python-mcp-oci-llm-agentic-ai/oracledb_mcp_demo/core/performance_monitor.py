@@ -5,17 +5,56 @@ import time
 import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Tuple, Union, Callable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from collections import defaultdict, deque
-import statistics
+from collections import defaultdict
 from datetime import datetime, timedelta
 import json
+import math
+import bisect
+import contextvars
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from .config import get_config_value
 
 logger = logging.getLogger(__name__)
 
+# Trace id of the request being served; attached to observations as an exemplar
+_current_trace_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "performance_trace_id", default=None
+)
+
+
+def set_trace_id(trace_id: str) -> contextvars.Token:
+    """Attach ``trace_id`` as the exemplar of metrics recorded from now on.
+    
+    Returns:
+        Token to pass to :func:`reset_trace_id`
+    """
+    return _current_trace_id.set(trace_id)
+
+
+def reset_trace_id(token: contextvars.Token) -> None:
+    """Restore the trace id that was current before :func:`set_trace_id`."""
+    _current_trace_id.reset(token)
+
+
+@contextmanager
+def trace_context(trace_id: str):
+    """Attach ``trace_id`` as the exemplar of metrics recorded in this context."""
+    token = set_trace_id(trace_id)
+    try:
+        yield
+    finally:
+        reset_trace_id(token)
+
+
+def get_trace_id() -> Optional[str]:
+    """Get the trace id of the current context, if any."""
+    return _current_trace_id.get()
+
 
 class MetricType(Enum):
     """Metric types."""
@@ -44,15 +83,267 @@ class MetricValue:
     metadata: Optional[Dict[str, Any]] = None
 
 
+@dataclass
+class Exemplar:
+    """Sample observation linking a series to a trace."""
+    labels: Dict[str, str]
+    value: Union[int, float]
+    timestamp: float
+
+
+DEFAULT_BUCKETS: Dict[MetricUnit, Tuple[float, ...]] = {
+    MetricUnit.MILLISECONDS: (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000),
+    MetricUnit.SECONDS: (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    MetricUnit.PERCENT: (10, 20, 30, 40, 50, 60, 70, 80, 90, 100),
+    MetricUnit.COUNT: (0, 1, 2, 5, 10, 20, 50, 100),
+}
+
+
+class LogHistogram:
+    """Fixed-memory histogram with logarithmically sized buckets.
+
+    Bucket ``i`` covers ``(gamma**(i-1), gamma**i]``, so any quantile is
+    reported within ``relative_error`` of the true value. When more than
+    ``max_buckets`` are in use the two lowest buckets are merged, trading
+    accuracy at the bottom of the range for bounded memory.
+    """
+
+    def __init__(self, relative_error: float = 0.01, max_buckets: int = 2048):
+        self.relative_error = relative_error
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            lowest, second = sorted(self.buckets)[:2]
+            self.buckets[second] += self.buckets.pop(lowest)
+
+    def bucket_upper_bound(self, index: int) -> float:
+        """Upper bound of a bucket."""
+        return self.gamma ** index
+
+    def quantile(self, q: float) -> float:
+        """Estimate the value at quantile ``q`` (0.0 to 1.0)."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def clear(self) -> None:
+        self.buckets.clear()
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+
+class WindowedRate:
+    """Sliding-window rate over fixed one-second slots."""
+
+    def __init__(self, window_seconds: int = 60):
+        self.window_seconds = window_seconds
+        self._slots = [0.0] * window_seconds
+        self._epochs = [-1] * window_seconds
+
+    def add(self, amount: float, now: float) -> None:
+        second = int(now)
+        index = second % self.window_seconds
+        if self._epochs[index] != second:
+            self._epochs[index] = second
+            self._slots[index] = 0.0
+        self._slots[index] += amount
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Per-second rate over the last ``window_seconds``."""
+        now_second = int(now if now is not None else time.time())
+        oldest = now_second - self.window_seconds
+        total = sum(
+            amount for amount, epoch in zip(self._slots, self._epochs)
+            if epoch > oldest
+        )
+        return total / self.window_seconds
+
+    def clear(self) -> None:
+        self._slots = [0.0] * self.window_seconds
+        self._epochs = [-1] * self.window_seconds
+
+
+class MetricSeries:
+    """Running state for one label set of a metric.
+
+    Counters and gauges keep their total and last value; histograms and
+    summaries additionally feed a :class:`LogHistogram`. Every series tracks
+    a windowed rate of the recorded amounts. Histograms given ``buckets``
+    also count observations per bucket for exposition, keeping the latest
+    exemplar of each bucket.
+    """
+
+    def __init__(self, metric_type: MetricType, labels: Optional[Dict[str, str]] = None,
+                 relative_error: float = 0.01, window_seconds: int = 60,
+                 buckets: Tuple[float, ...] = ()):
+        self.labels = dict(labels or {})
+        self.count = 0
+        self.sum = 0.0
+        self.last: Union[int, float] = 0
+        self.last_timestamp = 0.0
+        self.window = WindowedRate(window_seconds)
+        self.histogram = (
+            LogHistogram(relative_error)
+            if metric_type in (MetricType.HISTOGRAM, MetricType.SUMMARY) else None
+        )
+        self.buckets = tuple(buckets)
+        # One slot per bound plus +Inf
+        self.bucket_counts = [0] * (len(self.buckets) + 1) if self.buckets else []
+        self.exemplars: Dict[int, Exemplar] = {}
+
+    def record(self, value: Union[int, float], timestamp: float,
+               exemplar: Optional[Dict[str, str]] = None) -> None:
+        self.count += 1
+        self.sum += value
+        self.last = value
+        self.last_timestamp = timestamp
+        self.window.add(value, timestamp)
+        if self.histogram is not None:
+            self.histogram.record(value)
+        slot = 0
+        if self.bucket_counts:
+            slot = bisect.bisect_left(self.buckets, value)
+            self.bucket_counts[slot] += 1
+        if exemplar:
+            self.exemplars[slot] = Exemplar(exemplar, value, timestamp)
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        """(upper bound, cumulative count) pairs ending with +Inf."""
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.bucket_counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        return self.histogram.quantile(q) if self.histogram else self.last
+
+    def snapshot(self, quantiles: Tuple[float, ...] = (0.5, 0.95, 0.99)) -> Dict[str, Any]:
+        """Summary of the series for export."""
+        data = {
+            'labels': self.labels,
+            'count': self.count,
+            'sum': self.sum,
+            'last': self.last,
+            'timestamp': datetime.fromtimestamp(self.last_timestamp).isoformat() if self.count else None,
+            'rate_per_second': self.window.rate(),
+        }
+        if self.histogram is not None and self.count:
+            data.update({
+                'mean': self.mean,
+                'min': self.histogram.min,
+                'max': self.histogram.max,
+                'quantiles': {f"p{int(q * 100)}": self.histogram.quantile(q) for q in quantiles},
+            })
+        return data
+
+    def clear(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.last = 0
+        self.last_timestamp = 0.0
+        self.window.clear()
+        if self.histogram is not None:
+            self.histogram.clear()
+        self.bucket_counts = [0] * len(self.bucket_counts)
+        self.exemplars.clear()
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+OVERFLOW_LABELS: Dict[str, str] = {'overflow': 'true'}
+
+
 @dataclass
 class Metric:
-    """Metric definition."""
+    """Metric definition with fixed-memory state.
+
+    ``total`` aggregates every observation; ``series`` holds one
+    :class:`MetricSeries` per label set, up to ``max_series`` after which
+    new label sets share an overflow series. Histograms without explicit
+    ``buckets`` use the defaults for their unit.
+    """
     name: str
     type: MetricType
     unit: MetricUnit
     description: str
     labels: List[str] = field(default_factory=list)
-    values: deque = field(default_factory=lambda: deque(maxlen=1000))  # Keep last 1000 values
+    relative_error: float = 0.01
+    window_seconds: int = 60
+    max_series: int = 256
+    buckets: Optional[Tuple[float, ...]] = None
+    series: Dict[LabelKey, MetricSeries] = field(default_factory=dict)
+    total: MetricSeries = field(init=False)
+
+    def __post_init__(self):
+        if self.buckets is None:
+            self.buckets = DEFAULT_BUCKETS.get(self.unit, ()) if self.type == MetricType.HISTOGRAM else ()
+        self.total = self._new_series(None)
+
+    def _new_series(self, labels: Optional[Dict[str, str]]) -> MetricSeries:
+        return MetricSeries(self.type, labels, self.relative_error, self.window_seconds, self.buckets)
+
+    def record(self, value: Union[int, float], labels: Optional[Dict[str, str]] = None,
+               timestamp: Optional[float] = None,
+               exemplar: Optional[Dict[str, str]] = None) -> None:
+        """Fold one observation into the aggregate and its label series."""
+        timestamp = timestamp if timestamp is not None else time.time()
+        self.total.record(value, timestamp, exemplar)
+        if not labels:
+            return
+        key: LabelKey = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        series = self.series.get(key)
+        if series is None:
+            if len(self.series) >= self.max_series:
+                key = tuple(OVERFLOW_LABELS.items())
+                series = self.series.get(key)
+            if series is None:
+                series = self._new_series(dict(key))
+                self.series[key] = series
+        series.record(value, timestamp, exemplar)
+
+    def clear(self) -> None:
+        self.total.clear()
+        self.series.clear()
 
 
 @dataclass
@@ -68,7 +359,8 @@ class MetricCollector(ABC):
     
     @abstractmethod
     def collect_metric(self, name: str, value: Union[int, float], 
-                      labels: Optional[Dict[str, str]] = None) -> None:
+                      labels: Optional[Dict[str, str]] = None,
+                      exemplar: Optional[Dict[str, str]] = None) -> None:
         """Collect a metric value."""
         pass
     
@@ -89,6 +381,9 @@ class InMemoryMetricCollector(MetricCollector):
     def __init__(self):
         """Initialize in-memory metric collector."""
         self.metrics: Dict[str, Metric] = {}
+        self.relative_error = get_config_value('performance.histogram_relative_error', 0.01)
+        self.window_seconds = get_config_value('performance.rate_window_seconds', 60)
+        self.max_series = get_config_value('performance.max_series_per_metric', 256)
         self._initialize_default_metrics()
     
     def _initialize_default_metrics(self) -> None:
@@ -112,27 +407,42 @@ class InMemoryMetricCollector(MetricCollector):
             Metric("rag_database_query_duration", MetricType.HISTOGRAM, MetricUnit.MILLISECONDS, "Database query duration"),
             Metric("rag_system_memory_usage", MetricType.GAUGE, MetricUnit.BYTES, "System memory usage"),
             Metric("rag_system_cpu_usage", MetricType.GAUGE, MetricUnit.PERCENT, "System CPU usage"),
+            Metric("rag_search_duration", MetricType.HISTOGRAM, MetricUnit.MILLISECONDS, "Search duration by strategy", ["strategy"]),
+            Metric("rag_parallel_query_duration", MetricType.HISTOGRAM, MetricUnit.MILLISECONDS, "Parallel RAG sub-query duration", ["status"]),
+            Metric("rag_cache_lookup_duration", MetricType.HISTOGRAM, MetricUnit.MILLISECONDS, "RAG cache lookup duration", ["level"]),
+            Metric("rag_cache_requests_total", MetricType.COUNTER, MetricUnit.COUNT, "RAG cache lookups", ["level"]),
+            Metric("rag_llm_request_duration", MetricType.HISTOGRAM, MetricUnit.MILLISECONDS, "LLM request duration", ["provider"]),
+            Metric("rag_tool_call_duration", MetricType.HISTOGRAM, MetricUnit.MILLISECONDS, "Tool call duration", ["tool", "status"]),
         ]
         
         for metric in default_metrics:
-            self.metrics[metric.name] = metric
+            self.metrics[metric.name] = replace(
+                metric,
+                relative_error=self.relative_error,
+                window_seconds=self.window_seconds,
+                max_series=self.max_series
+            )
     
     def collect_metric(self, name: str, value: Union[int, float], 
-                      labels: Optional[Dict[str, str]] = None) -> None:
-        """Collect a metric value."""
+                      labels: Optional[Dict[str, str]] = None,
+                      exemplar: Optional[Dict[str, str]] = None) -> None:
+        """Collect a metric value.
+        
+        Args:
+            name: Metric name
+            value: Observed value
+            labels: Label set of the observation
+            exemplar: Exemplar labels; defaults to the trace id of the current context
+        """
         if name not in self.metrics:
             logger.warning(f"Unknown metric: {name}")
             return
         
-        metric = self.metrics[name]
-        metric_value = MetricValue(
-            value=value,
-            timestamp=time.time(),
-            labels=labels,
-            metadata={'collector': 'in_memory'}
-        )
-        
-        metric.values.append(metric_value)
+        if exemplar is None:
+            trace_id = _current_trace_id.get()
+            if trace_id:
+                exemplar = {'trace_id': trace_id}
+        self.metrics[name].record(value, labels, exemplar=exemplar)
         logger.debug(f"Collected metric {name}: {value}")
     
     def get_metric(self, name: str) -> Optional[Metric]:
@@ -170,6 +480,9 @@ class PerformanceMonitor:
         # Alert handlers
         self.alert_handlers: List[Callable[[str, Dict[str, Any]], None]] = []
         
+        # Scrape endpoint, started on demand
+        self.metrics_server: Optional[MetricsHTTPServer] = None
+        
         # Start monitoring tasks
         asyncio.create_task(self._system_monitoring_task())
     
@@ -217,8 +530,9 @@ class PerformanceMonitor:
         query_info = self.active_queries.pop(query_id, {})
         strategy = query_info.get('strategy', 'unknown')
         
-        # Collect duration metric
-        self.collector.collect_metric("rag_query_duration", duration_ms, {'strategy': strategy})
+        # Collect duration metric, linked to the query through an exemplar
+        exemplar = {'trace_id': _current_trace_id.get() or query_id}
+        self.collector.collect_metric("rag_query_duration", duration_ms, {'strategy': strategy}, exemplar)
         
         # Collect results count metric
         if results_count > 0:
@@ -241,8 +555,48 @@ class PerformanceMonitor:
             strategy: Search strategy name
             duration_ms: Duration in milliseconds
         """
+        self.collector.collect_metric("rag_search_duration", duration_ms, {'strategy': strategy})
         metric_name = f"rag_{strategy.lower()}_search_duration"
-        self.collector.collect_metric(metric_name, duration_ms, {'strategy': strategy})
+        if self.collector.get_metric(metric_name):
+            self.collector.collect_metric(metric_name, duration_ms, {'strategy': strategy})
+    
+    def record_parallel_query_duration(self, duration_ms: float, status: str = "success") -> None:
+        """Record the duration of one parallel RAG sub-query.
+        
+        Args:
+            duration_ms: Duration in milliseconds
+            status: Outcome (success, timeout, error)
+        """
+        self.collector.collect_metric("rag_parallel_query_duration", duration_ms, {'status': status})
+    
+    def record_cache_lookup(self, level: str, duration_ms: float) -> None:
+        """Record a RAG cache lookup.
+        
+        Args:
+            level: Cache level that answered (l1, l2) or miss
+            duration_ms: Lookup duration in milliseconds
+        """
+        self.collector.collect_metric("rag_cache_lookup_duration", duration_ms, {'level': level})
+        self.collector.collect_metric("rag_cache_requests_total", 1, {'level': level})
+    
+    def record_llm_duration(self, provider: str, duration_ms: float) -> None:
+        """Record an LLM request duration.
+        
+        Args:
+            provider: LLM provider name
+            duration_ms: Duration in milliseconds
+        """
+        self.collector.collect_metric("rag_llm_request_duration", duration_ms, {'provider': provider})
+    
+    def record_tool_call_duration(self, tool: str, duration_ms: float, status: str = "success") -> None:
+        """Record a tool call duration.
+        
+        Args:
+            tool: Tool name
+            duration_ms: Duration in milliseconds
+            status: Outcome (success, error)
+        """
+        self.collector.collect_metric("rag_tool_call_duration", duration_ms, {'tool': tool, 'status': status})
     
     def record_cache_metrics(self, hit_rate: float, cache_size: int, evictions: int) -> None:
         """Record cache performance metrics.
@@ -356,6 +710,8 @@ class PerformanceMonitor:
             'active_queries': len(self.active_queries),
             'total_queries': self._get_total_queries(),
             'average_query_duration_ms': self._get_average_query_duration(),
+            'query_duration_percentiles_ms': self._get_query_duration_percentiles(),
+            'queries_per_second': self._get_queries_per_second(),
             'cache_hit_rate': self._get_cache_hit_rate(),
             'search_strategy_usage': self._get_search_strategy_usage(),
             'system_health': self._get_system_health()
@@ -366,69 +722,58 @@ class PerformanceMonitor:
     def _get_total_queries(self) -> int:
         """Get total number of queries."""
         metric = self.collector.get_metric("rag_query_total")
-        if metric and metric.values:
-            return sum(value.value for value in metric.values)
-        return 0
+        return int(metric.total.sum) if metric else 0
     
     def _get_average_query_duration(self) -> float:
         """Get average query duration."""
         metric = self.collector.get_metric("rag_query_duration")
-        if metric and metric.values:
-            values = [value.value for value in metric.values]
-            return statistics.mean(values) if values else 0.0
-        return 0.0
+        return metric.total.mean if metric else 0.0
+    
+    def _get_query_duration_percentiles(self) -> Dict[str, float]:
+        """Get p50/p95/p99 query duration in milliseconds."""
+        metric = self.collector.get_metric("rag_query_duration")
+        if not metric or not metric.total.count:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        return {
+            'p50': metric.total.quantile(0.5),
+            'p95': metric.total.quantile(0.95),
+            'p99': metric.total.quantile(0.99)
+        }
+    
+    def _get_queries_per_second(self) -> float:
+        """Get query rate over the sliding window."""
+        metric = self.collector.get_metric("rag_query_total")
+        return metric.total.window.rate() if metric else 0.0
+    
+    def _get_last_value(self, name: str) -> Union[int, float]:
+        """Get the most recent value of a metric."""
+        metric = self.collector.get_metric(name)
+        return metric.total.last if metric and metric.total.count else 0
     
     def _get_cache_hit_rate(self) -> float:
         """Get current cache hit rate."""
-        metric = self.collector.get_metric("rag_cache_hit_rate")
-        if metric and metric.values:
-            # Get the most recent value
-            return metric.values[-1].value / 100.0  # Convert from percentage
-        return 0.0
+        return self._get_last_value("rag_cache_hit_rate") / 100.0  # Convert from percentage
     
     def _get_search_strategy_usage(self) -> Dict[str, int]:
         """Get search strategy usage statistics."""
         usage = defaultdict(int)
         metric = self.collector.get_metric("rag_query_total")
         
-        if metric and metric.values:
-            for value in metric.values:
-                if value.labels and 'strategy' in value.labels:
-                    strategy = value.labels['strategy']
-                    usage[strategy] += value.value
+        if metric:
+            for series in metric.series.values():
+                if 'strategy' in series.labels:
+                    usage[series.labels['strategy']] += int(series.sum)
         
         return dict(usage)
     
     def _get_system_health(self) -> Dict[str, Any]:
         """Get system health indicators."""
-        health = {
-            'memory_usage': 0.0,
-            'cpu_usage': 0.0,
-            'database_connections': 0,
-            'cache_size': 0
+        return {
+            'memory_usage': self._get_last_value("rag_system_memory_usage"),
+            'cpu_usage': self._get_last_value("rag_system_cpu_usage"),
+            'database_connections': self._get_last_value("rag_database_connection_pool_size"),
+            'cache_size': self._get_last_value("rag_cache_size")
         }
-        
-        # Get memory usage
-        memory_metric = self.collector.get_metric("rag_system_memory_usage")
-        if memory_metric and memory_metric.values:
-            health['memory_usage'] = memory_metric.values[-1].value
-        
-        # Get CPU usage
-        cpu_metric = self.collector.get_metric("rag_system_cpu_usage")
-        if cpu_metric and cpu_metric.values:
-            health['cpu_usage'] = cpu_metric.values[-1].value
-        
-        # Get database connections
-        db_metric = self.collector.get_metric("rag_database_connection_pool_size")
-        if db_metric and db_metric.values:
-            health['database_connections'] = db_metric.values[-1].value
-        
-        # Get cache size
-        cache_metric = self.collector.get_metric("rag_cache_size")
-        if cache_metric and cache_metric.values:
-            health['cache_size'] = cache_metric.values[-1].value
-        
-        return health
     
     async def _system_monitoring_task(self) -> None:
         """Background task for system monitoring."""
@@ -460,7 +805,7 @@ class PerformanceMonitor:
         """Export metrics in specified format.
         
         Args:
-            format: Export format (json, prometheus, etc.)
+            format: Export format (json, prometheus, openmetrics)
             
         Returns:
             Exported metrics string
@@ -469,6 +814,8 @@ class PerformanceMonitor:
             return self._export_json()
         elif format.lower() == "prometheus":
             return self._export_prometheus()
+        elif format.lower() == "openmetrics":
+            return self._export_openmetrics()
         else:
             raise ValueError(f"Unsupported export format: {format}")
     
@@ -485,46 +832,202 @@ class PerformanceMonitor:
                 'type': metric.type.value,
                 'unit': metric.unit.value,
                 'description': metric.description,
-                'values': [
-                    {
-                        'value': value.value,
-                        'timestamp': datetime.fromtimestamp(value.timestamp).isoformat(),
-                        'labels': value.labels
-                    }
-                    for value in metric.values
-                ]
+                'total': metric.total.snapshot(),
+                'series': [series.snapshot() for series in list(metric.series.values())]
             }
         
         return json.dumps(export_data, indent=2)
     
     def _export_prometheus(self) -> str:
-        """Export metrics in Prometheus format."""
-        prometheus_lines = []
+        """Export metrics in the Prometheus text format (0.0.4)."""
+        return "\n".join(self._render_exposition(openmetrics=False)) + "\n"
+    
+    def _export_openmetrics(self) -> str:
+        """Export metrics in the OpenMetrics text format, with exemplars."""
+        lines = self._render_exposition(openmetrics=True)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+    
+    def _render_exposition(self, openmetrics: bool) -> List[str]:
+        """Render every metric family as exposition lines."""
+        lines: List[str] = []
         
         for name, metric in self.collector.get_all_metrics().items():
-            # Add metric help
-            prometheus_lines.append(f"# HELP {name} {metric.description}")
-            prometheus_lines.append(f"# TYPE {name} {metric.type.value}")
+            # Labelled series when present, otherwise the unlabelled aggregate
+            series_list = list(metric.series.values()) or [metric.total]
+            family = name
+            if metric.type == MetricType.COUNTER and openmetrics and name.endswith("_total"):
+                family = name[:-len("_total")]
+            lines.append(f"# HELP {family} {self._escape_help(metric.description)}")
+            lines.append(f"# TYPE {family} {metric.type.value}")
             
-            # Add metric values
-            for value in metric.values:
-                labels_str = ""
-                if value.labels:
-                    label_pairs = [f'{k}="{v}"' for k, v in value.labels.items()]
-                    labels_str = "{" + ",".join(label_pairs) + "}"
-                
-                prometheus_lines.append(f"{name}{labels_str} {value.value}")
+            for series in series_list:
+                labels = series.labels
+                if metric.type == MetricType.HISTOGRAM:
+                    for index, (bound, count) in enumerate(series.cumulative_buckets()):
+                        le = "+Inf" if bound == math.inf else self._format_value(bound)
+                        line = f"{family}_bucket{self._format_labels({**labels, 'le': le})} {count}"
+                        if openmetrics and index in series.exemplars:
+                            line += self._format_exemplar(series.exemplars[index])
+                        lines.append(line)
+                    lines.append(f"{family}_sum{self._format_labels(labels)} {self._format_value(series.sum)}")
+                    lines.append(f"{family}_count{self._format_labels(labels)} {series.count}")
+                elif metric.type == MetricType.SUMMARY:
+                    for q in (0.5, 0.95, 0.99):
+                        quantile_labels = self._format_labels({**labels, 'quantile': str(q)})
+                        lines.append(f"{family}{quantile_labels} {self._format_value(series.quantile(q))}")
+                    lines.append(f"{family}_sum{self._format_labels(labels)} {self._format_value(series.sum)}")
+                    lines.append(f"{family}_count{self._format_labels(labels)} {series.count}")
+                elif metric.type == MetricType.COUNTER:
+                    sample = f"{family}_total" if openmetrics else name
+                    line = f"{sample}{self._format_labels(labels)} {self._format_value(series.sum)}"
+                    if openmetrics and 0 in series.exemplars:
+                        line += self._format_exemplar(series.exemplars[0])
+                    lines.append(line)
+                else:
+                    lines.append(f"{family}{self._format_labels(labels)} {self._format_value(series.last)}")
+        
+        return lines
+    
+    @staticmethod
+    def _format_value(value: Union[int, float]) -> str:
+        """Render a sample value."""
+        if isinstance(value, float):
+            if math.isinf(value):
+                return "+Inf" if value > 0 else "-Inf"
+            if math.isnan(value):
+                return "NaN"
+            return repr(value)
+        return str(value)
+    
+    @staticmethod
+    def _escape_help(text: str) -> str:
+        """Escape a HELP text."""
+        return text.replace("\\", "\\\\").replace("\n", "\\n")
+    
+    @staticmethod
+    def _format_labels(labels: Dict[str, str]) -> str:
+        """Render a label set."""
+        if not labels:
+            return ""
+        label_pairs = []
+        for key, value in labels.items():
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            label_pairs.append(f'{key}="{escaped}"')
+        return "{" + ",".join(label_pairs) + "}"
+    
+    @classmethod
+    def _format_exemplar(cls, exemplar: Exemplar) -> str:
+        """Render an OpenMetrics exemplar suffix."""
+        return (f" # {cls._format_labels(exemplar.labels) or '{}'} "
+                f"{cls._format_value(exemplar.value)} {exemplar.timestamp:.3f}")
+    
+    def start_http_server(self, host: Optional[str] = None, port: Optional[int] = None) -> "MetricsHTTPServer":
+        """Serve metrics for scraping on ``/metrics`` from a background thread.
         
-        return "\n".join(prometheus_lines)
+        Args:
+            host: Bind address (defaults to performance.metrics_host)
+            port: Port (defaults to performance.metrics_port)
+            
+        Returns:
+            The running server
+        """
+        if self.metrics_server is None:
+            self.metrics_server = MetricsHTTPServer(
+                self,
+                host or get_config_value('performance.metrics_host', '127.0.0.1'),
+                port if port is not None else get_config_value('performance.metrics_port', 9464)
+            )
+            self.metrics_server.start()
+        return self.metrics_server
+    
+    def stop_http_server(self) -> None:
+        """Stop the metrics scrape server if running."""
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
     
     def clear_metrics(self) -> None:
         """Clear all collected metrics."""
         for metric in self.collector.get_all_metrics().values():
-            metric.values.clear()
+            metric.clear()
         
         logger.info("Cleared all performance metrics")
 
 
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsHTTPServer:
+    """Minimal HTTP scrape endpoint for a :class:`PerformanceMonitor`.
+    
+    ``GET /metrics`` answers in OpenMetrics when the scraper accepts it and
+    in the Prometheus text format otherwise.
+    """
+    
+    def __init__(self, monitor: PerformanceMonitor, host: str = "127.0.0.1", port: int = 9464):
+        """Initialize metrics HTTP server.
+        
+        Args:
+            monitor: Performance monitor to expose
+            host: Bind address
+            port: Port (0 picks a free port)
+        """
+        self.monitor = monitor
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+    
+    def _make_handler(self):
+        monitor = self.monitor
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    if "application/openmetrics-text" in self.headers.get("Accept", ""):
+                        body = monitor.export_metrics("openmetrics").encode("utf-8")
+                        content_type = OPENMETRICS_CONTENT_TYPE
+                    else:
+                        body = monitor.export_metrics("prometheus").encode("utf-8")
+                        content_type = PROMETHEUS_CONTENT_TYPE
+                except Exception as e:
+                    logger.error(f"Metrics export failed: {e}")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                logger.debug("metrics server: " + format, *args)
+        
+        return Handler
+    
+    def start(self) -> None:
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics endpoint listening on port {self.port}")
+    
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
 class PerformanceDecorator:
     """Decorator for measuring function performance."""
     
@@ -0,0 +1,235 @@
+"""Dependency-aware concurrent execution of task plans."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .config import get_config_value
+
+logger = logging.getLogger(__name__)
+
+# Parameters that identify the resource a tool call works on
+RESOURCE_PARAMETERS = ("connection_name", "database", "db_name")
+
+
+@dataclass
+class TaskTiming:
+    """Wall-clock timing of one scheduled task."""
+    task_id: str
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class ScheduleReport:
+    """Outcome of running a task graph."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, TaskTiming] = field(default_factory=dict)
+    failed: List[str] = field(default_factory=list)
+    cancelled: List[str] = field(default_factory=list)
+    critical_path: List[str] = field(default_factory=list)
+    makespan: float = 0.0
+
+    @property
+    def total_work(self) -> float:
+        """Sum of task durations, i.e. the time a sequential run would take."""
+        return sum(timing.duration for timing in self.timings.values())
+
+    @property
+    def critical_path_time(self) -> float:
+        return sum(self.timings[task_id].duration for task_id in self.critical_path)
+
+    @property
+    def time_savings(self) -> float:
+        """Fraction of sequential time saved by running concurrently (0-1 scale)."""
+        if self.total_work <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.makespan / self.total_work)
+
+
+class DAGScheduler:
+    """Runs tasks as soon as their dependencies have finished.
+
+    At most ``max_concurrency`` tasks run at once, and each tool is limited
+    to ``tool_limits[tool_name]`` concurrent calls per resource (the
+    connection named in the task parameters), e.g. one ``connect`` per
+    database. When a task fails, everything that depends on it is cancelled
+    while independent branches keep running.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None,
+                 tool_limits: Optional[Dict[str, int]] = None):
+        """Initialize scheduler.
+
+        Args:
+            max_concurrency: Maximum concurrently running tasks
+                (defaults to parallel.max_concurrent_tasks)
+            tool_limits: Concurrent calls allowed per tool and resource
+                (defaults to parallel.tool_concurrency_limits)
+        """
+        self.max_concurrency = max_concurrency or get_config_value('parallel.max_concurrent_tasks', 8)
+        if tool_limits is None:
+            tool_limits = get_config_value('parallel.tool_concurrency_limits',
+                                           {"mcp_oracle-sqlcl-mcp_connect": 1})
+        self.tool_limits = dict(tool_limits or {})
+
+    async def run(self, tasks: List[Any],
+                  execute: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+                  is_success: Callable[[Any], bool] = lambda result: getattr(result, 'success', True),
+                  on_cancel: Optional[Callable[[Any, str], Any]] = None,
+                  graph: Optional[Any] = None) -> ScheduleReport:
+        """Execute a task graph.
+
+        Args:
+            tasks: Tasks with ``id``, ``dependencies`` and ``tool_name``;
+                dependencies on ids outside ``tasks`` are ignored
+            execute: Coroutine ``execute(task, results)``; ``results`` holds
+                the results of finished tasks by id
+            is_success: Whether a result counts as success
+            on_cancel: Builds the result recorded for a cancelled task from
+                the task and a reason
+            graph: ``DependencyGraph`` of the tasks; when given, its edges
+                (including rule-injected ones) replace each task's
+                ``dependencies``
+
+        Returns:
+            Schedule report with results in completion order
+        """
+        report = ScheduleReport()
+        task_map = {task.id: task for task in tasks}
+        dependencies = {
+            task.id: {dep for dep in (graph.dependencies(task.id) if graph is not None
+                                      else getattr(task, 'dependencies', None) or []) if dep in task_map}
+            for task in tasks
+        }
+        dependents: Dict[str, List[str]] = {task_id: [] for task_id in task_map}
+        for task_id, deps in dependencies.items():
+            for dep in deps:
+                dependents[dep].append(task_id)
+
+        waiting = {task_id: len(deps) for task_id, deps in dependencies.items()}
+        slots = asyncio.Semaphore(self.max_concurrency)
+        tool_slots: Dict[Tuple[str, str], asyncio.Semaphore] = {}
+        running: Dict[asyncio.Task, str] = {}
+        started: set = set()
+        finished: set = set()
+        origin = time.perf_counter()
+
+        def cancel_dependents(task_id: str, reason: str) -> None:
+            stack = list(dependents[task_id])
+            while stack:
+                dependent = stack.pop()
+                if dependent in finished:
+                    continue
+                finished.add(dependent)
+                report.cancelled.append(dependent)
+                if on_cancel:
+                    report.results[dependent] = on_cancel(task_map[dependent], reason)
+                stack.extend(dependents[dependent])
+
+        async def run_one(task) -> Any:
+            limit_key = self._limit_key(task)
+            tool_slot = None
+            if limit_key is not None:
+                tool_slot = tool_slots.setdefault(limit_key, asyncio.Semaphore(self.tool_limits[limit_key[0]]))
+            # Take the tool slot first so a task queued on its tool does not hold a global slot
+            if tool_slot is not None:
+                await tool_slot.acquire()
+            try:
+                async with slots:
+                    start = time.perf_counter() - origin
+                    try:
+                        return await execute(task, report.results)
+                    finally:
+                        report.timings[task.id] = TaskTiming(task.id, start, time.perf_counter() - origin)
+            finally:
+                if tool_slot is not None:
+                    tool_slot.release()
+
+        def launch_ready(task_ids) -> None:
+            for task_id in task_ids:
+                if task_id not in started and task_id not in finished and waiting[task_id] == 0:
+                    started.add(task_id)
+                    running[asyncio.create_task(run_one(task_map[task_id]))] = task_id
+
+        # Start in the given order so ties keep the planner's ordering
+        launch_ready([task.id for task in tasks])
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task_id = running.pop(future)
+                    finished.add(task_id)
+                    try:
+                        result = future.result()
+                        error = None if is_success(result) else getattr(result, 'error', None) or "task failed"
+                        report.results[task_id] = result
+                    except Exception as e:
+                        error = str(e)
+
+                    if error is not None:
+                        logger.warning(f"Task {task_id} failed; cancelling its dependents: {error}")
+                        report.failed.append(task_id)
+                        cancel_dependents(task_id, f"dependency '{task_id}' failed: {error}")
+                        continue
+
+                    ready = []
+                    for dependent in dependents[task_id]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            ready.append(dependent)
+                    launch_ready(ready)
+        finally:
+            for future in running:
+                future.cancel()
+
+        # Tasks never started are part of a dependency cycle
+        for task_id in task_map:
+            if task_id not in finished:
+                finished.add(task_id)
+                report.cancelled.append(task_id)
+                if on_cancel:
+                    report.results[task_id] = on_cancel(task_map[task_id], "circular dependency")
+
+        report.makespan = time.perf_counter() - origin
+        report.critical_path = self._critical_path(report.timings, dependencies)
+        logger.debug(f"Ran {len(report.timings)} tasks in {report.makespan * 1000:.1f}ms "
+                     f"(sequential {report.total_work * 1000:.1f}ms, "
+                     f"critical path {' -> '.join(report.critical_path)})")
+        return report
+
+    def _limit_key(self, task) -> Optional[Tuple[str, str]]:
+        """Semaphore key for a task's tool and resource, or None if unlimited."""
+        tool_name = getattr(task, 'tool_name', None)
+        if tool_name not in self.tool_limits:
+            return None
+        parameters = getattr(task, 'parameters', None) or {}
+        resource = next((str(parameters[name]) for name in RESOURCE_PARAMETERS if name in parameters), "")
+        return tool_name, resource
+
+    @staticmethod
+    def _critical_path(timings: Dict[str, TaskTiming], dependencies: Dict[str, set]) -> List[str]:
+        """Chain of executed tasks that determined the finish time.
+
+        Walks back from the last task to finish, each time through the
+        dependency that finished last.
+        """
+        if not timings:
+            return []
+        current = max(timings.values(), key=lambda timing: timing.end).task_id
+        path = [current]
+        while True:
+            executed = [dep for dep in dependencies.get(current, ()) if dep in timings]
+            if not executed:
+                break
+            current = max(executed, key=lambda dep: timings[dep].end)
+            path.append(current)
+        path.reverse()
+        return path
@@ -1,5 +1,6 @@
-from typing import List, Tuple, Set
+from typing import List, Optional, Tuple, Set
 from core.task_system import Task, TaskType
+from core.dependency_graph import DependencyGraph
 
 
 class PlanValidator:
@@ -11,20 +12,23 @@ class PlanValidator:
             "mcp_oracle-sqlcl-mcp_connect",
         }
     
-    def validate(self, tasks: List[Task]) -> Tuple[bool, List[str]]:
+    def validate(self, tasks: List[Task], graph: Optional[DependencyGraph] = None) -> Tuple[bool, List[str]]:
         """Validate a task plan.
         
         Args:
             tasks: List of tasks to validate
+            graph: Dependency graph of the tasks, including any rule-injected
+                edges; built from the tasks when omitted
             
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
         errors = []
+        if graph is None:
+            graph = DependencyGraph(tasks)
         
         # Check for duplicate task IDs
-        task_ids = [task.id for task in tasks]
-        if len(task_ids) != len(set(task_ids)):
+        if graph.duplicate_ids:
             errors.append("Duplicate task IDs found")
         
         # Validate individual tasks
@@ -33,16 +37,16 @@ class PlanValidator:
             errors.extend(task_errors)
         
         # Check for circular dependencies
-        if self._has_circular_dependencies(tasks):
+        if self._has_circular_dependencies(graph):
             errors.append("Circular dependency detected")
         
         # Check for missing dependencies
-        missing_deps = self._find_missing_dependencies(tasks)
+        missing_deps = self._find_missing_dependencies(graph)
         if missing_deps:
             errors.append(f"Missing dependencies: {missing_deps}")
         
         # Check connect dependencies
-        connect_deps = self._check_connect_dependencies(tasks)
+        connect_deps = self._check_connect_dependencies(graph)
         errors.extend(connect_deps)
         
         return len(errors) == 0, errors
@@ -69,58 +73,23 @@ class PlanValidator:
         
         return errors
     
-    def _has_circular_dependencies(self, tasks: List[Task]) -> bool:
-        """Check for circular dependencies using DFS."""
-        task_map = {task.id: task for task in tasks}
-        visited = set()
-        rec_stack = set()
-        
-        def dfs(task_id: str) -> bool:
-            if task_id in rec_stack:
-                return True  # Circular dependency found
-            if task_id in visited:
-                return False
-            
-            visited.add(task_id)
-            rec_stack.add(task_id)
-            
-            task = task_map.get(task_id)
-            if task:
-                for dep_id in task.dependencies:
-                    if dfs(dep_id):
-                        return True
-            
-            rec_stack.remove(task_id)
-            return False
-        
-        for task in tasks:
-            if task.id not in visited:
-                if dfs(task.id):
-                    return True
-        
-        return False
+    def _has_circular_dependencies(self, graph: DependencyGraph) -> bool:
+        """Check for circular dependencies (tracked as edges are added to the graph)."""
+        return graph.has_cycle
     
-    def _find_missing_dependencies(self, tasks: List[Task]) -> List[str]:
+    def _find_missing_dependencies(self, graph: DependencyGraph) -> List[str]:
         """Find dependencies that reference non-existent tasks."""
-        task_ids = {task.id for task in tasks}
-        missing = []
-        
-        for task in tasks:
-            for dep_id in task.dependencies:
-                if dep_id not in task_ids:
-                    missing.append(f"{task.id} -> {dep_id}")
-        
-        return missing
+        return [f"{task_id} -> {dep_id}" for task_id, dep_id in graph.missing_dependencies()]
     
-    def _check_connect_dependencies(self, tasks: List[Task]) -> List[str]:
+    def _check_connect_dependencies(self, graph: DependencyGraph) -> List[str]:
         """Check that DB actions depend on connect tasks."""
         errors = []
-        connect_tasks = {task.id for task in tasks if task.task_type == TaskType.CONNECT}
+        connect_tasks = {task.id for task in graph.tasks if task.task_type == TaskType.CONNECT}
         
-        for task in tasks:
+        for task in graph.tasks:
             if (task.tool_name in self.db_action_tools and 
                 task.task_type != TaskType.CONNECT and
-                not any(dep in connect_tasks for dep in task.dependencies)):
+                not any(dep in connect_tasks for dep in graph.dependencies(task.id))):
                 errors.append(f"Task {task.id} must depend on connect task")
         
         return errors
@@ -13,6 +13,7 @@ from .cache_manager import (
     CacheStore, InMemoryCacheStore, DistributedCacheStore,
     RAGCacheManager
 )
+from .single_flight import SingleFlight
 
 __all__ = [
     # Models
@@ -38,5 +39,8 @@ __all__ = [
     "CacheStore",
     "InMemoryCacheStore",
     "DistributedCacheStore",
-    "RAGCacheManager"
+    "RAGCacheManager",
+    
+    # Request Coalescing
+    "SingleFlight"
 ]
@@ -1,10 +1,13 @@
 """Multi-tier RAG cache manager following SOLID principles."""
 
 import asyncio
+import json
 import logging
+import sqlite3
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
@@ -13,6 +16,7 @@ from .models import (
     CacheConfig, CacheMetrics, CacheLevel
 )
 from .cache_key_generator import CacheKeyGenerator, CacheKeyGeneratorFactory
+from ..performance_monitor import PerformanceMonitor
 
 logger = logging.getLogger(__name__)
 
@@ -116,55 +120,234 @@ class InMemoryCacheStore(CacheStore):
 
 
 class DistributedCacheStore(CacheStore):
-    """Distributed cache store implementation (placeholder for Redis, etc.)."""
+    """Shared cache store for multiple worker processes on one host.
     
-    def __init__(self, connection_string: str = ""):
-        """Initialize distributed cache store."""
+    Entries are serialized to JSON and kept in a SQLite database file in
+    WAL mode, so every process pointing at the same file shares one warm
+    cache. Expiry is stored as an absolute timestamp, so an entry keeps its
+    original TTL wherever it is read back. An empty connection string
+    disables the store.
+    """
+    
+    SQLITE_PREFIX = "sqlite:///"
+    
+    def __init__(self, connection_string: str = "", table: str = "rag_cache",
+                 busy_timeout_ms: int = 5000):
+        """Initialize distributed cache store.
+        
+        Args:
+            connection_string: ``sqlite:///<path>`` or a database file path
+            table: Table holding cache entries
+            busy_timeout_ms: How long a writer waits for another process's lock
+        """
         self.connection_string = connection_string
+        self.table = table
+        self.busy_timeout_ms = busy_timeout_ms
         self._connected = False
+        self._connection: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        
+        if connection_string:
+            self._connect()
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether a backing store is configured."""
+        return self._connected
+    
+    def _connect(self) -> None:
+        """Open the database file and create the cache table."""
+        path = self.connection_string
+        if path.startswith(self.SQLITE_PREFIX):
+            path = path[len(self.SQLITE_PREFIX):]
+        elif "://" in path:
+            raise ValueError(f"Unsupported distributed cache URL: {self.connection_string}")
+        
+        self._connection = sqlite3.connect(
+            path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False,
+            isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "cache_key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL)"
+        )
+        self._connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_expires_at ON {self.table} (expires_at)"
+        )
+        self._connected = True
+        logger.info(f"Distributed cache store connected: {path}")
+    
+    async def _run(self, func, *args):
+        """Run a blocking database call off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+    
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Execute a statement under the connection lock."""
+        with self._db_lock:
+            return self._connection.execute(sql, params).fetchall()
+    
+    def _executemany(self, sql: str, rows: List[tuple]) -> None:
+        """Execute a statement for many rows in one transaction."""
+        with self._db_lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(sql, rows)
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+    
+    @staticmethod
+    def _serialize(entry: CacheEntry) -> str:
+        """Serialize an entry to JSON."""
+        return json.dumps(entry.to_dict(), default=str)
+    
+    @staticmethod
+    def _deserialize(payload: str) -> CacheEntry:
+        """Deserialize an entry from JSON."""
+        return CacheEntry.from_dict(json.loads(payload))
     
     async def get(self, key: CacheKey) -> Optional[CacheEntry]:
         """Get cache entry by key."""
-        # Placeholder implementation
-        # In real implementation, this would connect to Redis/Memcached
-        logger.debug(f"Distributed cache get: {key}")
-        return None
+        entries = await self.get_many([key])
+        return entries.get(key)
+    
+    async def get_many(self, keys: List[CacheKey]) -> Dict[CacheKey, CacheEntry]:
+        """Get several entries with a single round trip.
+        
+        Args:
+            keys: Cache keys to fetch
+            
+        Returns:
+            Mapping of found, unexpired keys to entries
+        """
+        if not self._connected or not keys:
+            return {}
+        
+        placeholders = ",".join("?" for _ in keys)
+        sql = (
+            f"SELECT cache_key, payload FROM {self.table} "
+            f"WHERE cache_key IN ({placeholders}) AND (expires_at IS NULL OR expires_at > ?)"
+        )
+        
+        try:
+            rows = await self._run(self._execute, sql, (*keys, time.time()))
+        except Exception as e:
+            logger.error(f"Distributed cache get failed: {e}")
+            return {}
+        
+        entries = {}
+        for cache_key, payload in rows:
+            try:
+                entries[CacheKey(cache_key)] = self._deserialize(payload)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable distributed cache entry {cache_key}: {e}")
+        return entries
     
     async def set(self, key: CacheKey, entry: CacheEntry) -> bool:
         """Set cache entry."""
-        # Placeholder implementation
-        logger.debug(f"Distributed cache set: {key}")
-        return True
+        return await self.set_many({key: entry})
+    
+    async def set_many(self, entries: Dict[CacheKey, CacheEntry]) -> bool:
+        """Set several entries in one transaction."""
+        if not self._connected or not entries:
+            return False
+        
+        rows = [
+            (str(key), self._serialize(entry), entry.get_expiry_timestamp())
+            for key, entry in entries.items()
+        ]
+        sql = (
+            f"INSERT OR REPLACE INTO {self.table} (cache_key, payload, expires_at) "
+            "VALUES (?, ?, ?)"
+        )
+        
+        try:
+            await self._run(self._executemany, sql, rows)
+            return True
+        except Exception as e:
+            logger.error(f"Distributed cache set failed: {e}")
+            return False
     
     async def delete(self, key: CacheKey) -> bool:
         """Delete cache entry."""
-        # Placeholder implementation
-        logger.debug(f"Distributed cache delete: {key}")
-        return True
+        if not self._connected:
+            return False
+        
+        try:
+            await self._run(self._execute, f"DELETE FROM {self.table} WHERE cache_key = ?", (str(key),))
+            return True
+        except Exception as e:
+            logger.error(f"Distributed cache delete failed: {e}")
+            return False
     
     async def clear(self) -> bool:
         """Clear all cache entries."""
-        # Placeholder implementation
-        logger.debug("Distributed cache clear")
-        return True
+        if not self._connected:
+            return False
+        
+        try:
+            await self._run(self._execute, f"DELETE FROM {self.table}")
+            return True
+        except Exception as e:
+            logger.error(f"Distributed cache clear failed: {e}")
+            return False
     
     async def size(self) -> int:
         """Get current cache size."""
-        # Placeholder implementation
-        return 0
+        if not self._connected:
+            return 0
+        
+        try:
+            rows = await self._run(self._execute, f"SELECT COUNT(*) FROM {self.table}")
+            return rows[0][0]
+        except Exception as e:
+            logger.error(f"Distributed cache size failed: {e}")
+            return 0
+    
+    async def cleanup_expired(self) -> int:
+        """Remove expired entries and return count removed."""
+        if not self._connected:
+            return 0
+        
+        def _delete_expired() -> int:
+            with self._db_lock:
+                cursor = self._connection.execute(
+                    f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                    (time.time(),)
+                )
+                return cursor.rowcount
+        
+        try:
+            return await self._run(_delete_expired)
+        except Exception as e:
+            logger.error(f"Distributed cache cleanup failed: {e}")
+            return 0
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._connection is not None:
+            with self._db_lock:
+                self._connection.close()
+            self._connection = None
+        self._connected = False
 
 
 class RAGCacheManager:
     """Multi-tier RAG cache manager."""
     
-    def __init__(self, config: CacheConfig = None):
+    def __init__(self, config: CacheConfig = None, performance_monitor: Optional[PerformanceMonitor] = None):
         """Initialize RAG cache manager."""
         self.config = config or CacheConfig()
         self.config.validate()
+        self.performance_monitor = performance_monitor
         
         # Initialize cache stores
         self.l1_cache = InMemoryCacheStore(self.config.max_size)
-        self.l2_cache = DistributedCacheStore()
+        self.l2_cache = DistributedCacheStore(self.config.l2_connection_string)
         
         # Initialize key generator
         self.key_generator = CacheKeyGeneratorFactory.create_basic_generator()
@@ -177,9 +360,10 @@ class RAGCacheManager:
         self._cleanup_task = None
         self._start_cleanup_task()
     
-    async def get_cached_result(self, prompt: str, context: Dict[str, Any]) -> Optional[RAGResult]:
+    async def get_cached_result(self, prompt: str, context: Dict[str, Any]) -> Optional[Union[RAGResult, Dict[str, Any]]]:
         """Get cached RAG result for prompt and context."""
         start_time = time.time()
+        level = "miss"
         
         try:
             # Generate cache key
@@ -188,16 +372,18 @@ class RAGCacheManager:
             # Try L1 cache first (fastest)
             l1_result = await self._get_from_l1(cache_key)
             if l1_result:
+                level = CacheLevel.L1.value
                 await self._record_hit(CacheLevel.L1)
                 return l1_result
             
             # Try L2 cache (distributed)
-            l2_result = await self._get_from_l2(cache_key)
-            if l2_result:
-                # Populate L1 cache
-                await self._set_in_l1(cache_key, l2_result)
+            l2_entry = await self.l2_cache.get(cache_key)
+            if l2_entry and not l2_entry.is_expired():
+                # Populate L1 cache; the entry keeps its original TTL
+                await self._set_in_l1(cache_key, l2_entry)
+                level = CacheLevel.L2.value
                 await self._record_hit(CacheLevel.L2)
-                return l2_result
+                return l2_entry.result
             
             # Cache miss
             await self._record_miss()
@@ -211,10 +397,13 @@ class RAGCacheManager:
             # Update metrics
             response_time = (time.time() - start_time) * 1000  # Convert to ms
             self._update_response_time_metrics(response_time)
+            if self.performance_monitor:
+                self.performance_monitor.record_cache_lookup(level, response_time)
     
     async def set_cached_result(self, prompt: str, context: Dict[str, Any], 
-                               result: RAGResult, ttl_seconds: Optional[int] = None) -> bool:
-        """Set cached RAG result for prompt and context."""
+                               result: Union[RAGResult, Dict[str, Any]],
+                               ttl_seconds: Optional[int] = None) -> bool:
+        """Set cached RAG result (or JSON-serializable dict) for prompt and context."""
         try:
             # Generate cache key
             cache_key = self.key_generator.generate_key(prompt, context)
@@ -268,7 +457,9 @@ class RAGCacheManager:
         
         return {
             **self.stats.to_dict(),
-            **self.metrics.to_dict()
+            **self.metrics.to_dict(),
+            "l2_enabled": self.l2_cache.enabled,
+            "l2_size": await self.l2_cache.size()
         }
     
     async def clear_cache(self) -> bool:
@@ -295,13 +486,6 @@ class RAGCacheManager:
             return entry.result
         return None
     
-    async def _get_from_l2(self, cache_key: CacheKey) -> Optional[RAGResult]:
-        """Get result from L2 cache."""
-        entry = await self.l2_cache.get(cache_key)
-        if entry and not entry.is_expired():
-            return entry.result
-        return None
-    
     async def _set_in_l1(self, cache_key: CacheKey, entry: CacheEntry) -> bool:
         """Set entry in L1 cache."""
         return await self.l1_cache.set(cache_key, entry)
@@ -391,5 +575,6 @@ class RAGCacheManager:
             except asyncio.CancelledError:
                 pass
         
+        # L2 is shared with other processes, so it is only disconnected
         await self.l1_cache.clear()
-        await self.l2_cache.clear()
+        self.l2_cache.close()
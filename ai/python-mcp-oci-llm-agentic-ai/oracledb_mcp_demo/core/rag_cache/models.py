@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from enum import Enum
 
 
@@ -40,13 +40,36 @@ class RAGResult:
             for result in self.results
         ]
         return sum(scores) / len(scores) if scores else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert result to dictionary."""
+        return {
+            "query": self.query,
+            "results": self.results,
+            "total_found": self.total_found,
+            "metadata": self.metadata
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RAGResult":
+        """Create result from dictionary."""
+        return cls(
+            query=data["query"],
+            results=data.get("results", []),
+            total_found=data.get("total_found", 0),
+            metadata=data.get("metadata", {})
+        )
 
 
 @dataclass
 class CacheEntry:
-    """Cache entry with metadata."""
+    """Cache entry with metadata.
+    
+    ``result`` is a ``RAGResult`` or a plain JSON-serializable dict (the
+    orchestrator caches its response dicts as they are).
+    """
     key: CacheKey
-    result: RAGResult
+    result: Union[RAGResult, Dict[str, Any]]
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     accessed_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     access_count: int = 0
@@ -72,6 +95,37 @@ class CacheEntry:
     def get_time_since_last_access(self) -> float:
         """Get time since last access in seconds."""
         return (datetime.now(timezone.utc) - self.accessed_at).total_seconds()
+    
+    def get_expiry_timestamp(self) -> Optional[float]:
+        """Get absolute expiry time as a POSIX timestamp."""
+        if self.ttl_seconds is None:
+            return None
+        return self.created_at.timestamp() + self.ttl_seconds
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert entry to dictionary."""
+        return {
+            "key": str(self.key),
+            "result": self.result.to_dict() if isinstance(self.result, RAGResult) else self.result,
+            "result_type": "rag_result" if isinstance(self.result, RAGResult) else "dict",
+            "created_at": self.created_at.isoformat(),
+            "accessed_at": self.accessed_at.isoformat(),
+            "access_count": self.access_count,
+            "ttl_seconds": self.ttl_seconds
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CacheEntry":
+        """Create entry from dictionary."""
+        return cls(
+            key=CacheKey(data["key"]),
+            result=(data["result"] if data.get("result_type") == "dict"
+                    else RAGResult.from_dict(data["result"])),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            accessed_at=datetime.fromisoformat(data["accessed_at"]),
+            access_count=data.get("access_count", 0),
+            ttl_seconds=data.get("ttl_seconds")
+        )
 
 
 @dataclass
@@ -129,6 +183,7 @@ class CacheConfig:
     enable_compression: bool = True
     enable_encryption: bool = False
     compression_threshold_bytes: int = 1024  # 1KB
+    l2_connection_string: str = ""  # e.g. sqlite:////var/tmp/rag_cache.db, empty disables L2
     
     def validate(self) -> None:
         """Validate cache configuration."""
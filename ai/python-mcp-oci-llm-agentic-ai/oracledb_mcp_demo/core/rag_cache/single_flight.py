@@ -0,0 +1,83 @@
+"""Single-flight request coalescing for identical concurrent RAG requests."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .models import CacheKey
+from .cache_key_generator import CacheKeyGenerator, CacheKeyGeneratorFactory
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Coalesce concurrent requests that map to the same cache key.
+
+    The first caller for a key runs the work; callers arriving while it is
+    in flight await the same task and receive its result (or exception).
+    The shared task is shielded, so a cancelled caller does not cancel the
+    work for the others.
+    """
+
+    def __init__(self, key_generator: Optional[CacheKeyGenerator] = None):
+        """Initialize single-flight group.
+
+        Args:
+            key_generator: Generator mapping (prompt, context) to cache keys
+        """
+        self.key_generator = key_generator or CacheKeyGeneratorFactory.create_basic_generator()
+        self._in_flight: Dict[CacheKey, asyncio.Task] = {}
+        self.stats = {
+            "executed": 0,
+            "coalesced": 0,
+            "failed": 0
+        }
+
+    async def run(self, prompt: str, context: Dict[str, Any],
+                  func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``func`` once for all concurrent callers with an equivalent prompt.
+
+        Args:
+            prompt: User prompt
+            context: Request context used for the cache key
+            func: Coroutine factory doing the actual work
+
+        Returns:
+            Result of the shared execution
+        """
+        key = self.key_generator.generate_key(prompt, context)
+        return await self.do(key, func)
+
+    async def do(self, key: CacheKey, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``func`` once for all concurrent callers with the same key."""
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            logger.debug(f"Coalesced request onto in-flight key {key[:12]}")
+        else:
+            self.stats["executed"] += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: CacheKey, task: asyncio.Task) -> None:
+        """Drop a completed task from the in-flight table."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            self.stats["failed"] += 1
+
+    def in_flight(self) -> int:
+        """Get number of keys currently executing."""
+        return len(self._in_flight)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        total = self.stats["executed"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "in_flight": len(self._in_flight),
+            "coalesce_rate": self.stats["coalesced"] / total if total > 0 else 0.0
+        }
@@ -8,6 +8,7 @@ from abc import ABC, abstractmethod
 
 from .models import RAGQuery, RAGResult, ParallelExecutionResult, ExecutionMetrics, ParallelExecutionConfig
 from ..config import get_config_value
+from ..performance_monitor import PerformanceMonitor
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +25,12 @@ class RAGSystem(ABC):
 class ParallelRAGExecutor:
     """Executes multiple RAG queries in parallel with priority queuing."""
     
-    def __init__(self, config: ParallelExecutionConfig = None):
+    def __init__(self, config: ParallelExecutionConfig = None,
+                 performance_monitor: Optional[PerformanceMonitor] = None):
         """Initialize parallel executor."""
         self.config = config or ParallelExecutionConfig()
         self.config.validate()
+        self.performance_monitor = performance_monitor
         
         # Concurrency control
         self.semaphore = asyncio.Semaphore(self.config.max_concurrent_queries)
@@ -130,6 +133,7 @@ class ParallelRAGExecutor:
             execution_time = (time.time() - start_time) * 1000
             result.execution_time_ms = execution_time
             result.parallel_query_id = query.get_execution_key()
+            self._record_duration(execution_time, "success")
             
             logger.debug(f"Query completed in {execution_time:.2f}ms: {result.total_found} results")
             
@@ -138,6 +142,7 @@ class ParallelRAGExecutor:
         except asyncio.TimeoutError:
             execution_time = (time.time() - start_time) * 1000
             logger.warning(f"Query timed out after {execution_time:.2f}ms: {query.query[:100]}...")
+            self._record_duration(execution_time, "timeout")
             
             # Return empty result for timeout
             return RAGResult(
@@ -152,6 +157,7 @@ class ParallelRAGExecutor:
         except Exception as e:
             execution_time = (time.time() - start_time) * 1000
             logger.error(f"Query failed after {execution_time:.2f}ms: {e}")
+            self._record_duration(execution_time, "error")
             
             # Return empty result for failure
             return RAGResult(
@@ -163,6 +169,11 @@ class ParallelRAGExecutor:
                 parallel_query_id=query.get_execution_key()
             )
     
+    def _record_duration(self, execution_time_ms: float, status: str) -> None:
+        """Report a sub-query duration to the performance monitor, if any."""
+        if self.performance_monitor:
+            self.performance_monitor.record_parallel_query_duration(execution_time_ms, status)
+    
     async def execute_with_retry(self, query: RAGQuery) -> RAGResult:
         """Execute a query with retry logic."""
         max_attempts = query.max_retries + 1
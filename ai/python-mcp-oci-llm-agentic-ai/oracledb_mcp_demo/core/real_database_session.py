@@ -31,13 +31,40 @@ class RealToolCallResult:
     isError: bool = False
 
 class RealDatabaseSession:
-    """Real database session that uses the actual database connections from config."""
+    """Real database session that uses the actual database connections from config.
+    
+    Each named connection gets its own ``oracledb`` async connection pool, so
+    tool calls never block the event loop and concurrent tasks can run SQL in
+    parallel. ``connect`` creates the pool and makes it the current one;
+    ``run-sql`` borrows a connection from the current pool, or from the pool
+    named by its ``connection_name`` argument.
+    
+    With ``database_session.autocommit`` on (the default) every DML statement
+    is committed before its connection goes back to the pool, so COMMIT and
+    ROLLBACK have nothing to act on. With it off, the first DML statement on
+    a named connection pins one pooled connection; later statements on that
+    name run on it, one at a time, until COMMIT or ROLLBACK ends the
+    transaction and returns the connection to the pool.
+    """
     
     def __init__(self, config_manager):
         """Initialize real database session."""
         self.config_manager = config_manager
-        self.connection = None
+        self.pools: Dict[str, Any] = {}  # connection name -> oracledb.AsyncConnectionPool
+        self._pool_locks: Dict[str, asyncio.Lock] = {}
         self.current_connection_name = None
+        self._transactions: Dict[str, Any] = {}  # connection name -> pinned connection with open DML
+        self._transaction_locks: Dict[str, asyncio.Lock] = {}
+        
+        settings = 'database_session'
+        self.pool_min = config_manager.get_value(f'{settings}.pool_min', 1)
+        self.pool_max = config_manager.get_value(f'{settings}.pool_max', 4)
+        self.pool_increment = config_manager.get_value(f'{settings}.pool_increment', 1)
+        self.statement_cache_size = config_manager.get_value(f'{settings}.statement_cache_size', 50)
+        self.arraysize = config_manager.get_value(f'{settings}.arraysize', 500)
+        self.prefetchrows = config_manager.get_value(f'{settings}.prefetchrows', 501)
+        self.acquire_timeout = config_manager.get_value(f'{settings}.acquire_timeout', 30)
+        self.autocommit = config_manager.get_value(f'{settings}.autocommit', True)
         
         # Define the available tools
         self.tools = [
@@ -79,7 +106,8 @@ class RealDatabaseSession:
                 inputSchema={
                     "type": "object",
                     "properties": {
-                        "sql": {"type": "string", "description": "The SQL query to execute"}
+                        "sql": {"type": "string", "description": "The SQL query to execute"},
+                        "connection_name": {"type": "string", "description": "Saved connection to run against (defaults to the current connection)"}
                     },
                     "required": ["sql"]
                 }
@@ -117,7 +145,7 @@ class RealDatabaseSession:
             elif tool_name == "mcp_oracle-sqlcl-mcp_run-sql":
                 sql = arguments.get("sql")
                 if sql:
-                    result = await self._execute_sql(sql)
+                    result = await self._execute_sql(sql, arguments.get("connection_name"))
                 else:
                     result = "Error: sql required"
             
@@ -138,64 +166,84 @@ class RealDatabaseSession:
             logger.error(f"Error calling tool {tool_name}: {e}")
             return RealToolCallResult(content=[RealContent(f"Error: {e}")], isError=True)
     
+    def _resolve_connection_name(self, connection_name: str):
+        """Find a configured connection, exact match first, then case-insensitive.
+        
+        Returns:
+            tuple: (actual_connection_name, connection_string), both None if not found
+        """
+        databases = self.config_manager.get_databases()
+        if connection_name in databases:
+            return connection_name, databases[connection_name]
+        for db_name, conn_str in databases.items():
+            if db_name.lower() == connection_name.lower():
+                logger.info(f"Found case-insensitive match: '{connection_name}' -> '{db_name}'")
+                return db_name, conn_str
+        return None, None
+    
+    async def _get_pool(self, connection_name: str, connection_string: str):
+        """Get the pool for a named connection, creating it on first use."""
+        pool = self.pools.get(connection_name)
+        if pool is not None:
+            return pool
+        
+        lock = self._pool_locks.setdefault(connection_name, asyncio.Lock())
+        async with lock:
+            pool = self.pools.get(connection_name)
+            if pool is not None:
+                return pool
+            
+            # Parse connection string components
+            username, password, dsn, wallet_dir = self._parse_connection_string(connection_string, connection_name)
+            params = dict(
+                user=username,
+                password=password,
+                dsn=dsn,
+                min=self.pool_min,
+                max=self.pool_max,
+                increment=self.pool_increment,
+                stmtcachesize=self.statement_cache_size,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=self.acquire_timeout * 1000,
+            )
+            if wallet_dir:
+                # Wallet-based connection (Oracle Cloud, etc.)
+                params.update(
+                    config_dir=wallet_dir,
+                    wallet_location=wallet_dir,
+                    wallet_password=password
+                )
+            pool = oracledb.create_pool_async(**params)
+            
+            # Test the connection before publishing the pool
+            try:
+                async with pool.acquire() as connection:
+                    with connection.cursor() as cursor:
+                        await cursor.execute("SELECT 1 FROM DUAL")
+                        await cursor.fetchone()
+            except Exception:
+                await pool.close(force=True)
+                raise
+            
+            self.pools[connection_name] = pool
+            logger.info(f"Created connection pool for {connection_name} "
+                        f"(min={self.pool_min}, max={self.pool_max})")
+            return pool
+    
     async def _connect_to_database(self, connection_name: str):
         """Connect to a database using the connection string from config."""
         try:
             logger.info(f"Starting connection to: {connection_name}")
-            databases = self.config_manager.get_databases()
-            
-            # Case-insensitive connection lookup
-            connection_string = None
-            actual_connection_name = None
-            
-            # First try exact match
-            if connection_name in databases:
-                connection_string = databases[connection_name]
-                actual_connection_name = connection_name
-            else:
-                # Try case-insensitive match
-                for db_name, conn_str in databases.items():
-                    if db_name.lower() == connection_name.lower():
-                        connection_string = conn_str
-                        actual_connection_name = db_name
-                        logger.info(f"Found case-insensitive match: '{connection_name}' -> '{db_name}'")
-                        break
+            actual_connection_name, connection_string = self._resolve_connection_name(connection_name)
             
             if connection_string is None:
-                available_connections = list(databases.keys())
+                available_connections = list(self.config_manager.get_databases().keys())
                 return f"Error: Connection '{connection_name}' not found in config. Available connections: {available_connections}"
             
             logger.info(f"Connecting to {actual_connection_name}")
-            
-            # Parse connection string components
-            username, password, dsn, wallet_dir = self._parse_connection_string(connection_string, actual_connection_name)
-            
-            # Connect to the database
-            if wallet_dir:
-                # Wallet-based connection (Oracle Cloud, etc.)
-                self.connection = oracledb.connect(
-                    config_dir=wallet_dir,
-                    user=username,
-                    password=password,
-                    dsn=dsn,
-                    wallet_location=wallet_dir,
-                    wallet_password=password
-                )
-            else:
-                # Direct connection (no wallet)
-                self.connection = oracledb.connect(
-                    user=username,
-                    password=password,
-                    dsn=dsn
-                )
+            await self._get_pool(actual_connection_name, connection_string)
             self.current_connection_name = actual_connection_name
             
-            # Test the connection
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT 1 FROM DUAL")
-            cursor.fetchone()
-            cursor.close()
-            
             return f"Successfully connected to database: {actual_connection_name}"
             
         except Exception as e:
@@ -205,9 +253,11 @@ class RealDatabaseSession:
     async def _disconnect_from_database(self):
         """Disconnect from the current database."""
         try:
-            if self.connection:
-                self.connection.close()
-                self.connection = None
+            if self._transactions.pop(self.current_connection_name, None) is not None:
+                logger.warning(f"Rolling back open transaction on {self.current_connection_name}")
+            pool = self.pools.pop(self.current_connection_name, None) if self.current_connection_name else None
+            if pool is not None:
+                await pool.close(force=True)
                 self.current_connection_name = None
                 return "Successfully disconnected from database"
             else:
@@ -216,39 +266,102 @@ class RealDatabaseSession:
             logger.error(f"Error disconnecting from database: {e}")
             return f"Error disconnecting from database: {e}"
     
-    async def _execute_sql(self, sql: str):
-        """Execute SQL query against the connected database."""
+    async def _execute_sql(self, sql: str, connection_name: Optional[str] = None):
+        """Execute SQL on a pooled connection without blocking the event loop.
+        
+        Args:
+            sql: Statement to run
+            connection_name: Named connection to use; defaults to the current one
+        """
         try:
-            if not self.connection:
+            if connection_name:
+                actual_connection_name, connection_string = self._resolve_connection_name(connection_name)
+                if connection_string is None:
+                    return f"Error: Connection '{connection_name}' not found in config."
+                pool = await self._get_pool(actual_connection_name, connection_string)
+            else:
+                actual_connection_name = self.current_connection_name
+                pool = self.pools.get(actual_connection_name) if actual_connection_name else None
+            if pool is None:
                 return "Error: No database connection. Please connect to a database first."
             
-            cursor = self.connection.cursor()
-            cursor.execute(sql)
+            if self.autocommit:
+                async with pool.acquire() as connection:
+                    result, is_query = await self._run_statement(connection, sql)
+                    if not is_query:
+                        # Commit before the connection returns to the pool,
+                        # which would otherwise roll it back
+                        await connection.commit()
+                    return result
+            
+            lock = self._transaction_locks.setdefault(actual_connection_name, asyncio.Lock())
+            async with lock:
+                return await self._execute_in_transaction(pool, actual_connection_name, sql)
+            
+        except Exception as e:
+            logger.error(f"Error executing SQL: {e}")
+            return f"Error executing SQL: {e}"
+    
+    async def _execute_in_transaction(self, pool, connection_name: str, sql: str) -> str:
+        """Run a statement with autocommit off, keeping DML on one pinned connection."""
+        statement = " ".join(sql.strip().rstrip(";").split()).upper()
+        if statement in ("COMMIT", "COMMIT WORK", "ROLLBACK", "ROLLBACK WORK"):
+            connection = self._transactions.pop(connection_name, None)
+            verb = "Commit" if statement.startswith("COMMIT") else "Rollback"
+            if connection is None:
+                return f"{verb} complete (no open transaction on {connection_name})."
+            try:
+                if verb == "Commit":
+                    await connection.commit()
+                else:
+                    await connection.rollback()
+            finally:
+                await pool.release(connection)
+            return f"{verb} complete."
+        
+        connection = self._transactions.get(connection_name)
+        if connection is not None:
+            result, _ = await self._run_statement(connection, sql)
+            return result
+        
+        connection = await pool.acquire()
+        try:
+            result, is_query = await self._run_statement(connection, sql)
+        except Exception:
+            await pool.release(connection)
+            raise
+        if is_query:
+            await pool.release(connection)
+        else:
+            # Keep the uncommitted changes on this connection until COMMIT or ROLLBACK
+            self._transactions[connection_name] = connection
+        return result
+    
+    async def _run_statement(self, connection, sql: str) -> tuple:
+        """Execute one statement and format its output.
+        
+        Returns:
+            tuple: (result text, whether the statement returned rows)
+        """
+        with connection.cursor() as cursor:
+            # Fetch large result sets in few round trips
+            cursor.arraysize = self.arraysize
+            cursor.prefetchrows = self.prefetchrows
+            await cursor.execute(sql)
             
             # Fetch results
             if cursor.description:
                 # Query with results
                 columns = [desc[0] for desc in cursor.description]
-                rows = cursor.fetchall()
+                rows = await cursor.fetchall()
                 
                 # Format results
-                result = " | ".join(columns) + "\n"
-                result += "-" * len(result) + "\n"
-                
-                for row in rows:
-                    result += " | ".join(str(col) for col in row) + "\n"
-                
-                result += f"\n({len(rows)} rows selected)"
-            else:
-                # DML statement
-                result = f"SQL executed successfully. {cursor.rowcount} rows affected."
-            
-            cursor.close()
-            return result
+                header = " | ".join(columns)
+                lines = [header, "-" * (len(header) + 1)]
+                lines.extend(" | ".join(str(col) for col in row) for row in rows)
+                return "\n".join(lines) + f"\n\n({len(rows)} rows selected)", True
             
-        except Exception as e:
-            logger.error(f"Error executing SQL: {e}")
-            return f"Error executing SQL: {e}"
+            return f"SQL executed successfully. {cursor.rowcount} rows affected.", False
     
     def _parse_connection_string(self, connection_string: str, connection_name: str) -> tuple:
         """Parse connection string and extract components.
@@ -287,11 +400,16 @@ class RealDatabaseSession:
         return username, password, dsn, wallet_dir
     
     async def disconnect(self):
-        """Disconnect from the database."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
-            self.current_connection_name = None
+        """Close all connection pools."""
+        pools, self.pools = self.pools, {}
+        self.current_connection_name = None
+        # Closing the pools rolls back any transaction still open
+        self._transactions.clear()
+        for name, pool in pools.items():
+            try:
+                await pool.close(force=True)
+            except Exception as e:
+                logger.warning(f"Error closing connection pool {name}: {e}")
     
     async def __aenter__(self):
         """Async context manager entry."""
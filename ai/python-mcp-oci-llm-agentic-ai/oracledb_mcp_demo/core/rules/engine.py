@@ -1,6 +1,7 @@
-from typing import Iterable, List, Set, Tuple
+from typing import Iterable, List, Optional, Set, Tuple
 
 from core.task_system import Task
+from core.dependency_graph import DependencyGraph
 from core.context.store import InMemoryContextStore
 from .rules import DependencyRule
 
@@ -17,20 +18,31 @@ class DependencyRuleEngine:
         tasks: List[Task],
         deps: Set[Dependency],
         context_store: InMemoryContextStore,
+        graph: Optional[DependencyGraph] = None,
     ) -> tuple[List[Task], Set[Dependency]]:
+        """Run all rules, accumulating injected tasks and dependencies.
+
+        If ``graph`` is given it is updated in place with every injected task
+        and edge, so callers can validate and plan from it without rebuilding.
+        """
         current_tasks = list(tasks)
         current_deps = set(deps)
+        if graph is None:
+            graph = DependencyGraph(current_tasks)
+        for task_id, dep_id in current_deps:
+            if task_id in graph:
+                graph.add_dependency(task_id, dep_id)
         for rule in self._rules:
             injected_tasks, injected_deps = rule.apply(current_tasks, current_deps, context_store)
             if injected_tasks:
                 # dedup by id
-                existing = {t.id for t in current_tasks}
                 for t in injected_tasks:
-                    if t.id not in existing:
+                    if t.id not in graph:
+                        graph.add_task(t)
                         current_tasks.append(t)
-                        existing.add(t.id)
             if injected_deps:
                 current_deps |= injected_deps
+                for task_id, dep_id in injected_deps:
+                    if task_id in graph:
+                        graph.add_dependency(task_id, dep_id)
         return current_tasks, current_deps
-
-
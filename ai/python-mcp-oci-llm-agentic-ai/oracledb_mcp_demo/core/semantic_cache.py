@@ -5,12 +5,16 @@ import hashlib
 import json
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
+import heapq
 from collections import OrderedDict
 
+from .vector_index import IVFVectorIndex, VectorIndex, VectorIndexType, create_vector_index
+from .embedding_service import get_embedding_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +48,10 @@ class CacheConfig:
     cleanup_interval: int = 300  # 5 minutes
     enable_compression: bool = False
     enable_persistence: bool = False
+    index_type: VectorIndexType = VectorIndexType.FLAT
+    ivf_nlist: int = 0  # 0 = sqrt(cache size) at training time
+    ivf_nprobe: int = 8
+    semantic_candidates: int = 4  # Nearest entries checked per semantic lookup
 
 
 class CacheBackend(ABC):
@@ -76,7 +84,12 @@ class CacheBackend(ABC):
 
 
 class InMemoryCacheBackend(CacheBackend):
-    """In-memory cache backend."""
+    """In-memory cache backend with constant-time eviction.
+    
+    LRU order is kept by the insertion order of an ``OrderedDict``, LFU by
+    per-frequency buckets with a tracked minimum frequency, and TTL by a
+    min-heap of insertion timestamps with lazy deletion.
+    """
     
     def __init__(self, config: CacheConfig):
         """Initialize in-memory cache backend.
@@ -85,44 +98,61 @@ class InMemoryCacheBackend(CacheBackend):
             config: Cache configuration
         """
         self.config = config
-        self.cache: Dict[str, CacheEntry] = {}
-        self.access_order: List[str] = []
+        self.cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self.access_frequency: Dict[str, int] = {}
+        self.frequency_buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self.min_frequency = 0
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.removal_listeners: List[Callable[[str], None]] = []
+        
+        # Eviction counters
+        self.evictions = 0
+        self.expirations = 0
+    
+    def add_removal_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback invoked with the key of every removed entry."""
+        self.removal_listeners.append(listener)
+    
+    def _notify_removed(self, key: str) -> None:
+        """Notify removal listeners."""
+        for listener in self.removal_listeners:
+            try:
+                listener(key)
+            except Exception as e:
+                logger.error(f"Cache removal listener failed: {e}")
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
-        if key in self.cache:
-            entry = self.cache[key]
-            
-            # Check TTL
-            if self.config.strategy == CacheStrategy.TTL:
-                if time.time() - entry.timestamp > self.config.ttl_seconds:
-                    await self.delete(key)
-                    return None
-            
-            # Update access metadata
-            entry.access_count += 1
-            entry.last_accessed = time.time()
-            
-            # Update access order for LRU
-            if self.config.strategy == CacheStrategy.LRU:
-                if key in self.access_order:
-                    self.access_order.remove(key)
-                self.access_order.append(key)
-            
-            # Update access frequency for LFU
-            if self.config.strategy == CacheStrategy.LFU:
-                self.access_frequency[key] = self.access_frequency.get(key, 0) + 1
-            
-            return entry.value
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        
+        # Check TTL
+        if self.config.strategy == CacheStrategy.TTL:
+            if time.time() - entry.timestamp > self.config.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                return None
         
-        return None
+        # Update access metadata
+        entry.access_count += 1
+        entry.last_accessed = time.time()
+        
+        # Update access order for LRU
+        if self.config.strategy == CacheStrategy.LRU:
+            self.cache.move_to_end(key)
+        
+        # Update access frequency for LFU
+        if self.config.strategy == CacheStrategy.LFU:
+            self._increment_frequency(key)
+        
+        return entry.value
     
     async def set(self, key: str, value: Any, metadata: Optional[Dict[str, Any]] = None) -> bool:
         """Set value in cache."""
         try:
             # Check cache size and evict if necessary
-            if len(self.cache) >= self.config.max_size:
+            if key not in self.cache and len(self.cache) >= self.config.max_size:
                 await self._evict_entry()
             
             # Create cache entry
@@ -133,18 +163,22 @@ class InMemoryCacheBackend(CacheBackend):
                 metadata=metadata
             )
             
-            # Store entry
+            # Store entry; overwriting counts as the most recent use
             self.cache[key] = entry
+            self.cache.move_to_end(key)
             
-            # Update access order for LRU
-            if self.config.strategy == CacheStrategy.LRU:
-                if key in self.access_order:
-                    self.access_order.remove(key)
-                self.access_order.append(key)
-            
-            # Initialize access frequency for LFU
+            # Reset access frequency for LFU
             if self.config.strategy == CacheStrategy.LFU:
+                self._discard_frequency(key)
                 self.access_frequency[key] = 0
+                self.frequency_buckets.setdefault(0, OrderedDict())[key] = None
+                self.min_frequency = 0
+            
+            # Track expiry order for TTL
+            if self.config.strategy == CacheStrategy.TTL:
+                heapq.heappush(self.expiry_heap, (entry.timestamp, key))
+                if len(self.expiry_heap) > 2 * len(self.cache) + 64:
+                    self._compact_expiry_heap()
             
             return True
             
@@ -155,20 +189,7 @@ class InMemoryCacheBackend(CacheBackend):
     async def delete(self, key: str) -> bool:
         """Delete value from cache."""
         try:
-            if key in self.cache:
-                del self.cache[key]
-                
-                # Update access order for LRU
-                if key in self.access_order:
-                    self.access_order.remove(key)
-                
-                # Update access frequency for LFU
-                if key in self.access_frequency:
-                    del self.access_frequency[key]
-                
-                return True
-            
-            return False
+            return self._remove(key)
             
         except Exception as e:
             logger.error(f"Failed to delete cache entry: {e}")
@@ -177,9 +198,14 @@ class InMemoryCacheBackend(CacheBackend):
     async def clear(self) -> bool:
         """Clear all cache entries."""
         try:
+            removed_keys = list(self.cache.keys())
             self.cache.clear()
-            self.access_order.clear()
             self.access_frequency.clear()
+            self.frequency_buckets.clear()
+            self.min_frequency = 0
+            self.expiry_heap.clear()
+            for key in removed_keys:
+                self._notify_removed(key)
             return True
             
         except Exception as e:
@@ -190,32 +216,118 @@ class InMemoryCacheBackend(CacheBackend):
         """Get current cache size."""
         return len(self.cache)
     
+    async def expire_entries(self) -> int:
+        """Remove entries whose TTL has passed.
+        
+        Returns:
+            Number of expired entries removed
+        """
+        if self.config.strategy != CacheStrategy.TTL:
+            return 0
+        
+        cutoff = time.time() - self.config.ttl_seconds
+        expired = 0
+        while self.expiry_heap and self.expiry_heap[0][0] < cutoff:
+            timestamp, key = heapq.heappop(self.expiry_heap)
+            entry = self.cache.get(key)
+            if entry is not None and entry.timestamp == timestamp:
+                self._remove(key)
+                expired += 1
+        
+        self.expirations += expired
+        return expired
+    
+    def get_eviction_stats(self) -> Dict[str, int]:
+        """Get eviction counters."""
+        return {
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+    
+    def reset_eviction_stats(self) -> None:
+        """Reset eviction counters."""
+        self.evictions = 0
+        self.expirations = 0
+    
+    def _remove(self, key: str) -> bool:
+        """Remove an entry and its eviction bookkeeping."""
+        if self.cache.pop(key, None) is None:
+            return False
+        
+        # Heap entries for this key are skipped lazily
+        self._discard_frequency(key)
+        self._notify_removed(key)
+        return True
+    
+    def _increment_frequency(self, key: str) -> None:
+        """Move a key to the next frequency bucket."""
+        frequency = self.access_frequency.get(key, 0)
+        bucket = self.frequency_buckets.get(frequency)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self.frequency_buckets[frequency]
+                if self.min_frequency == frequency:
+                    self.min_frequency = frequency + 1
+        
+        self.access_frequency[key] = frequency + 1
+        self.frequency_buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+    
+    def _discard_frequency(self, key: str) -> None:
+        """Drop a key from the LFU buckets."""
+        frequency = self.access_frequency.pop(key, None)
+        if frequency is None:
+            return
+        
+        bucket = self.frequency_buckets.get(frequency)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self.frequency_buckets[frequency]
+                # Removing the minimum bucket only happens on delete or
+                # eviction; the next insert resets min_frequency to 0.
+                if self.min_frequency == frequency and self.frequency_buckets:
+                    self.min_frequency = min(self.frequency_buckets)
+    
+    def _compact_expiry_heap(self) -> None:
+        """Drop stale heap entries left by overwrites and deletes."""
+        self.expiry_heap = [
+            (timestamp, key) for timestamp, key in self.expiry_heap
+            if key in self.cache and self.cache[key].timestamp == timestamp
+        ]
+        heapq.heapify(self.expiry_heap)
+    
     async def _evict_entry(self) -> None:
         """Evict an entry based on cache strategy."""
         if not self.cache:
             return
         
-        if self.config.strategy == CacheStrategy.LRU:
-            # Remove least recently used
-            if self.access_order:
-                key_to_evict = self.access_order[0]
-                await self.delete(key_to_evict)
+        key_to_evict = None
         
-        elif self.config.strategy == CacheStrategy.LFU:
-            # Remove least frequently used
-            if self.access_frequency:
-                key_to_evict = min(self.access_frequency.items(), key=lambda x: x[1])[0]
-                await self.delete(key_to_evict)
+        if self.config.strategy == CacheStrategy.LFU and self.frequency_buckets:
+            # Remove least frequently used, oldest first within the bucket
+            bucket = self.frequency_buckets.get(self.min_frequency)
+            if bucket is None:
+                self.min_frequency = min(self.frequency_buckets)
+                bucket = self.frequency_buckets[self.min_frequency]
+            key_to_evict = next(iter(bucket))
         
         elif self.config.strategy == CacheStrategy.TTL:
-            # Remove oldest entry
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k].timestamp)
-            await self.delete(oldest_key)
+            # Remove oldest live entry
+            while self.expiry_heap:
+                timestamp, key = heapq.heappop(self.expiry_heap)
+                entry = self.cache.get(key)
+                if entry is not None and entry.timestamp == timestamp:
+                    key_to_evict = key
+                    break
         
-        else:
-            # Default: remove random entry
-            key_to_evict = next(iter(self.cache.keys()))
-            await self.delete(key_to_evict)
+        if key_to_evict is None:
+            # LRU, and the default for other strategies: least recently
+            # used or inserted entry is at the front
+            key_to_evict = next(iter(self.cache))
+        
+        self._remove(key_to_evict)
+        self.evictions += 1
 
 
 class SemanticCache:
@@ -229,14 +341,19 @@ class SemanticCache:
             embedding_provider: Embedding provider for semantic similarity
         """
         self.config = config
-        self.embedding_provider = embedding_provider
+        # Shared across caches so concurrent lookups are embedded in one batch
+        self.embedding_provider = get_embedding_service(embedding_provider)
         self.backend = InMemoryCacheBackend(config)
         
+        # Normalized semantic vectors, kept in sync with the backend
+        self.index: VectorIndex = self._create_index(config)
+        self.backend.add_removal_listener(self.index.remove)
+        self._index_training: Optional[asyncio.Task] = None
+        
         # Cache statistics
         self.stats = {
             'hits': 0,
             'misses': 0,
-            'evictions': 0,
             'total_queries': 0
         }
         
@@ -295,7 +412,14 @@ class SemanticCache:
         if semantic_vector:
             metadata['semantic_vector'] = semantic_vector
         
-        return await self.backend.set(key, value, metadata)
+        stored = await self.backend.set(key, value, metadata)
+        if stored:
+            if semantic_vector:
+                self.index.add(key, semantic_vector)
+                self._schedule_index_training()
+            else:
+                self.index.remove(key)
+        return stored
     
     async def delete(self, query: str) -> bool:
         """Delete value from cache.
@@ -311,12 +435,44 @@ class SemanticCache:
     
     async def clear(self) -> bool:
         """Clear all cache entries."""
-        return await self.backend.clear()
+        cleared = await self.backend.clear()
+        if self._index_training and not self._index_training.done():
+            self._index_training.cancel()
+        self.index.clear()
+        return cleared
     
     async def size(self) -> int:
         """Get current cache size."""
         return await self.backend.size()
     
+    @staticmethod
+    def _create_index(config: CacheConfig) -> VectorIndex:
+        """Create the semantic vector index for a cache configuration."""
+        if config.index_type == VectorIndexType.IVF:
+            return create_vector_index(
+                VectorIndexType.IVF,
+                nlist=config.ivf_nlist,
+                nprobe=config.ivf_nprobe
+            )
+        return create_vector_index(VectorIndexType.FLAT)
+    
+    def _schedule_index_training(self) -> None:
+        """Retrain an IVF index in the background once it has grown enough."""
+        if not isinstance(self.index, IVFVectorIndex) or not self.index.needs_training:
+            return
+        if self._index_training is None or self._index_training.done():
+            self._index_training = asyncio.create_task(self._train_index(self.index))
+    
+    async def _train_index(self, index: IVFVectorIndex) -> None:
+        """Run k-means in a worker thread so lookups keep being served meanwhile."""
+        data = index.training_data()
+        try:
+            centroids = await asyncio.to_thread(index.compute_centroids, data)
+        except Exception as e:
+            logger.error(f"Vector index training failed: {e}")
+            return
+        index.install_centroids(centroids, data.shape[0])
+    
     async def _semantic_get(self, query: str) -> Optional[Any]:
         """Get value using semantic similarity."""
         if not self.embedding_provider:
@@ -328,25 +484,18 @@ class SemanticCache:
             if not query_vector:
                 return None
             
-            # Find most similar cached entry
-            best_match = None
-            best_similarity = 0.0
-            
-            for key, entry in self.backend.cache.items():
-                if entry.metadata and 'semantic_vector' in entry.metadata:
-                    cached_vector = entry.metadata['semantic_vector']
-                    similarity = self._calculate_cosine_similarity(query_vector, cached_vector)
-                    
-                    if similarity > best_similarity and similarity >= self.config.semantic_threshold:
-                        best_similarity = similarity
-                        best_match = entry
+            # Find most similar cached entries; results are best first
+            candidates = self.index.search(query_vector, k=self.config.semantic_candidates)
             
-            if best_match:
-                self.stats['hits'] += 1
-                # Update access metadata
-                best_match.access_count += 1
-                best_match.last_accessed = time.time()
-                return best_match.value
+            for key, similarity in candidates:
+                if similarity < self.config.semantic_threshold:
+                    break
+                
+                # Backend get applies TTL and updates access metadata
+                value = await self.backend.get(key)
+                if value is not None:
+                    self.stats['hits'] += 1
+                    return value
             
             self.stats['misses'] += 1
             return None
@@ -412,19 +561,10 @@ class SemanticCache:
         if self.config.strategy != CacheStrategy.TTL:
             return
         
-        current_time = time.time()
-        expired_keys = []
-        
-        for key, entry in self.backend.cache.items():
-            if current_time - entry.timestamp > self.config.ttl_seconds:
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            await self.backend.delete(key)
-            self.stats['evictions'] += 1
+        expired = await self.backend.expire_entries()
         
-        if expired_keys:
-            logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
+        if expired:
+            logger.info(f"Cleaned up {expired} expired cache entries")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -434,9 +574,11 @@ class SemanticCache:
         
         return {
             **self.stats,
+            **self.backend.get_eviction_stats(),
             'hit_rate': hit_rate,
             'cache_size': len(self.backend.cache),
-            'max_size': self.config.max_size
+            'max_size': self.config.max_size,
+            'indexed_vectors': len(self.index)
         }
     
     def clear_stats(self) -> None:
@@ -444,9 +586,9 @@ class SemanticCache:
         self.stats = {
             'hits': 0,
             'misses': 0,
-            'evictions': 0,
             'total_queries': 0
         }
+        self.backend.reset_eviction_stats()
 
 
 class CacheManager:
@@ -2,20 +2,27 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
 from unittest.mock import Mock
 
-from .rag_cache import RAGCacheManager
+from .rag_cache import RAGCacheManager, CacheConfig, SingleFlight
 from .rag_parallel import RAGQueryDecomposer, ParallelRAGExecutor, SmartResultAggregator
 from .rag_smart import RAGContextAnalyzer, RAGContextPredictor, RAGContextOptimizer
 from .rag_smart.models import SmartContextResult, ContextRequest
 from .planning.validator import PlanValidator
+from .plan_scheduler import DAGScheduler
+from .performance_monitor import PerformanceMonitor
 
 # Backward compatibility imports
 from .task_system import TaskDecomposer
 from .dependency_analyzer import DependencyAnalyzer
+from .dependency_graph import DependencyGraph
+from .rules.engine import DependencyRuleEngine
+from .rules.rules import RequireConnectRule, ChainedAnalysisRule
+from .context.store import InMemoryContextStore
 
 logger = logging.getLogger(__name__)
 
@@ -55,9 +62,14 @@ class PerformanceOptimizedTaskOrchestrator:
         self.mcp_session = mcp_session
         
         # Initialize performance optimization systems
-        self.rag_cache_manager = RAGCacheManager()
+        self.performance_monitor = PerformanceMonitor()
+        self.rag_cache_manager = RAGCacheManager(self._cache_config(), performance_monitor=self.performance_monitor)
+        self.single_flight = SingleFlight(self.rag_cache_manager.key_generator)
         self.rag_query_decomposer = RAGQueryDecomposer()
-        self.parallel_rag_executor = ParallelRAGExecutor()
+        self.parallel_rag_executor = ParallelRAGExecutor(performance_monitor=self.performance_monitor)
+        if llm_provider is not None:
+            llm_provider.performance_monitor = self.performance_monitor
+        self._start_metrics_server()
         self.result_aggregator = SmartResultAggregator()
         
         # Initialize smart context system
@@ -68,7 +80,13 @@ class PerformanceOptimizedTaskOrchestrator:
         # Initialize planning components
         self.llm_planner = None  # Will be initialized after RAG system
         self.task_critic = None  # Will be initialized when LLM provider is available
+        self.context_store = InMemoryContextStore()
+        self.rule_engine = DependencyRuleEngine([RequireConnectRule(), ChainedAnalysisRule()])
         self.plan_validator = PlanValidator()
+        self.plan_scheduler = DAGScheduler(
+            max_concurrency=self.config.get('max_concurrent_tasks'),
+            tool_limits=self.config.get('tool_concurrency_limits')
+        )
         
         # Initialize backward compatibility components
         self.decomposer = TaskDecomposer()  # Task decomposer for backward compatibility
@@ -88,6 +106,33 @@ class PerformanceOptimizedTaskOrchestrator:
         
         logger.info("Performance-optimized task orchestrator initialized")
     
+    def _start_metrics_server(self) -> None:
+        """Expose the performance monitor on /metrics when performance.metrics_enabled is set."""
+        from .config import get_config_value
+        
+        if not get_config_value('performance.metrics_enabled', False):
+            return
+        try:
+            server = self.performance_monitor.start_http_server()
+            logger.info(f"Metrics endpoint listening on port {server.port}")
+        except OSError as e:
+            logger.warning(f"Metrics endpoint could not start: {e}")
+    
+    @staticmethod
+    def _cache_config() -> CacheConfig:
+        """Build the prompt cache configuration from the ``rag_cache`` config section."""
+        from .config import get_config_value
+        
+        defaults = CacheConfig()
+        return CacheConfig(
+            max_size=get_config_value('rag_cache.max_size', defaults.max_size),
+            default_ttl_seconds=get_config_value('rag_cache.default_ttl_seconds', defaults.default_ttl_seconds),
+            cleanup_interval_seconds=get_config_value(
+                'rag_cache.cleanup_interval_seconds', defaults.cleanup_interval_seconds
+            ),
+            l2_connection_string=get_config_value('rag_cache.l2_connection_string', defaults.l2_connection_string)
+        )
+    
     # Backward compatibility methods that existing system depends on
     async def execute_prompt(self, prompt: str) -> Dict[str, Any]:
         """Execute prompt using existing flow for backward compatibility."""
@@ -117,11 +162,32 @@ class PerformanceOptimizedTaskOrchestrator:
                 "error": str(e)
             }
     
-    async def _execute_plan(self, plan) -> Dict[str, TaskExecutionResult]:
-        """Execute execution plan for backward compatibility."""
+    def _plan_tasks(self, tasks) -> Tuple[Any, DependencyGraph]:
+        """Build the dependency graph once and share it by rules, validation and analysis.
+        
+        The rule engine adds injected tasks and edges to the graph in place,
+        the validator and analyzer read that same graph, and the scheduler
+        runs from it, so the plan is never rebuilt from the task list.
+        
+        Raises:
+            ValueError: If the plan does not validate
+        """
+        graph = DependencyGraph(tasks)
+        tasks, _ = self.rule_engine.apply(tasks, set(), self.context_store, graph)
+        is_valid, errors = self.plan_validator.validate(tasks, graph)
+        if not is_valid:
+            raise ValueError(f"Invalid plan: {'; '.join(errors)}")
+        return self.analyzer.analyze(tasks, graph), graph
+    
+    async def _execute_plan(self, plan, graph: Optional[DependencyGraph] = None) -> Dict[str, TaskExecutionResult]:
+        """Execute an execution plan, starting each task once its dependencies finish.
+        
+        Args:
+            plan: Execution plan from the dependency analyzer
+            graph: Dependency graph the plan was analyzed from; its edges
+                decide the order, otherwise each task's ``dependencies`` do
+        """
         try:
-            logger.debug("Plan execution not yet implemented with performance optimizations")
-            results = {}
             tasks = []
             if hasattr(plan, 'phases') and plan.phases:
                 for phase in plan.phases:
@@ -135,30 +201,113 @@ class PerformanceOptimizedTaskOrchestrator:
                 tasks = plan._tasks
                 logger.debug(f"Found {len(tasks)} tasks via ._tasks")
             
-            if tasks:
-                for task in tasks:
-                    try:
-                        result = await self._execute_single_task(task, results)
-                        results[task.id] = result
-                    except Exception as e:
-                        logger.error(f"Task execution failed for {task.id}: {e}")
-                        # Create error result for failed task
-                        error_result = TaskExecutionResult(
-                            task_id=task.id if hasattr(task, 'id') else 'unknown',
-                            success=False,
-                            result=f"Task failed: {str(e)}",
-                            error=str(e),
-                            metadata={"compatibility": True, "error": "execution_failed"}
-                        )
-                        results[task.id] = error_result
-            else:
+            if not tasks:
                 logger.warning("No tasks found in plan object")
+                return {}
             
-            return results
+            scheduler = self.plan_scheduler
+            if not self._bind_session_connections(tasks, graph):
+                # Session tools would race on the shared "current connection"
+                logger.info("Plan switches between connections; running its tasks one at a time")
+                scheduler = DAGScheduler(max_concurrency=1, tool_limits=self.plan_scheduler.tool_limits)
+            report = await scheduler.run(
+                tasks, self._execute_scheduled_task, on_cancel=self._cancelled_task_result, graph=graph
+            )
+            
+            if hasattr(plan, 'record_execution'):
+                plan.record_execution(report.time_savings, report.critical_path)
+            logger.info(f"Plan executed in {report.makespan * 1000:.1f}ms "
+                        f"({report.time_savings:.1%} saved, critical path: {' -> '.join(report.critical_path)})")
+            
+            return report.results
         except Exception as e:
             logger.error(f"Plan execution failed: {e}")
             return {}
     
+    @staticmethod
+    def _bind_session_connections(tasks, graph: Optional[DependencyGraph] = None) -> bool:
+        """Pin each run-sql task to the connection its connect dependency opened.
+
+        MCP sessions keep a single "current connection", so once a plan
+        connects to more than one database, concurrent branches could run SQL
+        against whichever connect happened last. Each run-sql task without a
+        ``connection_name`` gets the one from its nearest connect ancestor.
+
+        Returns:
+            False if a task that uses the current connection could not be
+            pinned while the plan connects to several databases
+        """
+        task_map = {task.id: task for task in tasks}
+
+        def dependencies(task) -> List[str]:
+            if graph is not None:
+                return list(graph.dependencies(task.id))
+            return list(getattr(task, 'dependencies', None) or [])
+
+        def tool(task) -> str:
+            return getattr(task, 'tool_name', None) or ''
+
+        connects = {
+            task.id: (getattr(task, 'parameters', None) or {}).get('connection_name')
+            for task in tasks if tool(task).endswith('_connect')
+        }
+        if len(set(connects.values())) <= 1:
+            return True
+
+        def connection_for(task) -> Optional[str]:
+            # Breadth-first so the nearest connect wins
+            queue = dependencies(task)
+            seen = set()
+            while queue:
+                dependency_id = queue.pop(0)
+                if dependency_id in seen or dependency_id not in task_map:
+                    continue
+                seen.add(dependency_id)
+                if dependency_id in connects:
+                    return connects[dependency_id]
+                queue.extend(dependencies(task_map[dependency_id]))
+            return None
+
+        all_bound = True
+        for task in tasks:
+            name = tool(task)
+            if not name.startswith('mcp_') or name.endswith('_connect') or name.endswith('_list-connections'):
+                continue
+            parameters = getattr(task, 'parameters', None)
+            if name.endswith('_run-sql') and isinstance(parameters, dict):
+                if parameters.get('connection_name'):
+                    continue
+                connection_name = connection_for(task)
+                if connection_name:
+                    parameters['connection_name'] = connection_name
+                    continue
+            all_bound = False
+        return all_bound
+
+    async def _execute_scheduled_task(self, task, results: Dict[str, TaskExecutionResult]) -> TaskExecutionResult:
+        """Execute a plan task, turning exceptions into a failed result."""
+        try:
+            return await self._execute_single_task(task, results)
+        except Exception as e:
+            logger.error(f"Task execution failed for {task.id}: {e}")
+            return TaskExecutionResult(
+                task_id=task.id if hasattr(task, 'id') else 'unknown',
+                success=False,
+                result=f"Task failed: {str(e)}",
+                error=str(e),
+                metadata={"compatibility": True, "error": "execution_failed"}
+            )
+    
+    def _cancelled_task_result(self, task, reason: str) -> TaskExecutionResult:
+        """Result recorded for a task skipped because a dependency failed."""
+        return TaskExecutionResult(
+            task_id=task.id,
+            success=False,
+            result=f"Task cancelled: {reason}",
+            error=reason,
+            metadata={"compatibility": True, "error": "dependency_failed", "cancelled": True}
+        )
+    
     async def _execute_single_task(self, task, context: Dict[str, Any] = None) -> TaskExecutionResult:
         """Execute single task for backward compatibility."""
         try:
@@ -218,7 +367,15 @@ class PerformanceOptimizedTaskOrchestrator:
                     
                     # Call the MCP tool
                     if hasattr(self.mcp_session, 'call_tool'):
-                        mcp_result = await self.mcp_session.call_tool(task.tool_name, parameters)
+                        started = time.perf_counter()
+                        status = "error"
+                        try:
+                            mcp_result = await self.mcp_session.call_tool(task.tool_name, parameters)
+                            if getattr(mcp_result, 'isError', False) is not True:
+                                status = "success"
+                        finally:
+                            self.performance_monitor.record_tool_call_duration(
+                                task.tool_name, (time.perf_counter() - started) * 1000, status)
                         
                         # Extract text content from MCP result
                         if isinstance(mcp_result, dict) and 'content' in mcp_result:
@@ -382,21 +539,10 @@ class PerformanceOptimizedTaskOrchestrator:
             
             self._update_metrics("cache_misses")
             
-            # Step 3: Query Decomposition for Parallel Execution
-            decomposed_queries = await self._decompose_query(user_prompt, context_result)
-            
-            # Step 4: Parallel RAG Execution
-            parallel_results = await self._execute_parallel_rag(decomposed_queries, context_result)
-            
-            # Step 5: Result Aggregation and Deduplication
-            final_result = await self._aggregate_results(parallel_results, context_result)
-            
-            # Step 6: Cache the Result
-            await self._cache_rag_result(user_prompt, final_result, context_result)
-            
-            # Step 7: Update Performance Metrics
-            self._update_metrics("parallel_executions")
-            self._update_metrics("context_optimizations")
+            # Steps 3-6 run once for all concurrent identical prompts
+            final_result = await self.single_flight.run(
+                user_prompt, {}, lambda: self._execute_rag_pipeline(user_prompt, context_result)
+            )
             
             return self._format_response(final_result, "optimized", start_time)
             
@@ -405,6 +551,26 @@ class PerformanceOptimizedTaskOrchestrator:
             # Return a proper error response with fallback
             return self._format_error_response(str(e), start_time)
     
+    async def _execute_rag_pipeline(self, user_prompt: str, context_result: SmartContextResult) -> Dict[str, Any]:
+        """Decompose, retrieve, aggregate and cache the result for a prompt."""
+        # Step 3: Query Decomposition for Parallel Execution
+        decomposed_queries = await self._decompose_query(user_prompt, context_result)
+        
+        # Step 4: Parallel RAG Execution
+        parallel_results = await self._execute_parallel_rag(decomposed_queries, context_result)
+        
+        # Step 5: Result Aggregation and Deduplication
+        final_result = await self._aggregate_results(parallel_results, context_result)
+        
+        # Step 6: Cache the Result
+        await self._cache_rag_result(user_prompt, final_result, context_result)
+        
+        # Step 7: Update Performance Metrics
+        self._update_metrics("parallel_executions")
+        self._update_metrics("context_optimizations")
+        
+        return final_result
+    
     async def _analyze_and_optimize_context(self, user_prompt: str, user_context: Dict[str, Any]) -> SmartContextResult:
         """Analyze and optimize context retrieval strategy."""
         # Analyze prompt complexity and requirements
@@ -451,7 +617,7 @@ class PerformanceOptimizedTaskOrchestrator:
             cached_result = await self.rag_cache_manager.get_cached_result(user_prompt, {})
             if cached_result:
                 logger.info("Cache hit - returning cached result")
-                return cached_result.result
+                return cached_result
             return None
         except Exception as e:
             logger.warning(f"Cache check failed: {e}")
@@ -664,6 +830,7 @@ class PerformanceOptimizedTaskOrchestrator:
                 "optimizations": self.performance_metrics["context_optimizations"],
                 "optimization_rate": self.performance_metrics["context_optimizations"] / max(total_requests, 1)
             },
+            "request_coalescing": self.single_flight.get_statistics(),
             "overall": {
                 "total_requests": total_requests,
                 "average_response_time_ms": self.performance_metrics["total_response_time_ms"] / max(total_requests, 1)
@@ -673,7 +840,8 @@ class PerformanceOptimizedTaskOrchestrator:
     async def cleanup(self):
         """Cleanup resources."""
         try:
-            await self.rag_cache_manager.cleanup()
+            await self.rag_cache_manager.close()
+            self.performance_monitor.stop_http_server()
             logger.info("Task orchestrator cleanup completed")
         except Exception as e:
             logger.error(f"Cleanup failed: {e}")
@@ -768,10 +936,16 @@ class PerformanceOptimizedTaskOrchestrator:
                     
                     if tasks:
                         # Execute the tasks
-                        execution_results = {}
-                        for task in tasks:
-                            result = await self._execute_single_task(task, execution_results)
-                            execution_results[task.id] = result
+                        try:
+                            plan, graph = self._plan_tasks(tasks)
+                            logger.info(plan.get_summary())
+                            execution_results = await self._execute_plan(plan, graph)
+                        except ValueError as e:
+                            logger.warning(f"{e}; running the tasks in order")
+                            execution_results = {}
+                            for task in tasks:
+                                result = await self._execute_single_task(task, execution_results)
+                                execution_results[task.id] = result
                         
                         # Combine results
                         if hasattr(self, '_combine_results'):
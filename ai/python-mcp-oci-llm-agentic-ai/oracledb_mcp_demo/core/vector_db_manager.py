@@ -13,6 +13,7 @@ from vector_db.rag_retriever import RAGRetriever
 from vector_db.feedback_repository import FeedbackRepository
 from vector_db.oracle_vector_store import OracleVectorStore
 from .performance_monitor import PerformanceMonitor
+from .embedding_service import get_embedding_service
 from .config import get_config_value
 
 logger = logging.getLogger(__name__)
@@ -114,6 +115,9 @@ class VectorDBManager:
         self.vector_store = rag_retriever.vector_store
         self.feedback_repository = rag_retriever.feedback_repository
         self.performance_monitor = performance_monitor
+        self.embedding_service = get_embedding_service(
+            getattr(self.vector_store, 'embedding_provider', None)
+        )
         
         logger.info("Vector Database Manager initialized")
     
@@ -133,10 +137,11 @@ class VectorDBManager:
             feedback_record = information.to_feedback_record()
             
             # Generate embedding if not provided
-            if not information.embedding_vector:
+            embedding_vector = information.embedding_vector
+            if not embedding_vector:
                 embedding_vector = await self._generate_embedding(information.content)
-                if embedding_vector:
-                    feedback_record.context['embedding_vector'] = embedding_vector
+            if embedding_vector:
+                feedback_record.context['embedding_vector'] = embedding_vector
             
             # Store in feedback repository
             success = await self.feedback_repository.create_feedback(feedback_record)
@@ -170,6 +175,14 @@ class VectorDBManager:
         
         logger.info(f"Starting batch addition of {len(information_list)} information records")
         
+        # Embed all missing vectors up front; the service sends them in batches
+        if self.embedding_service:
+            missing = [info for info in information_list if not info.embedding_vector]
+            if missing:
+                vectors = await self.embedding_service.embed_many([info.content for info in missing])
+                for info, vector in zip(missing, vectors):
+                    info.embedding_vector = vector
+        
         # Process in batches to avoid overwhelming the system
         batch_size = get_config_value('batch.vector_db_batch_size', 10)  # From config
         for i in range(0, len(information_list), batch_size):
@@ -397,8 +410,8 @@ class VectorDBManager:
             Embedding vector if successful, None otherwise
         """
         try:
-            if hasattr(self.vector_store, 'embedding_provider'):
-                embedding = await self.vector_store.embedding_provider.embed(text)
+            if self.embedding_service:
+                embedding = await self.embedding_service.embed(text)
                 return embedding
             else:
                 logger.warning("No embedding provider available")
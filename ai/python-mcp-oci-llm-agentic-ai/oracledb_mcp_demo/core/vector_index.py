@@ -0,0 +1,360 @@
+"""In-memory vector indexes for semantic cache lookups."""
+
+import logging
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndexType(Enum):
+    """Vector index types."""
+    FLAT = "flat"  # Exact search, one matrix-vector product
+    IVF = "ivf"  # Inverted file, probes the nearest clusters only
+
+
+class VectorIndex(ABC):
+    """Abstract vector index keyed by cache key.
+
+    Vectors are L2-normalized on insert so that a dot product is the
+    cosine similarity.
+    """
+
+    @abstractmethod
+    def add(self, key: str, vector: Sequence[float]) -> bool:
+        """Add or replace the vector stored for a key."""
+        pass
+
+    @abstractmethod
+    def remove(self, key: str) -> bool:
+        """Remove the vector stored for a key."""
+        pass
+
+    @abstractmethod
+    def search(self, vector: Sequence[float], k: int = 1) -> List[Tuple[str, float]]:
+        """Return up to k (key, cosine similarity) pairs, best first."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all vectors."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __contains__(self, key: str) -> bool:
+        pass
+
+
+def _normalize(vector: Sequence[float], dimension: Optional[int] = None) -> Optional[np.ndarray]:
+    """Convert a vector to a normalized float32 array, or None if unusable."""
+    array = np.asarray(vector, dtype=np.float32).reshape(-1)
+    if dimension is not None and array.shape[0] != dimension:
+        return None
+    norm = float(np.linalg.norm(array))
+    if norm == 0.0 or not np.isfinite(norm):
+        return None
+    return array / norm
+
+
+class FlatVectorIndex(VectorIndex):
+    """Exact index backed by one contiguous, pre-normalized matrix.
+
+    Rows are kept dense: deleting a key moves the last row into the hole,
+    so search is always a single matrix-vector product over ``len(self)``
+    rows.
+    """
+
+    def __init__(self, dimension: Optional[int] = None, initial_capacity: int = 1024):
+        """Initialize flat index.
+
+        Args:
+            dimension: Vector dimension, inferred from the first vector if None
+            initial_capacity: Number of rows to preallocate
+        """
+        self.dimension = dimension
+        self._initial_capacity = max(1, initial_capacity)
+        self._matrix: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def add(self, key: str, vector: Sequence[float]) -> bool:
+        """Add or replace the vector stored for a key."""
+        normalized = _normalize(vector, self.dimension)
+        if normalized is None:
+            logger.warning(f"Skipping vector for key {key}: wrong dimension or zero norm")
+            return False
+        return self.add_normalized(key, normalized)
+
+    def add_normalized(self, key: str, normalized: np.ndarray) -> bool:
+        """Add a vector that is already normalized."""
+        if self.dimension is None:
+            self.dimension = normalized.shape[0]
+        if self._matrix is None:
+            self._matrix = np.empty((self._initial_capacity, self.dimension), dtype=np.float32)
+
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            if row >= self._matrix.shape[0]:
+                grown = np.empty((self._matrix.shape[0] * 2, self.dimension), dtype=np.float32)
+                grown[:row] = self._matrix[:row]
+                self._matrix = grown
+            self._keys.append(key)
+            self._rows[key] = row
+
+        self._matrix[row] = normalized
+        return True
+
+    def remove(self, key: str) -> bool:
+        """Remove the vector stored for a key."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+
+        last = len(self._keys) - 1
+        if row != last:
+            moved_key = self._keys[last]
+            self._matrix[row] = self._matrix[last]
+            self._keys[row] = moved_key
+            self._rows[moved_key] = row
+        self._keys.pop()
+        return True
+
+    def search(self, vector: Sequence[float], k: int = 1) -> List[Tuple[str, float]]:
+        """Return up to k (key, cosine similarity) pairs, best first."""
+        if not self._keys:
+            return []
+        normalized = _normalize(vector, self.dimension)
+        if normalized is None:
+            return []
+        return self.search_normalized(normalized, k)
+
+    def search_normalized(self, normalized: np.ndarray, k: int = 1) -> List[Tuple[str, float]]:
+        """Search with a query vector that is already normalized."""
+        count = len(self._keys)
+        if count == 0 or k <= 0:
+            return []
+
+        scores = self._matrix[:count] @ normalized
+        k = min(k, count)
+        if k == 1:
+            top = [int(np.argmax(scores))]
+        else:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        return [(self._keys[i], float(scores[i])) for i in top]
+
+    def vectors(self) -> np.ndarray:
+        """Return a view of the stored (normalized) vectors."""
+        if self._matrix is None:
+            return np.empty((0, self.dimension or 0), dtype=np.float32)
+        return self._matrix[:len(self._keys)]
+
+    def keys(self) -> List[str]:
+        """Return keys in row order."""
+        return list(self._keys)
+
+    def clear(self) -> None:
+        """Remove all vectors."""
+        self._matrix = None
+        self._keys.clear()
+        self._rows.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+
+class IVFVectorIndex(VectorIndex):
+    """Approximate inverted-file index.
+
+    Vectors are assigned to the nearest of ``nlist`` k-means centroids and
+    a query only scans the ``nprobe`` closest lists. Until the centroids
+    are trained the index answers exactly from a flat index.
+
+    ``add`` never trains: k-means over the whole index is too slow for the
+    insert path. Owners check :attr:`needs_training` (set once there are
+    ``min_train_size`` vectors and whenever the size has doubled since the
+    last run) and call :meth:`train`, or run :meth:`compute_centroids` on a
+    :meth:`training_data` snapshot in a worker thread and hand the result to
+    :meth:`install_centroids`.
+    """
+
+    def __init__(self, dimension: Optional[int] = None, nlist: int = 0, nprobe: int = 8,
+                 min_train_size: int = 2048, kmeans_iterations: int = 10, seed: int = 0):
+        """Initialize IVF index.
+
+        Args:
+            dimension: Vector dimension, inferred from the first vector if None
+            nlist: Number of clusters, 0 picks ``sqrt(n)`` at training time
+            nprobe: Number of clusters scanned per query
+            min_train_size: Number of vectors needed before clustering
+            kmeans_iterations: Lloyd iterations per training run
+            seed: Random seed for centroid initialization
+        """
+        self.dimension = dimension
+        self.nlist = nlist
+        self.nprobe = max(1, nprobe)
+        self.min_train_size = max(1, min_train_size)
+        self.kmeans_iterations = kmeans_iterations
+        self._rng = np.random.default_rng(seed)
+
+        self._flat = FlatVectorIndex(dimension)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[FlatVectorIndex] = []
+        self._assignment: Dict[str, int] = {}
+        self._trained_size = 0
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the coarse quantizer has been trained."""
+        return self._centroids is not None
+
+    @property
+    def needs_training(self) -> bool:
+        """Whether the index has grown enough to (re)train the centroids."""
+        size = len(self._flat)
+        return size >= self.min_train_size and size >= 2 * self._trained_size
+
+    def add(self, key: str, vector: Sequence[float]) -> bool:
+        """Add or replace the vector stored for a key."""
+        normalized = _normalize(vector, self.dimension)
+        if normalized is None:
+            logger.warning(f"Skipping vector for key {key}: wrong dimension or zero norm")
+            return False
+        if self.dimension is None:
+            self.dimension = normalized.shape[0]
+
+        self._flat.add_normalized(key, normalized)
+        if self.is_trained:
+            self._assign(key, normalized)
+        return True
+
+    def remove(self, key: str) -> bool:
+        """Remove the vector stored for a key."""
+        if not self._flat.remove(key):
+            return False
+        cluster = self._assignment.pop(key, None)
+        if cluster is not None:
+            self._lists[cluster].remove(key)
+        return True
+
+    def search(self, vector: Sequence[float], k: int = 1) -> List[Tuple[str, float]]:
+        """Return up to k (key, cosine similarity) pairs, best first."""
+        normalized = _normalize(vector, self.dimension)
+        if normalized is None or len(self._flat) == 0:
+            return []
+        if not self.is_trained:
+            return self._flat.search_normalized(normalized, k)
+
+        centroid_scores = self._centroids @ normalized
+        nprobe = min(self.nprobe, len(self._lists))
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        candidates: List[Tuple[str, float]] = []
+        for cluster in probes:
+            candidates.extend(self._lists[cluster].search_normalized(normalized, k))
+        candidates.sort(key=lambda item: item[1], reverse=True)
+        return candidates[:k]
+
+    def train(self) -> None:
+        """(Re)train centroids on the stored vectors and rebuild the lists."""
+        data = self.training_data()
+        if data.shape[0] == 0:
+            return
+        self.install_centroids(self.compute_centroids(data), data.shape[0])
+
+    def training_data(self) -> np.ndarray:
+        """Copy of the stored vectors, safe to train on while the index changes."""
+        return self._flat.vectors().copy()
+
+    def compute_centroids(self, data: np.ndarray) -> np.ndarray:
+        """Run k-means over ``data`` without touching the index.
+
+        Args:
+            data: Normalized vectors, e.g. from :meth:`training_data`
+
+        Returns:
+            Normalized centroids, one row per list
+        """
+        size = data.shape[0]
+        nlist = self.nlist or int(np.sqrt(size))
+        nlist = max(1, min(nlist, size))
+        centroids = data[self._rng.choice(size, nlist, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = data[labels == cluster]
+                if len(members):
+                    mean = members.mean(axis=0)
+                    norm = np.linalg.norm(mean)
+                    if norm > 0:
+                        centroids[cluster] = mean / norm
+        return centroids
+
+    def install_centroids(self, centroids: np.ndarray, trained_size: int) -> None:
+        """Switch to new centroids and rebuild the lists from the current vectors.
+
+        Args:
+            centroids: Centroids from :meth:`compute_centroids`
+            trained_size: Number of vectors the centroids were trained on
+        """
+        data = self._flat.vectors()
+        self._centroids = centroids
+        self._lists = [FlatVectorIndex(self.dimension, initial_capacity=64) for _ in range(len(centroids))]
+        self._assignment.clear()
+        if data.shape[0]:
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for key, row, cluster in zip(self._flat.keys(), data, labels):
+                self._lists[int(cluster)].add_normalized(key, row)
+                self._assignment[key] = int(cluster)
+        self._trained_size = trained_size
+        logger.debug(f"Trained IVF index with {len(centroids)} lists over {trained_size} vectors")
+
+    def _assign(self, key: str, normalized: np.ndarray) -> None:
+        """Place a vector in the list of its nearest centroid."""
+        cluster = int(np.argmax(self._centroids @ normalized))
+        previous = self._assignment.get(key)
+        if previous is not None and previous != cluster:
+            self._lists[previous].remove(key)
+        self._lists[cluster].add_normalized(key, normalized)
+        self._assignment[key] = cluster
+
+    def clear(self) -> None:
+        """Remove all vectors and the trained centroids."""
+        self._flat.clear()
+        self._centroids = None
+        self._lists = []
+        self._assignment.clear()
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._flat)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._flat
+
+
+def create_vector_index(index_type: VectorIndexType = VectorIndexType.FLAT, **kwargs) -> VectorIndex:
+    """Create a vector index.
+
+    Args:
+        index_type: Index type
+        **kwargs: Index-specific options
+
+    Returns:
+        Vector index instance
+    """
+    if index_type == VectorIndexType.IVF:
+        return IVFVectorIndex(**kwargs)
+    return FlatVectorIndex(**kwargs)
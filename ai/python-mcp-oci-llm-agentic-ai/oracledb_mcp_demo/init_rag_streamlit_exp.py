@@ -60,6 +60,23 @@ class OracleMCPUI:
         # Placeholder for processing commands
         return {"sql": "SELECT * FROM dual;", "results": [{"DUMMY": 1}], "explanation": "Example explanation"}
 
+    async def stream_prompt(self, prompt: str):
+        # Same events as Orchestrator.stream_prompt: text deltas, then the result
+        yield {"result": await self.process_prompt(prompt)}
+
+
+async def run_mcp_prompt(mcp, prompt, placeholder):
+    """Show streamed LLM text in ``placeholder`` and return the final result."""
+    text = ""
+    result = {}
+    async for event in mcp.stream_prompt(prompt):
+        if "delta" in event:
+            text += event["delta"]
+            placeholder.markdown(text)
+        else:
+            result = event["result"]
+    return result
+
 
 # ----------------- EMBEDDINGS & VECTORSTORE -----------------
 def create_cached_embedder():
@@ -157,12 +174,14 @@ Question: {question}
     return rag_chain
 
 
-def get_answer(rag_chain, question):
-    response = rag_chain.invoke(question)
+def stream_answer(rag_chain, question):
+    """Yield answer text as the LLM generates it."""
     if DEBUG:
         print(f"Question: {question}")
-        print("Response:", response)
-    return response.content
+    for chunk in rag_chain.stream(question):
+        text = getattr(chunk, "content", chunk)
+        if text:
+            yield text
 
 
 # ----------------- STREAMLIT APP -----------------
@@ -192,7 +211,7 @@ if st.session_state.started:
     mcp_prompt = st.text_input("💬 Enter MCP command:", placeholder="e.g. Show me current sessions", key="mcp_input")
     if mcp_prompt:
         try:
-            result = asyncio.run(st.session_state.Mcp.process_prompt(mcp_prompt))
+            result = asyncio.run(run_mcp_prompt(st.session_state.Mcp, mcp_prompt, st.empty()))
             if result.get("sql"):
                 st.subheader("🧠 Generated SQL")
                 st.code(result["sql"], language="sql")
@@ -224,8 +243,10 @@ else:
         st.chat_message("user").markdown(user_question)
         st.session_state.messages.append({"role": "user", "content": user_question})
         try:
-            answer = get_answer(rag_chain, user_question)
-            st.chat_message("assistant").markdown(answer)
+            # Render tokens as they arrive instead of waiting for the full answer
+            answer = st.chat_message("assistant").write_stream(stream_answer(rag_chain, user_question))
+            if DEBUG:
+                print("Response:", answer)
             st.session_state.messages.append({"role": "assistant", "content": answer})
         except Exception as e:
             st.error(f"RAG error: {e}")
@@ -1,7 +1,12 @@
 """Base LLM provider interface."""
 
+import asyncio
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
 
 
 class LLMResponse:
@@ -31,9 +36,80 @@ class LLMResponse:
         self.tool_calls = tool_calls or []
 
 
+class StreamChunk:
+    """Incremental piece of a streamed LLM response."""
+    
+    def __init__(
+        self,
+        delta: str = "",
+        tool_calls: Optional[List[Dict[str, Any]]] = None,
+        response: Optional[LLMResponse] = None,
+    ):
+        """Initialize stream chunk.
+        
+        Args:
+            delta: Newly generated text
+            tool_calls: Tool calls completed since the previous chunk
+            response: Complete response, set on the last chunk only
+        """
+        self.delta = delta
+        self.tool_calls = tool_calls or []
+        self.response = response
+    
+    @property
+    def done(self) -> bool:
+        """Whether this is the last chunk of the stream."""
+        return self.response is not None
+
+
+async def iterate_in_thread(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """Consume a blocking iterator in a worker thread, yielding items as they arrive.
+    
+    Args:
+        iterator: Blocking iterator, e.g. a synchronous SDK stream
+        
+    Yields:
+        Items of the iterator, without blocking the event loop between them
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    stop = threading.Event()
+    
+    def pump() -> None:
+        try:
+            for item in iterator:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+                if stop.is_set():
+                    break
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, (finished, e))
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if stop.is_set() and close:
+                close()
+        loop.call_soon_threadsafe(queue.put_nowait, (finished, None))
+    
+    loop.run_in_executor(None, pump)
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is finished:
+                break
+            yield item
+    finally:
+        # Let the worker stop at the next item if the consumer gave up early
+        stop.set()
+
+
 class LLMProvider(ABC):
     """Base class for LLM providers."""
     
+    name = "llm"
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize LLM provider.
         
@@ -41,6 +117,22 @@ class LLMProvider(ABC):
             config: Provider-specific configuration
         """
         self.config = config
+        # Set by the task orchestrator so request durations reach /metrics
+        self.performance_monitor = None
+    
+    def _record_duration(self, started: float) -> float:
+        """Record the time since ``started`` as an LLM request duration.
+        
+        Args:
+            started: ``time.perf_counter()`` value taken when the request began
+            
+        Returns:
+            Duration in milliseconds
+        """
+        duration_ms = (time.perf_counter() - started) * 1000
+        if self.performance_monitor:
+            self.performance_monitor.record_llm_duration(self.name, duration_ms)
+        return duration_ms
     
     @abstractmethod
     def generate(
@@ -61,6 +153,49 @@ class LLMProvider(ABC):
         """
         pass
     
+    def generate_stream(
+        self,
+        prompt: str,
+        context: Optional[List[str]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Iterator[StreamChunk]:
+        """Generate a response incrementally.
+        
+        Providers that can stream override this; the default yields the
+        complete response as a single chunk.
+        
+        Args:
+            prompt: User prompt
+            context: Optional context information
+            tools: Optional tool definitions
+            
+        Yields:
+            Text deltas and completed tool calls as they arrive, then a final
+            chunk carrying the complete response
+        """
+        response = self.generate(prompt, context, tools)
+        yield StreamChunk(delta=response.content, tool_calls=response.tool_calls)
+        yield StreamChunk(response=response)
+    
+    async def stream(
+        self,
+        prompt: str,
+        context: Optional[List[str]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Async iteration over ``generate_stream`` that keeps the event loop free.
+        
+        Args:
+            prompt: User prompt
+            context: Optional context information
+            tools: Optional tool definitions
+            
+        Yields:
+            Stream chunks, the last one carrying the complete response
+        """
+        async for chunk in iterate_in_thread(self.generate_stream(prompt, context, tools)):
+            yield chunk
+    
     @abstractmethod
     def is_available(self) -> bool:
         """Check if provider is available.
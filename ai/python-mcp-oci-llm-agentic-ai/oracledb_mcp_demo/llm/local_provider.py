@@ -9,6 +9,8 @@ from .base import LLMProvider, LLMResponse
 class LocalProvider(LLMProvider):
     """Local LLM provider implementation."""
     
+    name = "local"
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize local provider.
         
@@ -1,11 +1,11 @@
 """OCI LLM provider implementation with DBA assistant functionality using Generative AI Inference client."""
 
-import logging
 import re
 import json
 import os
 import importlib.metadata
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Iterator, List, Optional
 
 import oci
 from oci.auth.signers import SecurityTokenSigner
@@ -19,7 +19,8 @@ from oci.generative_ai_inference.models import (
     BaseChatRequest,
 )
 
-from .base import LLMProvider, LLMResponse
+from .base import LLMProvider, LLMResponse, StreamChunk
+from .tool_call_parser import ToolCallParser
 from core.logging_config import get_logger, ErrorMessages
 
 logger = get_logger(__name__)
@@ -115,6 +116,8 @@ def get_generative_ai_client(endpoint: str, profile: str, use_session_token: boo
 class OCIProvider(LLMProvider):
     """OCI LLM provider using Generative AI Inference Client with DBA assistant prompt."""
 
+    name = "oci"
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize OCI provider.
         
@@ -180,39 +183,8 @@ class OCIProvider(LLMProvider):
 
         logger.info(f"Generating response for prompt: {prompt[:100]}...")
 
-        # Build system message
-        system_prompt = self._build_system_message(context)
-        user_content = TextContent()
-        user_content.text = f"{system_prompt}\n\nUser: {prompt}"
-        user_message = Message(role="USER", content=[user_content])
-
-        messages = [user_message]
-
-        if tools:
-            logger.debug(f"Injecting {len(tools)} tool definitions into user message.")
-            tools_content = TextContent()
-            tools_text = "\n\nAvailable Tools:\n" + "\n".join(
-                [f"- {tool['function']['name']}: {tool['function'].get('description', '')}" for tool in tools]
-            )
-            tools_content.text = tools_text
-            messages.append(Message(role="USER", content=[tools_content]))
-
-        chat_request = GenericChatRequest(
-            api_format=BaseChatRequest.API_FORMAT_GENERIC,
-            messages=messages,
-            max_tokens=8000,  # Increased to 8000 for complex queries with long system prompts
-            temperature=0.1,
-            top_p=1,
-            top_k=0
-        )
-
-        chat_detail = ChatDetails(
-            serving_mode=OnDemandServingMode(
-                model_id="ocid1.generativeaimodel.oc1.us-chicago-1.amaaaaaask7dceya3bsfz4ogiuv3yc7gcnlry7gi3zzx6tnikg6jltqszm2q"  # Replace with actual Grok 3 OCID
-            ),
-            chat_request=chat_request,
-            compartment_id=self.compartment_id
-        )
+        chat_detail = self._build_chat_details(prompt, context, tools)
+        messages = chat_detail.chat_request.messages
 
         # Log API request details
         logger.debug("=== OCI API REQUEST ===")
@@ -223,7 +195,9 @@ class OCIProvider(LLMProvider):
 
         try:
             logger.info("Making API call to OCI Generative AI...")
+            started = time.perf_counter()
             response = self.client.chat(chat_detail)
+            self._record_duration(started)
             logger.info(f"OCI API response received with status: {response.status}")
             
             # Log API response if log_responses is enabled
@@ -292,15 +266,12 @@ class OCIProvider(LLMProvider):
 
             logger.info(f"Extracted content from OCI response: {len(content)} characters")
 
-            # Log response format variations
-            self._log_response_format_variation(content)
-
             # Extract tool calls from OCI-specific format
-            tool_calls = self.parse_oci_tool_calls(content)
+            tool_calls = self.parse_oci_tool_calls(content, tools)
             if tool_calls:
                 logger.info(f"Parsed {len(tool_calls)} tool calls from response")
             else:
-                logger.warning("No tool calls parsed from response")
+                logger.debug("No tool calls parsed from response")
 
             # Extract SQL and explanation
             sql = self.extract_sql(content)
@@ -323,327 +294,170 @@ class OCIProvider(LLMProvider):
             error_msg = ErrorMessages.format(ErrorMessages.LLM_API_ERROR, error=str(e))
             raise RuntimeError(error_msg)
 
-    def _repair_json(self, json_str: str) -> str:
-        """Repair common JSON issues in LLM responses.
+    def _build_chat_details(
+        self,
+        prompt: str,
+        context: Optional[List[str]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        stream: bool = False,
+    ) -> ChatDetails:
+        """Build the chat request for a prompt.
         
         Args:
-            json_str: Potentially malformed JSON string
+            prompt: User prompt
+            context: Optional context information
+            tools: Optional tool definitions
+            stream: Request server-sent events instead of a single response
             
         Returns:
-            Repaired JSON string
+            Chat details for ``GenerativeAiInferenceClient.chat``
         """
-        # Remove any leading/trailing whitespace
-        json_str = json_str.strip()
-        
-        # Count opening and closing braces/brackets
-        open_braces = json_str.count('{')
-        close_braces = json_str.count('}')
-        open_brackets = json_str.count('[')
-        close_brackets = json_str.count(']')
-        
-        # Add missing closing braces
-        while close_braces < open_braces:
-            json_str += '}'
-            close_braces += 1
-        
-        # Add missing closing brackets
-        while close_brackets < open_brackets:
-            json_str += ']'
-            close_brackets += 1
-        
-        # Handle common LLM JSON issues
-        # Fix missing quotes around property names
-        json_str = re.sub(r'(\w+):', r'"\1":', json_str)
-        
-        # Fix single quotes to double quotes
-        json_str = json_str.replace("'", '"')
-        
-        # Remove trailing commas
-        json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-        
-        return json_str
+        # Build system message
+        system_prompt = self._build_system_message(context)
+        user_content = TextContent()
+        user_content.text = f"{system_prompt}\n\nUser: {prompt}"
+        user_message = Message(role="USER", content=[user_content])
+
+        messages = [user_message]
+
+        if tools:
+            logger.debug(f"Injecting {len(tools)} tool definitions into user message.")
+            tools_content = TextContent()
+            tools_text = "\n\nAvailable Tools:\n" + "\n".join(
+                [f"- {tool['function']['name']}: {tool['function'].get('description', '')}" for tool in tools]
+            )
+            tools_content.text = tools_text
+            messages.append(Message(role="USER", content=[tools_content]))
 
-    def _safe_json_loads(self, json_str: str) -> Optional[Dict[str, Any]]:
-        """Safely parse JSON with repair attempts.
+        chat_request = GenericChatRequest(
+            api_format=BaseChatRequest.API_FORMAT_GENERIC,
+            messages=messages,
+            max_tokens=8000,  # Increased to 8000 for complex queries with long system prompts
+            temperature=0.1,
+            top_p=1,
+            top_k=0,
+            is_stream=stream
+        )
+
+        chat_detail = ChatDetails(
+            serving_mode=OnDemandServingMode(
+                model_id="ocid1.generativeaimodel.oc1.us-chicago-1.amaaaaaask7dceya3bsfz4ogiuv3yc7gcnlry7gi3zzx6tnikg6jltqszm2q"  # Replace with actual Grok 3 OCID
+            ),
+            chat_request=chat_request,
+            compartment_id=self.compartment_id
+        )
+
+        return chat_detail
+
+    def generate_stream(
+        self,
+        prompt: str,
+        context: Optional[List[str]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Iterator[StreamChunk]:
+        """Stream a response from OCI Generative AI.
         
         Args:
-            json_str: JSON string to parse
+            prompt: User prompt
+            context: Optional context information
+            tools: Optional tool definitions
             
-        Returns:
-            Parsed JSON dictionary or None if parsing fails
-        """
-        # First try direct parsing
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            logger.debug(f"Direct JSON parsing failed, attempting repair: {json_str}")
-        
-        # Try with repair
-        try:
-            repaired_json = self._repair_json(json_str)
-            result = json.loads(repaired_json)
-            logger.info(f"Successfully repaired and parsed JSON: {json_str[:100]}...")
-            return result
-        except json.JSONDecodeError as e:
-            logger.warning(f"JSON repair failed: {e}, original: {json_str}")
-            return None
-
-    def parse_oci_tool_calls(self, content: str) -> List[Dict[str, Any]]:
-        """Parse tool calls from OCI LLM response using multiple format patterns.
-        
-        Args:
-            content: Response content from OCI LLM
+        Yields:
+            Text deltas as server-sent events arrive with any tool calls they
+            complete, then the complete response
             
-        Returns:
-            List of parsed tool calls
+        Raises:
+            RuntimeError: If provider is not available or the API call fails
         """
-        tool_calls = []
-        logger.debug(f"Parsing tool calls from {len(content)} character response")
-
-        # Try -tool format: "-tool tool_name\n{arguments}"
-        tool_pattern = r"-tool\s+([^\n]+)\s*\n(\{.*?\})"
-        matches = re.findall(tool_pattern, content, re.DOTALL)
-        for tool_name, arguments_str in matches:
-            arguments = self._safe_json_loads(arguments_str)
-            if arguments is not None:
-                tool_calls.append({"function": {"name": tool_name, "description": f"Execute {tool_name} tool", "arguments": arguments}})
-            else:
-                logger.warning(f"Failed to parse JSON arguments for tool {tool_name}")
-
-        # Try -tool_call format: -tool_call{...} (handle newlines properly)
-        if not tool_calls:
-            tool_call_pattern = r"-tool_call\s*\n?\s*(\{.*?\})"
-            tool_call_matches = re.findall(tool_call_pattern, content, re.DOTALL)
-            for json_str in tool_call_matches:
-                json_data = self._safe_json_loads(json_str)
-                if json_data is not None:
-                    tool_name = json_data.get("tool_name")
-                    if tool_name:
-                        arguments = json_data.get("parameters", {})
-                        tool_calls.append({"function": {"name": tool_name, "description": f"Execute {tool_name} tool", "arguments": arguments}})
-                else:
-                    logger.warning(f"Failed to parse JSON in tool_call format")
-
-        # Try /tool format: /tool tool_name\n{arguments}
-        if not tool_calls:
-            slash_tool_pattern = r"/tool\s+([^\n]+)\s*\n(\{.*?\})"
-            slash_tool_matches = re.findall(slash_tool_pattern, content, re.DOTALL)
-            for tool_name, arguments_str in slash_tool_matches:
-                arguments = self._safe_json_loads(arguments_str)
-                if arguments is not None:
-                    tool_calls.append({"function": {"name": tool_name, "description": f"Execute {tool_name} tool", "arguments": arguments}})
-                else:
-                    logger.warning(f"Failed to parse JSON arguments for /tool {tool_name}")
-
-        # Try {"name": "tool", "args": {...}} format
-        if not tool_calls:
-            name_args_pattern = r'\{[^{}]*"name"[^{}]*"args"[^{}]*\}'
-            name_args_matches = re.findall(name_args_pattern, content, re.DOTALL)
-            for json_str in name_args_matches:
-                json_data = self._safe_json_loads(json_str)
-                if json_data is not None:
-                    tool_name = json_data.get("name")
-                    if tool_name:
-                        arguments = json_data.get("args", {})
-                        tool_calls.append({"function": {"name": tool_name, "description": f"Execute {tool_name} tool", "arguments": arguments}})
-                else:
-                    logger.warning(f"Failed to parse JSON in name/args format")
-
-        # Try JSON format: ```json\n{"tool": "tool_name", "parameters": {...}}\n```
-        if not tool_calls:
-            json_pattern = r"```json\s*\n(\{.*?\})\s*\n```"
-            json_matches = re.findall(json_pattern, content, re.DOTALL)
-            for json_str in json_matches:
-                json_data = self._safe_json_loads(json_str)
-                if json_data is not None:
-                    tool_name = json_data.get("tool") or json_data.get("toolName")
-                    if tool_name:
-                        arguments = json_data.get("parameters", {}) or json_data.get("args", {})
-                        tool_calls.append({"function": {"name": tool_name, "description": f"Execute {tool_name} tool", "arguments": arguments}})
-                else:
-                    logger.warning(f"Failed to parse JSON in code block format")
-
-        # Try Python code block format: ```python\ntool_call_id = tool_call(tool_name="...", tool_args={})\n```
-        if not tool_calls:
-            python_pattern = r"tool_call\(tool_name=[\"']([^\"']+)[\"'],\s*tool_args=(\{[^}]*\})\)"
-            python_matches = re.findall(python_pattern, content, re.DOTALL)
-            for tool_name, arguments_str in python_matches:
-                arguments = self._safe_json_loads(arguments_str)
-                if arguments is not None:
-                    tool_calls.append({"function": {"name": tool_name, "description": f"Execute {tool_name} tool", "arguments": arguments}})
-                else:
-                    logger.warning(f"Failed to parse JSON arguments for Python tool_call {tool_name}")
-
-        # Try Python tool_call format: tool_call("tool_name", {"param": "value"})
-        if not tool_calls:
-            python_tool_call_pattern = r'tool_call\(["\']([^"\']+)["\'],\s*(\{[^}]*\})\)'
-            python_tool_call_matches = re.findall(python_tool_call_pattern, content, re.DOTALL)
-            for tool_name, arguments_str in python_tool_call_matches:
-                arguments = self._safe_json_loads(arguments_str)
-                if arguments is not None:
-                    tool_calls.append({"function": {"name": tool_name, "description": f"Execute {tool_name} tool", "arguments": arguments}})
-                else:
-                    logger.warning(f"Failed to parse JSON arguments for Python tool_call {tool_name}")
-
-        # Try Python tool_call with parameters format: tool_call(tool_name="...", parameters={...})
-        if not tool_calls:
-            python_params_pattern = r'tool_call\(tool_name=["\']([^"\']+)["\'],\s*parameters=(\{[^}]*\})\)'
-            python_params_matches = re.findall(python_params_pattern, content, re.DOTALL)
-            for tool_name, arguments_str in python_params_matches:
-                arguments = self._safe_json_loads(arguments_str)
-                if arguments is not None:
-                    tool_calls.append({"function": {"name": tool_name, "description": f"Execute {tool_name} tool", "arguments": arguments}})
-                else:
-                    logger.warning(f"Failed to parse JSON arguments for Python tool_call {tool_name}")
-
-        # If no OCI format found, try the original parsing as fallback
-        if not tool_calls:
-            tool_calls = self.parse_tool_calls(content)
-        
-        # Validate and normalize tool calls
-        validated_tool_calls = []
-        for tool_call in tool_calls:
-            validated_call = self._validate_tool_call(tool_call)
-            if validated_call:
-                validated_tool_calls.append(validated_call)
-        
-        return validated_tool_calls
+        if not self.is_available():
+            raise RuntimeError(ErrorMessages.LLM_PROVIDER_NOT_AVAILABLE)
 
-    def _validate_tool_call(self, tool_call: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Validate and normalize a tool call.
-        
-        Args:
-            tool_call: Raw tool call dictionary
-            
-        Returns:
-            Validated and normalized tool call, or None if invalid
-        """
+        logger.info(f"Streaming response for prompt: {prompt[:100]}...")
+        chat_detail = self._build_chat_details(prompt, context, tools, stream=True)
+
+        started = time.perf_counter()
+        first_token_ms = None
+        content_parts: List[str] = []
+        parser = ToolCallParser(tools)
         try:
-            # Ensure required structure
-            if "function" not in tool_call:
-                logger.warning(f"Invalid tool call structure: {tool_call}")
-                return None
-            
-            function = tool_call["function"]
-            if "name" not in function:
-                logger.warning(f"Tool call missing function name: {tool_call}")
-                return None
-            
-            tool_name = function["name"]
-            # Arguments are now inside the function object
-            arguments = function.get("arguments", {})
-            
-            # Normalize parameter names for specific tools
-            if tool_name == "mcp_oracle-sqlcl-mcp_run-sql":
-                # Convert sql_query to sql if present
-                if "sql_query" in arguments and "sql" not in arguments:
-                    arguments["sql"] = arguments.pop("sql_query")
-                    logger.info(f"Normalized sql_query to sql for {tool_name}")
-            
-            # Validate required parameters
-            if tool_name == "mcp_oracle-sqlcl-mcp_run-sql" and "sql" not in arguments:
-                logger.warning(f"Tool {tool_name} missing required 'sql' parameter")
-                return None
-            
-            if tool_name == "mcp_oracle-sqlcl-mcp_connect" and "connection_name" not in arguments:
-                logger.warning(f"Tool {tool_name} missing required 'connection_name' parameter")
-                return None
-            
-            return tool_call
-            
+            response = self.client.chat(chat_detail)
+            if response.status // 100 != 2:
+                raise RuntimeError(f"HTTP {response.status}")
+            events = response.data.events()
         except Exception as e:
-            logger.error(f"Error validating tool call: {e}")
-            return None
-
-    def _log_response_format_variation(self, content: str) -> None:
-        """Log response format variations for monitoring and debugging.
+            logger.error(f"OCI stream failed: {e}", exc_info=True)
+            raise RuntimeError(ErrorMessages.format(ErrorMessages.LLM_API_ERROR, error=str(e)))
+
+        for event in events:
+            try:
+                data = json.loads(event.data)
+            except (TypeError, ValueError):
+                continue
+            message = data.get("message") or {}
+            text = "".join(item.get("text", "") for item in message.get("content") or [] if isinstance(item, dict))
+            if not text:
+                continue
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+                logger.info(f"OCI first token after {first_token_ms:.0f}ms")
+            content_parts.append(text)
+            # Tool calls are emitted as soon as their closing brace arrives
+            yield StreamChunk(delta=text, tool_calls=parser.feed(text))
+
+        content = "".join(content_parts)
+        logger.info(f"Streamed {len(content)} characters from OCI")
+
+        remaining = parser.finish()
+        if not parser.calls:
+            remaining = self._db_list_fallback(content)
+        if remaining:
+            yield StreamChunk(tool_calls=remaining)
+        tool_calls = parser.calls or remaining
+        total_ms = self._record_duration(started)
+
+        yield StreamChunk(response=LLMResponse(
+            content=content,
+            sql=self.extract_sql(content),
+            explanation=self.extract_explanation(content),
+            tool_calls=tool_calls,
+            metadata={
+                "model": chat_detail.serving_mode.model_id,
+                "provider": "oci",
+                "region": self.region,
+                "stage": self.stage,
+                "streamed": True,
+                "time_to_first_token_ms": first_token_ms,
+                "total_time_ms": total_ms,
+            }
+        ))
+
+    def parse_oci_tool_calls(self, content: str, tools: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Parse tool calls from a complete OCI LLM response.
         
         Args:
             content: Response content from OCI LLM
-        """
-        # Detect format variations
-        format_indicators = {
-            "-tool_call": "tool_call format",
-            "-tool": "tool format", 
-            "/tool": "slash tool format",
-            "```json": "JSON code block format",
-            "tool_call(": "Python function format",
-            '"tool"': "JSON tool field format",
-            '"name"': "JSON name field format"
-        }
-        
-        detected_formats = []
-        for indicator, format_name in format_indicators.items():
-            if indicator in content:
-                detected_formats.append(format_name)
-        
-        if detected_formats:
-            logger.info(f"Detected format(s): {', '.join(detected_formats)}")
-        else:
-            logger.warning("No recognized tool call format detected")
-        
-        # Log brief content preview for debugging
-        if logger.isEnabledFor(logging.DEBUG):
-            preview = content[:100].replace('\n', ' ').strip()
-            logger.debug(f"Content preview: {preview}...")
-
-    def parse_tool_calls(self, content: str) -> List[Dict[str, Any]]:
-        """Parse tool calls from OCI response content.
-        
-        Args:
-            content: Response content from OCI
+            tools: Tool definitions to validate calls against
             
         Returns:
-            List of tool call dictionaries
+            List of parsed tool calls
         """
-        tool_calls = []
-        try:
-            # Try parsing explicit tool call JSON
-            tool_call_json_match = re.search(r"<tool_call>(.*?)</tool_call>", content, re.DOTALL)
-            if tool_call_json_match:
-                tool_call_json = tool_call_json_match.group(1).strip()
-                tool_calls_data = json.loads(tool_call_json)
-                if isinstance(tool_calls_data, dict):
-                    tool_calls.append(tool_calls_data)
-                elif isinstance(tool_calls_data, list):
-                    tool_calls.extend(tool_calls_data)
-            else:
-                # Fallback: Check for JSON-like structures
-                json_match = re.search(r"(\{.*?\})", content, re.DOTALL)
-                if json_match:
-                    try:
-                        tool_calls_data = json.loads(json_match.group(1))
-                        if isinstance(tool_calls_data, dict) and "function" in tool_calls_data:
-                            tool_calls.append(tool_calls_data)
-                        elif isinstance(tool_calls_data, list):
-                            tool_calls.extend([tc for tc in tool_calls_data if "function" in tc])
-                    except json.JSONDecodeError:
-                        logger.debug("No valid JSON tool call found in fallback parsing")
-        except Exception as e:
-            logger.debug(f"Failed to parse tool_call: {e}")
-
-        # Fallback for DB list phrases
-        prompt_lower = content.lower()
-        if not tool_calls and any(phrase in prompt_lower for phrase in DB_LIST_PHRASES):
-            tool_calls.append({
+        parser = ToolCallParser(tools)
+        parser.feed(content)
+        parser.finish()
+        return parser.calls or self._db_list_fallback(content)
+
+    def _db_list_fallback(self, content: str) -> List[Dict[str, Any]]:
+        """Answer connection-listing requests the model described instead of calling a tool."""
+        content_lower = content.lower()
+        if any(phrase in content_lower for phrase in DB_LIST_PHRASES):
+            return [{
                 "function": {
                     "name": "list-connections",
                     "description": "List all database connections",
                     "arguments": {}
                 }
-            })
-
-        # Ensure tool calls have required fields and proper structure
-        for call in tool_calls:
-            if "function" not in call:
-                call["function"] = {"name": "unknown", "description": "", "arguments": {}}
-            elif "arguments" not in call["function"]:
-                # Move arguments from top level to function level if needed
-                if "arguments" in call:
-                    call["function"]["arguments"] = call.pop("arguments")
-                else:
-                    call["function"]["arguments"] = {}
-        return tool_calls
+            }]
+        return []
 
     def execute_mcp_tool(self, tool_call: Dict[str, Any]) -> Dict[str, Any]:
         function_name = tool_call["function"]["name"]
@@ -1,16 +1,23 @@
 """OpenAI LLM provider implementation."""
 
+import json
+import logging
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Iterator, List, Optional
 
 from openai import OpenAI
 
-from .base import LLMProvider, LLMResponse
+from .base import LLMProvider, LLMResponse, StreamChunk
+
+logger = logging.getLogger(__name__)
 
 
 class OpenAIProvider(LLMProvider):
     """OpenAI LLM provider."""
     
+    name = "openai"
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize OpenAI provider.
         
@@ -55,28 +62,11 @@ class OpenAIProvider(LLMProvider):
         if not self.is_available():
             raise RuntimeError("OpenAI provider not available - check API key")
         
-        # Build system message
-        system_message = self._build_system_message(context)
-        
-        # Build messages
-        messages = [
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": prompt}
-        ]
-        
         try:
-            # Only include tools and tool_choice if tools are provided
-            request_params = {
-                "model": self.model,
-                "messages": messages,
-                "max_completion_tokens": 8000
-            }
-            
-            if tools:
-                request_params["tools"] = tools
-                request_params["tool_choice"] = "auto"
-            
+            request_params = self._build_request_params(prompt, context, tools)
+            started = time.perf_counter()
             response = self.client.chat.completions.create(**request_params)
+            self._record_duration(started)
             
             # Only log detailed API response on failures or for debugging
             import logging
@@ -141,6 +131,155 @@ class OpenAIProvider(LLMProvider):
         except Exception as e:
             raise RuntimeError(f"OpenAI API error: {e}")
     
+    def _build_request_params(
+        self,
+        prompt: str,
+        context: Optional[List[str]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """Build chat completion request parameters.
+        
+        Args:
+            prompt: User prompt
+            context: Optional context information
+            tools: Optional tool definitions
+            
+        Returns:
+            Keyword arguments for ``chat.completions.create``
+        """
+        # Build system message
+        system_message = self._build_system_message(context)
+        
+        # Build messages
+        messages = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt}
+        ]
+        
+        # Only include tools and tool_choice if tools are provided
+        request_params = {
+            "model": self.model,
+            "messages": messages,
+            "max_completion_tokens": 8000
+        }
+        
+        if tools:
+            request_params["tools"] = tools
+            request_params["tool_choice"] = "auto"
+        
+        return request_params
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        context: Optional[List[str]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Iterator[StreamChunk]:
+        """Stream a response from OpenAI.
+        
+        Tool call arguments arrive as JSON fragments keyed by call index; a
+        call is complete once a later index starts or the stream finishes.
+        
+        Args:
+            prompt: User prompt
+            context: Optional context information
+            tools: Optional tool definitions
+            
+        Yields:
+            Text deltas and completed tool calls, then the complete response
+            
+        Raises:
+            RuntimeError: If provider is not available or the API call fails
+        """
+        if not self.is_available():
+            raise RuntimeError("OpenAI provider not available - check API key")
+        
+        request_params = self._build_request_params(prompt, context, tools)
+        request_params["stream"] = True
+        request_params["stream_options"] = {"include_usage": True}
+        
+        started = time.perf_counter()
+        first_token_ms = None
+        content_parts: List[str] = []
+        pending: Dict[int, Dict[str, Any]] = {}  # call index -> name and argument fragments
+        tool_calls: List[Dict[str, Any]] = []
+        usage = None
+        finish_reason = None
+        
+        def complete(indexes) -> List[Dict[str, Any]]:
+            completed = []
+            for index in sorted(indexes):
+                call = pending.pop(index)
+                try:
+                    arguments = json.loads("".join(call["arguments"]) or "{}")
+                except json.JSONDecodeError:
+                    arguments = {}
+                completed.append({"function": {"name": call["name"], "arguments": arguments}})
+            tool_calls.extend(completed)
+            return completed
+        
+        try:
+            stream = self.client.chat.completions.create(**request_params)
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {e}")
+        
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage.model_dump()
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+            completed = []
+            
+            if delta is not None and delta.tool_calls:
+                for call_delta in delta.tool_calls:
+                    completed.extend(complete([i for i in pending if i < call_delta.index]))
+                    call = pending.setdefault(call_delta.index, {"name": "", "arguments": []})
+                    if call_delta.function is not None:
+                        if call_delta.function.name:
+                            call["name"] += call_delta.function.name
+                        if call_delta.function.arguments:
+                            call["arguments"].append(call_delta.function.arguments)
+            
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+                completed.extend(complete(list(pending)))
+            
+            text = delta.content if delta is not None and delta.content else ""
+            if (text or completed) and first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+            if text:
+                content_parts.append(text)
+            if text or completed:
+                yield StreamChunk(delta=text, tool_calls=completed)
+        
+        # Calls still open if the stream ended without a finish reason
+        leftover = complete(list(pending))
+        if leftover:
+            yield StreamChunk(tool_calls=leftover)
+        
+        if finish_reason == "length":
+            logger.warning("OpenAI streamed response truncated due to length limit")
+        elif finish_reason == "content_filter":
+            logger.error("OpenAI streamed response blocked by content filter")
+        
+        content = "".join(content_parts)
+        total_ms = self._record_duration(started)
+        yield StreamChunk(response=LLMResponse(
+            content=content,
+            sql=self.extract_sql(content),
+            explanation=self.extract_explanation(content),
+            tool_calls=tool_calls,
+            metadata={
+                "model": self.model,
+                "usage": usage,
+                "streamed": True,
+                "time_to_first_token_ms": first_token_ms,
+                "total_time_ms": total_ms,
+            }
+        ))
+    
     def _build_system_message(self, context: Optional[List[str]] = None) -> str:
         """Build system message for OpenAI.
         
@@ -0,0 +1,384 @@
+"""Incremental tool-call extraction from free-form LLM output.
+
+Models without native tool calling (OCI generic chat) describe tool calls in
+text, in a handful of shapes::
+
+    -tool_call
+    {"tool_name": "mcp_oracle-sqlcl-mcp_run-sql", "parameters": {"sql": "..."}}
+
+    -tool mcp_oracle-sqlcl-mcp_connect          /tool name
+    {"connection_name": "prod"}                 {...}
+
+    ```json
+    {"tool": "name", "parameters": {...}}       ({"toolName": ..., "args": ...})
+    ```
+
+    {"name": "name", "args": {...}}
+    <tool_call>{"function": {"name": ..., "arguments": {...}}}</tool_call>
+    tool_call(tool_name="name", tool_args={...})  tool_call("name", {...})
+
+``ToolCallParser`` finds them in a single pass as text arrives: it jumps
+between structural characters, tracks string and bracket state across
+chunks, and decodes each top-level object once it closes. Objects are
+decoded leniently (single quotes, bare keys, trailing commas, Python
+literals, truncated output) and the resulting calls are checked against the
+tool schemas.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Characters that change scanner state outside strings / inside strings
+_STRUCTURE = re.compile(r"[{}\[\]\"']")
+_STRING_END = {'"': re.compile(r'["\\]'), "'": re.compile(r"['\\]")}
+_CLOSERS = {"{": "}", "[": "]"}
+
+# Markers that precede an object and say how to read it (matched against the
+# text between the previous object and this one)
+_MARKERS: List[Tuple[str, "re.Pattern"]] = [
+    ("tool_call", re.compile(r"-tool_call\s*$")),
+    ("named", re.compile(r"[-/]tool[ \t]+([^\s{]+)[ \t]*\n\s*$")),
+    ("python_kw", re.compile(r"tool_call\(\s*tool_name\s*=\s*[\"']([^\"']+)[\"']\s*,\s*(?:tool_args|parameters)\s*=\s*$")),
+    ("python_pos", re.compile(r"tool_call\(\s*[\"']([^\"']+)[\"']\s*,\s*$")),
+    ("tagged", re.compile(r"<tool_call>\s*$")),
+]
+_MAX_GAP = 256  # prose kept before an object; markers are short
+
+# Required arguments for known tools when no schemas are supplied
+DEFAULT_REQUIRED = {
+    "mcp_oracle-sqlcl-mcp_run-sql": ["sql"],
+    "mcp_oracle-sqlcl-mcp_connect": ["connection_name"],
+}
+# Argument names models use instead of the schema's
+ARGUMENT_ALIASES = {
+    "mcp_oracle-sqlcl-mcp_run-sql": {"sql_query": "sql", "query": "sql"},
+}
+
+_JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "object": dict,
+    "array": list,
+}
+
+
+def loads_lenient(text: str) -> Any:
+    """Decode JSON as written by LLMs.
+
+    Tries strict JSON first, then a string-aware rewrite that fixes single
+    quoted strings, bare keys, trailing commas and Python ``True``/``False``/
+    ``None``. Unlike blanket regex repairs it never touches string contents,
+    so SQL such as ``'HH24:MI'`` survives.
+
+    Raises:
+        ValueError: If the text cannot be decoded
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    return json.loads(_normalize(text))
+
+
+def _normalize(text: str) -> str:
+    """Rewrite JSON-like text into strict JSON in one pass."""
+    out: List[str] = []
+    i, n = 0, len(text)
+    literals = {"True": "true", "False": "false", "None": "null"}
+    while i < n:
+        ch = text[i]
+        if ch in "\"'":
+            # Copy a string, re-quoting single-quoted ones
+            j = i + 1
+            chars = []
+            while j < n and text[j] != ch:
+                if text[j] == "\\" and j + 1 < n:
+                    chars.append(text[j:j + 2])
+                    j += 2
+                    continue
+                chars.append('\\"' if text[j] == '"' and ch == "'" else text[j])
+                j += 1
+            body = "".join(chars)
+            if ch == "'":
+                body = body.replace("\\'", "'")
+            out.append('"' + body + '"')
+            i = j + 1
+        elif ch == ",":
+            # Drop trailing commas
+            j = i + 1
+            while j < n and text[j].isspace():
+                j += 1
+            if j < n and text[j] in "}]":
+                i += 1
+                continue
+            out.append(ch)
+            i += 1
+        elif ch.isalpha() or ch == "_":
+            j = i
+            while j < n and (text[j].isalnum() or text[j] in "_-$"):
+                j += 1
+            word = text[i:j]
+            k = j
+            while k < n and text[k].isspace():
+                k += 1
+            if k < n and text[k] == ":":
+                out.append(f'"{word}"')  # bare key
+            else:
+                out.append(literals.get(word, word))
+            i = j
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def build_schemas(tools: Optional[List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Map tool name to JSON schema from OpenAI-style tool definitions."""
+    schemas = {}
+    for tool in tools or []:
+        function = tool.get("function", tool)
+        name = function.get("name")
+        if name:
+            schemas[name] = function.get("parameters") or function.get("inputSchema") or {}
+    return schemas
+
+
+class ToolCallParser:
+    """Single-pass, incremental extractor of tool calls from LLM text.
+
+    Feed text with :meth:`feed` as it streams in and call :meth:`finish` at
+    the end; each returns the tool calls completed by that input, already
+    validated, as ``{"function": {"name", "description", "arguments"}}``.
+    """
+
+    def __init__(self, tools: Optional[List[Dict[str, Any]]] = None):
+        """Initialize parser.
+
+        Args:
+            tools: Tool definitions to validate calls against; without them
+                only the built-in checks for the SQLcl tools apply
+        """
+        self.schemas = build_schemas(tools)
+        self.calls: List[Dict[str, Any]] = []
+        self.rejected = 0
+        self._buffer = ""
+        self._pos = 0          # next unscanned index in _buffer
+        self._start = None     # index where the current object starts
+        self._stack: List[str] = []
+        self._quote = None     # quote char while inside a string
+
+    @classmethod
+    def parse(cls, text: str, tools: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Parse a complete response."""
+        parser = cls(tools)
+        parser.feed(text)
+        parser.finish()
+        return parser.calls
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Consume more text and return tool calls completed by it."""
+        self._buffer += text
+        return self._scan()
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """End of input: close a truncated object and return remaining calls."""
+        completed = []
+        while self._start is not None:
+            start = self._start
+            tail = ('"' if self._quote == '"' else "'" if self._quote else "")
+            tail += "".join(_CLOSERS[opener] for opener in reversed(self._stack))
+            call = self._interpret(self._buffer[:start], self._buffer[start:] + tail)
+            if call is not None:
+                logger.debug("Recovered tool call from truncated output")
+                completed.extend(self._accept(call))
+                break
+            # Not an object after all (e.g. a stray brace in prose): rescan after it
+            self._reset_object()
+            self._pos = start + 1
+            completed.extend(self._scan())
+        return completed
+
+    def _reset_object(self) -> None:
+        self._start = None
+        self._stack = []
+        self._quote = None
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        buffer = self._buffer
+        n = len(buffer)
+        pos = self._pos
+        completed = []
+        while pos < n:
+            if self._start is None:
+                # Prose: jump straight to the next possible object
+                brace = buffer.find("{", pos)
+                bracket = buffer.find("[", pos)
+                if (bracket != -1 and (brace == -1 or bracket < brace)
+                        and _MARKERS[-1][1].search(buffer, max(0, bracket - _MAX_GAP), bracket)):
+                    start = bracket
+                else:
+                    start = brace
+                if start == -1:
+                    # Keep only a short tail of prose for marker detection
+                    self._buffer = buffer[-_MAX_GAP:]
+                    pos = len(self._buffer)
+                    break
+                self._start = start
+                self._stack = [buffer[start]]
+                pos = start + 1
+                continue
+
+            if self._quote is not None:
+                match = _STRING_END[self._quote].search(buffer, pos)
+                if match is None:
+                    pos = n
+                    break
+                if match.group() == "\\":
+                    if match.end() >= n:
+                        pos = match.start()  # wait for the escaped char
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._quote = None
+                pos = match.end()
+                continue
+
+            match = _STRUCTURE.search(buffer, pos)
+            if match is None:
+                pos = n
+                break
+            ch = match.group()
+            pos = match.end()
+            if ch in "\"'":
+                self._quote = ch
+            elif ch in "{[":
+                self._stack.append(ch)
+            else:
+                if self._stack:
+                    self._stack.pop()
+                if not self._stack:
+                    start = self._start
+                    call = self._interpret(buffer[:start], buffer[start:pos])
+                    self._reset_object()
+                    if call is not None:
+                        completed.extend(self._accept(call))
+                    # Keep only a short tail of prose for marker detection
+                    if pos > _MAX_GAP:
+                        buffer = buffer[pos - _MAX_GAP:]
+                        self._buffer = buffer
+                        n = len(buffer)
+                        pos = _MAX_GAP
+        self._pos = pos
+        return completed
+
+    def _interpret(self, prefix: str, text: str) -> Optional[List[Dict[str, Any]]]:
+        """Turn an object and the prose before it into raw tool calls (None if neither)."""
+        gap = prefix[-_MAX_GAP:]
+        try:
+            data = loads_lenient(text)
+        except ValueError:
+            return None
+
+        kind, name = None, None
+        for marker_kind, pattern in _MARKERS:
+            match = pattern.search(gap)
+            if match:
+                kind = marker_kind
+                name = match.group(1).strip() if match.groups() else None
+                break
+
+        if kind in ("named", "python_kw", "python_pos"):
+            return [(name, data if isinstance(data, dict) else {})]
+        items = data if isinstance(data, list) else [data]
+        calls = []
+        for item in items:
+            call = self._from_shape(item)
+            if call is not None:
+                calls.append(call)
+        if not calls and kind is None:
+            return [] if isinstance(data, (dict, list)) else None
+        return calls
+
+    @staticmethod
+    def _from_shape(data: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Recognize a tool call by the keys of an object."""
+        if not isinstance(data, dict):
+            return None
+        function = data.get("function")
+        if isinstance(function, dict) and function.get("name"):
+            arguments = function.get("arguments", data.get("arguments", {}))
+            if isinstance(arguments, str):
+                try:
+                    arguments = loads_lenient(arguments)
+                except ValueError:
+                    arguments = {}
+            return function["name"], arguments
+        for name_key, argument_keys in (("tool_name", ("parameters", "args", "arguments")),
+                                        ("tool", ("parameters", "args", "arguments")),
+                                        ("toolName", ("parameters", "args", "arguments")),
+                                        ("name", ("args", "arguments", "parameters"))):
+            name = data.get(name_key)
+            if isinstance(name, str) and name:
+                present = [key for key in argument_keys if key in data]
+                if name_key == "name" and not present:
+                    continue  # a plain object with a name field
+                arguments = next((data[key] for key in present if data[key]), {})
+                return name, arguments
+        return None
+
+    def _accept(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        accepted = []
+        for name, arguments in calls:
+            call = self._validate(name, arguments)
+            if call is None:
+                self.rejected += 1
+            else:
+                accepted.append(call)
+        self.calls.extend(accepted)
+        return accepted
+
+    def _validate(self, name: str, arguments: Any) -> Optional[Dict[str, Any]]:
+        """Check a call against the tool schemas and normalize its arguments."""
+        if not isinstance(arguments, dict):
+            logger.warning(f"Tool call {name} has non-object arguments: {arguments!r}")
+            return None
+
+        schema = None
+        if self.schemas:
+            schema = self.schemas.get(name)
+            if schema is None:
+                # Models often drop the server prefix, e.g. "run-sql"
+                matches = [known for known in self.schemas if known.endswith(f"_{name}") or known.endswith(f"-{name}")]
+                if len(matches) != 1:
+                    logger.warning(f"Tool call to unknown tool {name}")
+                    return None
+                name = matches[0]
+                schema = self.schemas[name]
+
+        arguments = dict(arguments)
+        for alias, target in ARGUMENT_ALIASES.get(name, {}).items():
+            if alias in arguments and target not in arguments:
+                arguments[target] = arguments.pop(alias)
+
+        properties = (schema or {}).get("properties", {})
+        required = (schema or {}).get("required") if schema else DEFAULT_REQUIRED.get(name, [])
+        for key in required or []:
+            if key not in arguments:
+                logger.warning(f"Tool {name} missing required '{key}' parameter")
+                return None
+        for key, spec in properties.items():
+            expected = _JSON_TYPES.get(spec.get("type")) if isinstance(spec, dict) else None
+            if key in arguments and expected and not isinstance(arguments[key], expected):
+                if spec.get("type") == "string" and isinstance(arguments[key], (int, float)):
+                    arguments[key] = str(arguments[key])
+                else:
+                    logger.warning(f"Tool {name} parameter '{key}' should be {spec.get('type')}")
+                    return None
+
+        return {"function": {"name": name, "description": f"Execute {name} tool", "arguments": arguments}}
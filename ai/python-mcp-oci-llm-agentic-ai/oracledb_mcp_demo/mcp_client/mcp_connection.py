@@ -3,37 +3,88 @@ MCP (Model Context Protocol) connection handling.
 """
 
 import logging
-import asyncio
+import shlex
 from typing import Dict, Any, Optional
 
+from .session_pool import MCPSessionPool, tool_result_text
+
 logger = logging.getLogger(__name__)
 
 
 class MCPConnection:
-    """MCP connection handler."""
-    
+    """MCP connection handler.
+
+    With a ``command`` in the config (e.g. ``["sql", "-mcp"]``) tool calls go
+    through a pool of persistent stdio sessions; optional keys ``env``,
+    ``pool_min_size``, ``pool_max_size``, ``max_in_flight``,
+    ``max_requests_per_session``, ``health_check_interval`` and
+    ``request_timeout`` tune the pool. Without one the connection stays a
+    no-op placeholder.
+    """
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize MCP connection."""
         self.config = config
-        self.client = None
+        self.client: Optional[MCPSessionPool] = None
         logger.info("MCP connection initialized")
-    
+
     async def connect(self) -> bool:
         """Connect to MCP server."""
         logger.info("Connecting to MCP server")
-        # Placeholder implementation
-        return True
-    
+        command = self.config.get("command")
+        if not command:
+            # Placeholder implementation
+            return True
+        if isinstance(command, str):
+            command = shlex.split(command)
+
+        self.client = MCPSessionPool(
+            command,
+            env=self.config.get("env"),
+            min_size=self.config.get("pool_min_size", 1),
+            max_size=self.config.get("pool_max_size", 4),
+            max_in_flight=self.config.get("max_in_flight", 4),
+            max_requests_per_session=self.config.get("max_requests_per_session", 1000),
+            health_check_interval=self.config.get("health_check_interval", 30.0),
+            request_timeout=self.config.get("request_timeout", 60.0),
+            client_name="oracledb-mcp-demo",
+        )
+        try:
+            await self.client.start()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to start MCP server: {e}")
+            await self.client.close()
+            self.client = None
+            return False
+
     async def disconnect(self) -> None:
         """Disconnect from MCP server."""
         logger.info("Disconnecting from MCP server")
-    
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
     async def list_tools(self) -> list:
         """List available tools."""
         logger.info("Listing MCP tools")
-        return []
-    
+        if self.client is None:
+            return []
+        return await self.client.list_tools()
+
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """Call a tool."""
+        """Call a tool; independent calls run concurrently on pooled sessions."""
         logger.info(f"Calling tool: {tool_name}")
-        return None 
\ No newline at end of file
+        if self.client is None:
+            return None
+        result = await self.client.call_tool(tool_name, arguments)
+        return tool_result_text(result)
+
+    async def call_tools(self, calls: list) -> list:
+        """Run several (tool_name, arguments) calls, results in order.
+
+        Calls run concurrently unless the batch connects or disconnects.
+        """
+        if self.client is None:
+            return [None for _ in calls]
+        return [tool_result_text(result) for result in await self.client.call_tools(calls)]
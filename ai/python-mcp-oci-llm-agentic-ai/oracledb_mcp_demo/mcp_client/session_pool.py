@@ -0,0 +1,474 @@
+"""
+Pool of persistent MCP stdio sessions (e.g. SQLcl ``sql -mcp``).
+
+Each session is one long-lived server process speaking JSON-RPC over
+stdin/stdout. Requests are written as soon as they are issued and a
+background reader matches responses to callers by id, so several requests
+can be in flight on one session. The pool keeps sessions initialized ahead
+of time, spreads calls over them, health-checks idle sessions and recycles
+sessions that died or served their request quota.
+
+SQLcl sessions are stateful: ``connect`` selects the database for later
+``run-sql`` calls. Each session tracks the connection it is on. A call is
+pinned to the pool's current connection when it is issued and is routed to a
+session already on that connection; when none is free, an idle session is
+reconnected first. Calls issued before a ``connect`` therefore keep running
+against the previous database, and ``call_tools`` runs a batch in order when
+it contains a ``connect`` or ``disconnect``.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = "2024-11-05"
+
+
+class MCPSessionError(RuntimeError):
+    """Raised when an MCP session fails or a request returns an error."""
+
+
+class MCPStdioSession:
+    """One MCP server process with pipelined JSON-RPC requests."""
+
+    def __init__(self, command: Sequence[str], env: Optional[Dict[str, str]] = None,
+                 client_name: str = "mcp-session-pool", request_timeout: float = 60.0):
+        self.command = list(command)
+        self.env = env
+        self.client_name = client_name
+        self.request_timeout = request_timeout
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.server_info: Dict[str, Any] = {}
+        self.connection_key: Optional[str] = None  # connect arguments this session is on
+        self.in_flight = 0
+        self.leases = 0  # pool callers currently using this session
+        self.request_count = 0
+        self.last_used = time.monotonic()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._reader: Optional[asyncio.Task] = None
+        self._stderr_reader: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def healthy(self) -> bool:
+        return (not self._closed and self.process is not None
+                and self.process.returncode is None)
+
+    async def start(self) -> None:
+        """Spawn the server process and run the MCP initialize handshake."""
+        env = os.environ.copy()
+        if self.env:
+            env.update(self.env)
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            # Default 64KB line limit is too small for large result sets
+            limit=16 * 1024 * 1024,
+        )
+        self._reader = asyncio.create_task(self._read_responses())
+        self._stderr_reader = asyncio.create_task(self._drain_stderr())
+
+        try:
+            result = await self.request("initialize", {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": self.client_name, "version": "1.0.0"},
+            })
+            self.server_info = result.get("serverInfo", {})
+            await self.notify("notifications/initialized")
+        except Exception:
+            await self.close()
+            raise
+
+    async def _read_responses(self) -> None:
+        """Resolve pending requests as their responses arrive, in any order."""
+        error: Exception = MCPSessionError("MCP server closed connection")
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    # Servers may print banners or log lines on stdout
+                    logger.debug(f"Ignoring non JSON-RPC output: {line[:200]!r}")
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                future = self._pending.pop(message.get("id"), None) if "id" in message else None
+                if future is None:
+                    continue  # notification or a response nobody waits for anymore
+                if future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(MCPSessionError(str(message["error"])))
+                else:
+                    future.set_result(message.get("result", {}))
+        except Exception as e:
+            error = MCPSessionError(f"MCP session reader failed: {e}")
+        finally:
+            self._closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def _drain_stderr(self) -> None:
+        """Keep stderr flowing so a chatty server never blocks on a full pipe."""
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                return
+            logger.debug(f"[mcp stderr] {line.decode(errors='replace').rstrip()}")
+
+    async def _write(self, message: Dict[str, Any]) -> None:
+        if not self.healthy:
+            raise MCPSessionError("MCP session is not running")
+        data = (json.dumps(message) + "\n").encode()
+        async with self._write_lock:
+            self.process.stdin.write(data)
+            await self.process.stdin.drain()
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None,
+                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a request and wait for its result without blocking other requests."""
+        request_id = next(self._ids)
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.in_flight += 1
+        self.request_count += 1
+        try:
+            await self._write(message)
+            timeout = timeout or self.request_timeout
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                raise MCPSessionError(f"MCP request '{method}' timed out after {timeout}s")
+        finally:
+            self._pending.pop(request_id, None)
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Send a notification (no response expected)."""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._write(message)
+
+    async def ping(self, timeout: float = 10.0) -> bool:
+        try:
+            await self.request("ping", timeout=timeout)
+            return True
+        except MCPSessionError:
+            return False
+
+    async def close(self) -> None:
+        """Stop the server process."""
+        self._closed = True
+        process, self.process = self.process, None
+        if process is not None and process.returncode is None:
+            try:
+                process.stdin.close()
+                process.terminate()
+                await asyncio.wait_for(process.wait(), timeout=5.0)
+            except (asyncio.TimeoutError, ProcessLookupError):
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+        for task in (self._reader, self._stderr_reader):
+            if task is not None:
+                task.cancel()
+
+
+class MCPSessionPool:
+    """Pre-initialized MCP stdio sessions shared by concurrent callers.
+
+    ``call_tool`` picks the least busy healthy session with fewer than
+    ``max_in_flight`` outstanding requests, starting a new session (up to
+    ``max_size``) when all are busy and waiting otherwise. ``min_size``
+    sessions are started up front and kept alive; a background task pings
+    idle sessions every ``health_check_interval`` seconds and replaces dead
+    ones. Sessions are retired after ``max_requests_per_session`` requests.
+    """
+
+    def __init__(self, command: Sequence[str], env: Optional[Dict[str, str]] = None,
+                 min_size: int = 1, max_size: int = 4, max_in_flight: int = 4,
+                 max_requests_per_session: int = 1000, health_check_interval: float = 30.0,
+                 request_timeout: float = 60.0, client_name: str = "mcp-session-pool",
+                 connect_tool: str = "connect", disconnect_tool: str = "disconnect"):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.command = list(command)
+        self.env = env
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_in_flight = max_in_flight
+        self.max_requests_per_session = max_requests_per_session
+        self.health_check_interval = health_check_interval
+        self.request_timeout = request_timeout
+        self.client_name = client_name
+        self.connect_tool = connect_tool
+        self.disconnect_tool = disconnect_tool
+
+        self._sessions: List[MCPStdioSession] = []
+        self._starting = 0
+        self._available = asyncio.Condition()
+        self._connect_args: Optional[Dict[str, Any]] = None
+        self._tools: Optional[list] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def __aenter__(self) -> "MCPSessionPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Start ``min_size`` sessions concurrently and the health checker."""
+        self._closed = False
+        missing = self.min_size - len(self._sessions)
+        if missing > 0:
+            await asyncio.gather(*(self._add_session() for _ in range(missing)))
+        if self.health_check_interval and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+        logger.info(f"MCP session pool started with {len(self._sessions)} session(s)")
+
+    async def close(self) -> None:
+        """Stop the health checker and all sessions."""
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        sessions, self._sessions = self._sessions, []
+        await asyncio.gather(*(session.close() for session in sessions), return_exceptions=True)
+        async with self._available:
+            self._available.notify_all()
+
+    async def _add_session(self) -> MCPStdioSession:
+        self._starting += 1
+        try:
+            session = MCPStdioSession(self.command, self.env, self.client_name, self.request_timeout)
+            await session.start()
+        finally:
+            self._starting -= 1
+        self._sessions.append(session)
+        logger.debug(f"Started MCP session (pid {session.process.pid}), pool size {len(self._sessions)}")
+        return session
+
+    async def _retire(self, session: MCPStdioSession) -> None:
+        if session in self._sessions:
+            self._sessions.remove(session)
+        await session.close()
+
+    async def _acquire(self, key: Optional[str] = None, switch: bool = False) -> MCPStdioSession:
+        """Reserve a request slot on the least busy session on connection ``key``.
+
+        ``key`` None accepts any session. A session on another connection is
+        only taken while idle, and is marked as switching (matching no key)
+        so nothing else is pipelined onto it until it has reconnected.
+        ``switch`` always takes an idle session, for ``connect`` itself.
+        """
+        async with self._available:
+            while True:
+                if self._closed:
+                    raise MCPSessionError("MCP session pool is closed")
+                for session in [s for s in self._sessions if not s.healthy]:
+                    self._sessions.remove(session)
+                    asyncio.create_task(session.close())
+
+                usable = [s for s in self._sessions if s.request_count < self.max_requests_per_session]
+                candidates = [] if switch else [
+                    s for s in usable
+                    if s.leases < self.max_in_flight and (key is None or s.connection_key == key)]
+                if candidates:
+                    session = min(candidates, key=lambda s: s.leases)
+                    session.leases += 1
+                    return session
+                idle = [s for s in usable if s.leases == 0 and s.connection_key is not _SWITCHING]
+                if idle:
+                    session = idle[0]
+                    session.connection_key = _SWITCHING
+                    session.leases += 1
+                    return session
+                if len(self._sessions) + self._starting < self.max_size:
+                    break
+                await self._available.wait()
+
+        session = await self._add_session()
+        if key is not None or switch:
+            session.connection_key = _SWITCHING
+        session.leases += 1
+        return session
+
+    async def _release(self, session: MCPStdioSession) -> None:
+        session.leases -= 1
+        if (session.request_count >= self.max_requests_per_session
+                and session.leases == 0 and session in self._sessions):
+            logger.debug(f"Recycling MCP session after {session.request_count} requests")
+            await self._retire(session)
+            if not self._closed and len(self._sessions) < self.min_size:
+                await self._add_session()
+        async with self._available:
+            self._available.notify_all()
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None,
+                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a raw JSON-RPC request on a pooled session.
+
+        The request runs against the connection that is current when it is
+        issued, even if another ``connect`` completes while it waits.
+        """
+        connect_args = self._connect_args
+        key = _connection_key(connect_args)
+        session = await self._acquire(key)
+        try:
+            if key is not None and session.connection_key != key:
+                await self._switch(session, connect_args, timeout)
+            return await session.request(method, params, timeout)
+        finally:
+            await self._release(session)
+
+    async def _switch(self, session: MCPStdioSession, arguments: Dict[str, Any],
+                      timeout: Optional[float]) -> Dict[str, Any]:
+        """Run ``connect`` on a session reserved by ``_acquire`` and record where it is."""
+        try:
+            result = await session.request("tools/call", {"name": self.connect_tool, "arguments": arguments},
+                                           timeout)
+        except Exception:
+            session.connection_key = None
+            raise
+        finally:
+            async with self._available:
+                self._available.notify_all()
+        if result.get("isError"):
+            session.connection_key = None
+        else:
+            session.connection_key = _connection_key(arguments)
+        return result
+
+    async def list_tools(self, refresh: bool = False) -> list:
+        """List the server's tools (cached, all sessions run the same server)."""
+        if self._tools is None or refresh:
+            result = await self.request("tools/list")
+            self._tools = result.get("tools", [])
+        return self._tools
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None,
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Call a tool and return the raw MCP result (``content`` etc.)."""
+        arguments = arguments or {}
+        if tool_name == self.connect_tool:
+            return await self._connect(arguments, timeout)
+        if tool_name == self.disconnect_tool:
+            return await self._disconnect(arguments, timeout)
+        return await self.request("tools/call", {"name": tool_name, "arguments": arguments}, timeout)
+
+    async def call_tools(self, calls: Sequence[tuple], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Run ``(tool_name, arguments)`` calls, results in order.
+
+        Calls run concurrently unless the batch connects or disconnects, in
+        which case they run one after another so each call sees the
+        connection the calls before it selected.
+        """
+        if any(name in (self.connect_tool, self.disconnect_tool) for name, _ in calls):
+            return [await self.call_tool(name, arguments, timeout) for name, arguments in calls]
+        return list(await asyncio.gather(*(self.call_tool(name, arguments, timeout) for name, arguments in calls)))
+
+    async def _connect(self, arguments: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        """Connect an idle session and make its connection the current one."""
+        session = await self._acquire(switch=True)
+        try:
+            result = await self._switch(session, dict(arguments), timeout)
+            if not result.get("isError"):
+                self._connect_args = dict(arguments)
+            return result
+        finally:
+            await self._release(session)
+
+    async def _disconnect(self, arguments: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        """Disconnect every connected session and forget the connection."""
+        self._connect_args = None
+        connected = [s for s in self._sessions
+                     if s.connection_key not in (None, _SWITCHING) and s.healthy]
+        if not connected:
+            return await self.request("tools/call", {"name": self.disconnect_tool, "arguments": arguments}, timeout)
+        # Forget the connections first so no new call is routed to a session being disconnected
+        for session in connected:
+            session.connection_key = None
+        params = {"name": self.disconnect_tool, "arguments": arguments}
+        results = await asyncio.gather(*(s.request("tools/call", params, timeout) for s in connected),
+                                       return_exceptions=True)
+        for result in results:
+            if not isinstance(result, Exception):
+                return result
+        raise results[0]
+
+    async def _health_loop(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.warning(f"MCP session health check failed: {e}")
+
+    async def check_health(self) -> None:
+        """Ping idle sessions, drop dead ones and top the pool back up to ``min_size``."""
+        idle = [s for s in self._sessions if s.leases == 0]
+        alive = await asyncio.gather(*(s.ping() if s.healthy else _false() for s in idle))
+        for session, ok in zip(idle, alive):
+            if not ok:
+                logger.warning("Replacing unresponsive MCP session")
+                await self._retire(session)
+        missing = self.min_size - len(self._sessions) - self._starting
+        if missing > 0 and not self._closed:
+            await asyncio.gather(*(self._add_session() for _ in range(missing)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "in_flight": sum(s.in_flight for s in self._sessions),
+            "requests": sum(s.request_count for s in self._sessions),
+            "connected": self._connect_args is not None,
+        }
+
+
+async def _false() -> bool:
+    return False
+
+
+# Marks a session that is reconnecting, so no connection key matches it
+_SWITCHING = object()
+
+
+def _connection_key(arguments: Optional[Dict[str, Any]]) -> Optional[str]:
+    return None if arguments is None else json.dumps(arguments, sort_keys=True)
+
+
+def tool_result_text(result: Dict[str, Any]) -> str:
+    """Text of the first content item of an MCP tool result."""
+    content = result.get("content") if isinstance(result, dict) else None
+    if isinstance(content, list) and content:
+        return content[0].get("text", "")
+    return str(result)
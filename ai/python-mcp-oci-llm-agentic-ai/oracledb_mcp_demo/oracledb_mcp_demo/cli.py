@@ -162,9 +162,7 @@ class OracleMcpCLI:
             prompt: Natural language prompt
         """
         try:
-            # Show processing indicator
-            with self.console.status("[bold green]Processing..."):
-                response = asyncio.run(self.orchestrator.process_prompt(prompt))
+            response = asyncio.run(self._stream_prompt(prompt))
             
             # Display results
             self._display_response(response)
@@ -172,6 +170,35 @@ class OracleMcpCLI:
         except Exception as e:
             self.console.print(f"[red]Error processing prompt: {e}[/red]")
     
+    async def _stream_prompt(self, prompt: str) -> dict:
+        """Print the LLM's text as it streams and return the final response.
+        
+        Args:
+            prompt: Natural language prompt
+            
+        Returns:
+            Response dictionary, as from ``process_prompt``
+        """
+        # Show processing indicator until the first token arrives
+        status = self.console.status("[bold green]Processing...")
+        status.start()
+        streamed = False
+        response: dict = {}
+        try:
+            async for event in self.orchestrator.stream_prompt(prompt):
+                if "delta" in event:
+                    if not streamed:
+                        status.stop()
+                        streamed = True
+                    self.console.print(event["delta"], end="", markup=False, highlight=False)
+                else:
+                    response = event["result"]
+        finally:
+            status.stop()
+        if streamed:
+            self.console.print()
+        return response
+    
     def _display_response(self, response: dict) -> None:
         """Display LLM response.
         
@@ -0,0 +1,47 @@
+"""Tests for the RAG cache's shared L2 tier."""
+
+import asyncio
+
+from core.rag_cache import CacheConfig, RAGCacheManager, RAGResult
+
+
+def _manager(db_path) -> RAGCacheManager:
+    return RAGCacheManager(CacheConfig(l2_connection_string=f"sqlite:///{db_path}"))
+
+
+def test_l2_round_trip_with_dict_result(tmp_path):
+    """A dict cached by one worker is served from L2 to another."""
+    db_path = tmp_path / "rag_cache.db"
+    response = {"sql": "SELECT 1 FROM dual", "results": [{"1": 1}], "explanation": "constant"}
+
+    async def scenario():
+        writer, reader = _manager(db_path), _manager(db_path)
+        try:
+            assert await writer.set_cached_result("count rows", {}, response, ttl_seconds=60)
+            cached = await reader.get_cached_result("count rows", {})
+            stats = await reader.get_cache_statistics()
+        finally:
+            await writer.close()
+            await reader.close()
+        return cached, stats
+
+    cached, stats = asyncio.run(scenario())
+    assert cached == response
+    assert stats["total_hits"] == 1
+    assert stats["l2_enabled"]
+
+
+def test_l2_round_trip_with_rag_result(tmp_path):
+    db_path = tmp_path / "rag_cache.db"
+    result = RAGResult(query="q", results=[{"relevance_score": 0.9}], total_found=1)
+
+    async def scenario():
+        writer, reader = _manager(db_path), _manager(db_path)
+        try:
+            await writer.set_cached_result("q", {}, result)
+            return await reader.get_cached_result("q", {})
+        finally:
+            await writer.close()
+            await reader.close()
+
+    assert asyncio.run(scenario()) == result
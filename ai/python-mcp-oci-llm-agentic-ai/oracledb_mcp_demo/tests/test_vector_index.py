@@ -0,0 +1,120 @@
+"""Tests for the semantic cache's in-memory vector indexes."""
+
+import numpy as np
+
+from core.vector_index import FlatVectorIndex, IVFVectorIndex
+
+
+def _vectors(count, dimension=16, seed=0):
+    return np.random.default_rng(seed).standard_normal((count, dimension)).astype(np.float32)
+
+
+def test_flat_search_returns_best_matches_first():
+    index = FlatVectorIndex(initial_capacity=2)
+    for i, row in enumerate(_vectors(10)):
+        index.add(str(i), row)
+
+    assert len(index) == 10
+    assert index.dimension == 16
+    results = index.search(_vectors(10)[3] * 5, k=3)
+    assert results[0][0] == "3"
+    assert abs(results[0][1] - 1.0) < 1e-5
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+
+def test_flat_add_replaces_and_rejects_unusable_vectors():
+    index = FlatVectorIndex(dimension=3)
+    assert index.add("a", [1, 0, 0])
+    assert index.add("a", [0, 1, 0])
+    assert not index.add("b", [0, 0, 0])
+    assert not index.add("c", [1, 0])
+
+    assert len(index) == 1
+    assert index.search([0, 1, 0], k=5) == [("a", 1.0)]
+
+
+def test_flat_remove_keeps_remaining_rows_searchable():
+    vectors = _vectors(5)
+    index = FlatVectorIndex()
+    for i, row in enumerate(vectors):
+        index.add(str(i), row)
+
+    assert index.remove("1")
+    assert not index.remove("1")
+    assert "1" not in index
+    # The last row moved into the hole and must still be found
+    assert index.search(vectors[4], k=1)[0][0] == "4"
+    assert {key for key, _ in index.search(vectors[0], k=10)} == {"0", "2", "3", "4"}
+
+
+def test_ivf_answers_exactly_until_trained():
+    vectors = _vectors(50)
+    index = IVFVectorIndex(min_train_size=100)
+    flat = FlatVectorIndex()
+    for i, row in enumerate(vectors):
+        index.add(str(i), row)
+        flat.add(str(i), row)
+
+    assert not index.is_trained
+    assert not index.needs_training
+    for query in _vectors(5, seed=1):
+        assert index.search(query, k=3) == flat.search(query, k=3)
+
+
+def test_ivf_add_does_not_train():
+    index = IVFVectorIndex(min_train_size=32)
+    for i, row in enumerate(_vectors(64)):
+        index.add(str(i), row)
+
+    assert not index.is_trained
+    assert index.needs_training
+
+    index.train()
+    assert index.is_trained
+    assert not index.needs_training
+
+
+def test_ivf_search_after_training_finds_stored_vectors():
+    vectors = _vectors(200)
+    index = IVFVectorIndex(min_train_size=64, nprobe=4)
+    for i, row in enumerate(vectors):
+        index.add(str(i), row)
+    index.train()
+
+    for i in (0, 57, 199):
+        key, score = index.search(vectors[i], k=1)[0]
+        assert key == str(i)
+        assert abs(score - 1.0) < 1e-5
+
+
+def test_ivf_add_and_remove_after_training_update_the_lists():
+    vectors = _vectors(100)
+    index = IVFVectorIndex(min_train_size=64, nprobe=2)
+    for i, row in enumerate(vectors[:80]):
+        index.add(str(i), row)
+    index.train()
+
+    index.add("new", vectors[90])
+    assert index.search(vectors[90], k=1)[0][0] == "new"
+
+    assert index.remove("5")
+    assert "5" not in index
+    assert all(key != "5" for key, _ in index.search(vectors[5], k=80))
+    assert len(index) == 80
+
+
+def test_ivf_installs_centroids_computed_from_a_snapshot():
+    vectors = _vectors(120)
+    index = IVFVectorIndex(min_train_size=64)
+    for i, row in enumerate(vectors[:100]):
+        index.add(str(i), row)
+
+    data = index.training_data()
+    centroids = index.compute_centroids(data)
+    # Vectors added while training ran are placed when the centroids are installed
+    for i, row in enumerate(vectors[100:], start=100):
+        index.add(str(i), row)
+    index.install_centroids(centroids, data.shape[0])
+
+    assert index.is_trained
+    assert index.search(vectors[110], k=1)[0][0] == "110"
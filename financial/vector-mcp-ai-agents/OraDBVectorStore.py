@@ -1,20 +1,46 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
 import json
 import argparse
+import threading
 from sentence_transformers import SentenceTransformer
 import array
 import oracledb
 import yaml
 import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 
 class OraDBVectorStore:
-    def __init__(self, persist_directory: str = "embeddings"):
+    # Write modes for the add_* methods: append inserts new rows, upsert
+    # replaces rows with the same id, replace truncates the table first
+    WRITE_MODES = ("append", "upsert", "replace")
+
+    # Collection names used by callers, mapped to their tables
+    COLLECTION_TABLES = {
+        "pdf_documents": "PDFCollection",
+        "web_documents": "WebCollection",
+        "repository_documents": "RepoCollection",
+        "general_knowledge": "GeneralCollection"
+    }
+    COLLECTION_LABELS = {
+        "pdf_documents": "PDF Collection",
+        "web_documents": "Web Collection",
+        "repository_documents": "Repository Collection",
+        "general_knowledge": "General Knowledge Collection"
+    }
+
+    def __init__(self, persist_directory: str = "embeddings", pool_max: Optional[int] = None):
         """Initialize Oracle DB Vector Store
         
         Args:
             persist_directory: Not used for Oracle DB connection but kept for compatibility
+            pool_max: Size of the connection pool; 0 uses a single shared
+                connection. Defaults to ORACLE_DB_POOL_MAX from config.yaml.
         """
         # Load Oracle DB credentials from config.yaml
         credentials = self._load_config()
@@ -22,64 +48,106 @@ class OraDBVectorStore:
         username = credentials.get("ORACLE_DB_USERNAME", "ADMIN")
         password = credentials.get("ORACLE_DB_PASSWORD", "")
         dsn = credentials.get("ORACLE_DB_DSN", "")
+        self.batch_size = int(credentials.get("ORACLE_DB_BATCH_SIZE", 256))
+        self.approximate_search = bool(credentials.get("ORACLE_DB_APPROXIMATE_SEARCH", False))
+        if pool_max is None:
+            pool_max = int(credentials.get("ORACLE_DB_POOL_MAX", 0))
         
         if not password or not dsn:
             raise ValueError("Oracle DB credentials not found in config.yaml. Please set ORACLE_DB_USERNAME, ORACLE_DB_PASSWORD, and ORACLE_DB_DSN.")
 
+        self.pool = None
+        self.connection = None
+        self.cursor = None
+        self._cursor_lock = threading.Lock()
+        # One worker per collection so query_all searches them all at once
+        self._query_executor = ThreadPoolExecutor(
+            max_workers=len(self.COLLECTION_TABLES), thread_name_prefix="oradb-query")
+        self._query_vectors = OrderedDict()
+        self._query_vectors_lock = threading.Lock()
+
         # Connect to the database
         try:
-            conn23c = oracledb.connect(user=username, password=password, dsn=dsn)
-            print("Oracle DB Connection successful!")
+            if pool_max > 0:
+                # Pooled mode: each operation acquires its own connection,
+                # and ping_interval replaces connections that were dropped
+                self.pool = oracledb.create_pool(
+                    user=username,
+                    password=password,
+                    dsn=dsn,
+                    min=int(credentials.get("ORACLE_DB_POOL_MIN", 1)),
+                    max=pool_max,
+                    increment=int(credentials.get("ORACLE_DB_POOL_INCREMENT", 1)),
+                    ping_interval=60
+                )
+                print(f"Oracle DB connection pool created (max={pool_max})")
+            else:
+                self.connection = oracledb.connect(user=username, password=password, dsn=dsn)
+                self.cursor = self.connection.cursor()
+                print("Oracle DB Connection successful!")
         except Exception as e:
             print("Oracle DB Connection failed!", e)
             raise
 
-        # Create a table to store the data
-        cursor = conn23c.cursor()
-
-        self.connection = conn23c
-        self.cursor = cursor
-
-        sql = """CREATE TABLE IF NOT EXISTS PDFCollection (
-                           id VARCHAR2(4000 BYTE) PRIMARY KEY,
-                           text VARCHAR2(4000 BYTE),
-                           metadata VARCHAR2(4000 BYTE),
-                           embedding VECTOR
-                       )"""
-
-        cursor.execute(sql)
-
-        sql = """CREATE TABLE IF NOT EXISTS WebCollection (
-                           id VARCHAR2(4000 BYTE) PRIMARY KEY,
-                           text VARCHAR2(4000 BYTE),
-                           metadata VARCHAR2(4000 BYTE),
-                           embedding VECTOR
-                       )"""
-
-        cursor.execute(sql)
-
-        sql = """CREATE TABLE IF NOT EXISTS RepoCollection (
+        # Create the collection tables
+        with self.acquire_cursor() as cursor:
+            for table_name in self.COLLECTION_TABLES.values():
+                cursor.execute(f"""CREATE TABLE IF NOT EXISTS {table_name} (
                            id VARCHAR2(4000 BYTE) PRIMARY KEY,
                            text VARCHAR2(4000 BYTE),
                            metadata VARCHAR2(4000 BYTE),
                            embedding VECTOR
-                       )"""
-
-        cursor.execute(sql)
+                       )""")
 
+        self.encoder = SentenceTransformer('all-MiniLM-L12-v2')
 
-        sql = """CREATE TABLE IF NOT EXISTS GeneralCollection (
-                           id VARCHAR2(4000 BYTE) PRIMARY KEY,
-                           text VARCHAR2(4000 BYTE),
-                           metadata VARCHAR2(4000 BYTE),
-                           embedding VECTOR
-                       )"""
-
-        cursor.execute(sql)
+    @contextmanager
+    def acquire_cursor(self):
+        """Yield a cursor for a single operation
 
-        self.encoder = SentenceTransformer('all-MiniLM-L12-v2')
+        In pooled mode the cursor belongs to a connection acquired from the
+        pool and released afterwards. Otherwise the shared cursor is used
+        under a lock so concurrent callers do not interleave on it.
+        """
+        if self.pool is not None:
+            with self.pool.acquire() as connection:
+                with connection.cursor() as cursor:
+                    yield cursor
+        else:
+            with self._cursor_lock:
+                yield self.cursor
+
+    def check_health(self) -> Dict[str, Any]:
+        """Check that the database answers and report pool usage"""
+        status: Dict[str, Any] = {"pooled": self.pool is not None}
+        try:
+            with self.acquire_cursor() as cursor:
+                cursor.execute("SELECT 1 FROM dual")
+                cursor.fetchone()
+            status["healthy"] = True
+        except Exception as e:
+            status["healthy"] = False
+            status["error"] = str(e)
+
+        if self.pool is not None:
+            status.update({
+                "opened": self.pool.opened,
+                "busy": self.pool.busy,
+                "max": self.pool.max
+            })
+        return status
+
+    def close(self):
+        """Close the pool or the shared connection"""
+        self._query_executor.shutdown(wait=False)
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            self.cursor = None
 
-    
     def _load_config(self) -> Dict[str, str]:
         """Load configuration from config.yaml"""
         try:
@@ -112,8 +180,74 @@ class OraDBVectorStore:
                 sanitized[key] = str(value)
         return sanitized
     
-    def add_pdf_chunks(self, chunks: List[Dict[str, Any]], document_id: str):
-        """Add chunks from a PDF document to the vector store"""
+    def _encode_batch(self, texts: List[str]):
+        """Encode a batch of texts without a progress bar"""
+        return self.encoder.encode(texts, batch_size=32, show_progress_bar=False)
+
+    def _bulk_load(self, table_name: str, ids: List[str], texts: List[str],
+                   metadatas: List[Dict], mode: str = "upsert"):
+        """Encode and insert chunks in batches with array DML
+
+        Each batch is sent with a single executemany and committed, while the
+        next batch is encoded on a worker thread.
+
+        Args:
+            table_name: Target collection table
+            ids: Chunk ids
+            texts: Chunk texts
+            metadatas: Sanitized chunk metadata
+            mode: One of WRITE_MODES
+        """
+        if mode not in self.WRITE_MODES:
+            raise ValueError(f"Unknown write mode: {mode}. Use one of {', '.join(self.WRITE_MODES)}")
+
+
+        if mode == "upsert":
+            sql = f"""
+                MERGE INTO {table_name} t
+                USING (SELECT :1 AS id, :2 AS text, :3 AS metadata, :4 AS embedding FROM dual) s
+                ON (t.id = s.id)
+                WHEN MATCHED THEN UPDATE SET t.text = s.text, t.metadata = s.metadata, t.embedding = s.embedding
+                WHEN NOT MATCHED THEN INSERT (id, text, metadata, embedding)
+                    VALUES (s.id, s.text, s.metadata, s.embedding)
+                """
+        else:
+            sql = f"INSERT INTO {table_name} (id, text, metadata, embedding) VALUES (:1, :2, :3, :4)"
+
+        batch_size = max(1, self.batch_size)
+        total = len(texts)
+
+        with ThreadPoolExecutor(max_workers=1) as encoder_pool, self.acquire_cursor() as cursor:
+            if mode == "replace":
+                cursor.execute(f"truncate table {table_name}")
+
+            pending = encoder_pool.submit(self._encode_batch, texts[:batch_size])
+            for start in range(0, total, batch_size):
+                embeddings = pending.result()
+
+                # Encode the next batch while this one is inserted
+                next_start = start + batch_size
+                if next_start < total:
+                    pending = encoder_pool.submit(self._encode_batch, texts[next_start:next_start + batch_size])
+
+                rows = [
+                    (ids[i], texts[i], json.dumps(metadatas[i]), array.array("f", embedding))
+                    for i, embedding in zip(range(start, start + len(embeddings)), embeddings)
+                ]
+                cursor.setinputsizes(None, None, None, oracledb.DB_TYPE_VECTOR)
+                cursor.executemany(sql, rows)
+                cursor.connection.commit()
+
+        print(f"✓ Loaded {total} chunks into {table_name} ({mode})")
+
+    def add_pdf_chunks(self, chunks: List[Dict[str, Any]], document_id: str, mode: str = "upsert"):
+        """Add chunks from a PDF document to the vector store
+
+        Args:
+            chunks: Chunks with "text" and "metadata"
+            document_id: Prefix for the chunk ids
+            mode: One of WRITE_MODES
+        """
         if not chunks:
             return
         
@@ -122,27 +256,16 @@ class OraDBVectorStore:
         metadatas = [self._sanitize_metadata(chunk["metadata"]) for chunk in chunks]
         ids = [f"{document_id}_{i}" for i in range(len(chunks))]
 
-        # Encode all texts in a batch
-        embeddings = self.encoder.encode(texts, batch_size=32, show_progress_bar=True)
-
-        table_name = "PDFCollection"
-        # Truncate the table
-        self.cursor.execute(f"truncate table {table_name}")
-
-        # Insert embeddings into Oracle
-        for i, (docid, text, metadata, embedding) in enumerate(zip(ids, texts, metadatas, embeddings), start=1):
-            json_metadata = json.dumps(metadata)  # Convert to JSON string
-            vector = array.array("f", embedding)
-
-            self.cursor.execute(
-                "INSERT INTO PDFCollection (id, text, metadata, embedding) VALUES (:1, :2, :3, :4)",
-                (docid, text, json_metadata, vector)
-            )
-
-        self.connection.commit()
+        self._bulk_load("PDFCollection", ids, texts, metadatas, mode)
     
-    def add_web_chunks(self, chunks: List[Dict[str, Any]], source_id: str):
-        """Add chunks from web content to the vector store"""
+    def add_web_chunks(self, chunks: List[Dict[str, Any]], source_id: str, mode: str = "upsert"):
+        """Add chunks from web content to the vector store
+
+        Args:
+            chunks: Chunks with "text" and "metadata"
+            source_id: Prefix for the chunk ids
+            mode: One of WRITE_MODES
+        """
         if not chunks:
             return
         
@@ -151,26 +274,16 @@ class OraDBVectorStore:
         metadatas = [self._sanitize_metadata(chunk["metadata"]) for chunk in chunks]
         ids = [f"{source_id}_{i}" for i in range(len(chunks))]
 
-        # Encode all texts in a batch
-        embeddings = self.encoder.encode(texts, batch_size=32, show_progress_bar=True)
-
-        table_name = "WebCollection"
-        # No truncation for web chunks, just append new ones
-
-        # Insert embeddings into Oracle
-        for i, (docid, text, metadata, embedding) in enumerate(zip(ids, texts, metadatas, embeddings), start=1):
-            json_metadata = json.dumps(metadata)  # Convert to JSON string
-            vector = array.array("f", embedding)
-
-            self.cursor.execute(
-                "INSERT INTO WebCollection (id, text, metadata, embedding) VALUES (:1, :2, :3, :4)",
-                (docid, text, json_metadata, vector)
-            )
-
-        self.connection.commit()
+        self._bulk_load("WebCollection", ids, texts, metadatas, mode)
     
-    def add_general_knowledge(self, chunks: List[Dict[str, Any]], source_id: str):
-        """Add general knowledge chunks to the vector store"""
+    def add_general_knowledge(self, chunks: List[Dict[str, Any]], source_id: str, mode: str = "upsert"):
+        """Add general knowledge chunks to the vector store
+
+        Args:
+            chunks: Chunks with "text" and "metadata"
+            source_id: Prefix for the chunk ids
+            mode: One of WRITE_MODES
+        """
         if not chunks:
             return
         
@@ -178,26 +291,17 @@ class OraDBVectorStore:
         texts = [chunk["text"] for chunk in chunks]
         metadatas = [self._sanitize_metadata(chunk["metadata"]) for chunk in chunks]
         ids = [f"{source_id}_{i}" for i in range(len(chunks))]
-        
-        # Encode all texts in a batch
-        embeddings = self.encoder.encode(texts, batch_size=32, show_progress_bar=True)
-
-        table_name = "GeneralCollection"
-        
-        # Insert embeddings into Oracle
-        for i, (docid, text, metadata, embedding) in enumerate(zip(ids, texts, metadatas, embeddings), start=1):
-            json_metadata = json.dumps(metadata)  # Convert to JSON string
-            vector = array.array("f", embedding)
 
-            self.cursor.execute(
-                "INSERT INTO GeneralCollection (id, text, metadata, embedding) VALUES (:1, :2, :3, :4)",
-                (docid, text, json_metadata, vector)
-            )
-
-        self.connection.commit()
+        self._bulk_load("GeneralCollection", ids, texts, metadatas, mode)
     
-    def add_repo_chunks(self, chunks: List[Dict[str, Any]], document_id: str):
-        """Add chunks from a repository to the vector store"""
+    def add_repo_chunks(self, chunks: List[Dict[str, Any]], document_id: str, mode: str = "upsert"):
+        """Add chunks from a repository to the vector store
+
+        Args:
+            chunks: Chunks with "text" and "metadata"
+            document_id: Prefix for the chunk ids
+            mode: One of WRITE_MODES
+        """
         if not chunks:
             return
         
@@ -205,148 +309,228 @@ class OraDBVectorStore:
         texts = [chunk["text"] for chunk in chunks]
         metadatas = [self._sanitize_metadata(chunk["metadata"]) for chunk in chunks]
         ids = [f"{document_id}_{i}" for i in range(len(chunks))]
-        
-        # Encode all texts in a batch
-        embeddings = self.encoder.encode(texts, batch_size=32, show_progress_bar=True)
 
-        table_name = "RepoCollection"
+        self._bulk_load("RepoCollection", ids, texts, metadatas, mode)
+    
+    def _encode_query(self, query: str) -> array.array:
+        """Encode a query into a vector bind value, reusing recent encodings"""
+        with self._query_vectors_lock:
+            vector = self._query_vectors.get(query)
+            if vector is not None:
+                self._query_vectors.move_to_end(query)
+                return vector
+
+        embedding = self.encoder.encode(query, batch_size=32, show_progress_bar=False)
+        vector = array.array("f", embedding)
+
+        with self._query_vectors_lock:
+            self._query_vectors[query] = vector
+            while len(self._query_vectors) > 128:
+                self._query_vectors.popitem(last=False)
+        return vector
+
+    def query_all(self, query: str, collections: Optional[List[str]] = None, n_results: int = 3,
+                  fusion: str = "distance", limit: Optional[int] = None, rrf_k: int = 60,
+                  **kwargs) -> List[Dict[str, Any]]:
+        """Query several collections at once and merge the results
+
+        The query is embedded once and the collections are searched
+        concurrently, so latency is that of the slowest collection rather
+        than the sum of all of them.
+
+        Args:
+            query: Query text
+            collections: Collection names to search; defaults to all
+            n_results: Number of chunks to fetch from each collection
+            fusion: "distance" merges by vector distance, "rrf" by reciprocal-rank fusion
+            limit: Maximum number of merged results; defaults to n_results per collection
+            rrf_k: Rank offset for reciprocal-rank fusion
+            **kwargs: Passed to query_collection (approximate, metadata_filter, metadata_fields)
 
-        # Insert embeddings into Oracle
-        for i, (docid, text, metadata, embedding) in enumerate(zip(ids, texts, metadatas, embeddings), start=1):
-            json_metadata = json.dumps(metadata)  # Convert to JSON string
-            vector = array.array("f", embedding)
+        Returns:
+            Merged list of dictionaries with content, metadata, distance and collection
+        """
+        if fusion not in ("distance", "rrf"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
 
-            self.cursor.execute(
-                "INSERT INTO RepoCollection (id, text, metadata, embedding) VALUES (:1, :2, :3, :4)",
-                (docid, text, json_metadata, vector)
-            )
+        collections = collections or list(self.COLLECTION_TABLES)
+        for collection_name in collections:
+            if collection_name not in self.COLLECTION_TABLES:
+                raise ValueError(f"Unknown collection name: {collection_name}")
 
-        self.connection.commit()
-    
-    def query_pdf_collection(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
-        """Query the PDF documents collection"""
-        print("🔍 [Oracle DB] Querying PDF Collection")
-        # Generate Embeddings
-        embeddings = self.encoder.encode(query, batch_size=32, show_progress_bar=True)
-        new_vector = array.array("f", embeddings)
-
-        sql = """
-            SELECT Id, Text, MetaData, Embedding
-            FROM PDFCOLLECTION
-            ORDER BY VECTOR_DISTANCE(EMBEDDING, :nv, EUCLIDEAN) 
-            FETCH FIRST 10 ROWS ONLY
+        print(f"🔍 [Oracle DB] Querying {len(collections)} collections")
+        vector = self._encode_query(query)
+
+        futures = {
+            collection_name: self._query_executor.submit(
+                self._query_table, self.COLLECTION_TABLES[collection_name], vector, n_results, **kwargs)
+            for collection_name in collections
+        }
+
+        per_collection = {}
+        for collection_name, future in futures.items():
+            try:
+                per_collection[collection_name] = future.result()
+            except Exception as e:
+                print(f"Warning: query of {self.COLLECTION_LABELS[collection_name]} failed: {str(e)}")
+                per_collection[collection_name] = []
+
+        merged = []
+        for collection_name, results in per_collection.items():
+            for rank, result in enumerate(results, start=1):
+                result["collection"] = collection_name
+                if fusion == "rrf":
+                    result["rrf_score"] = 1.0 / (rrf_k + rank)
+                merged.append(result)
+
+        if fusion == "rrf":
+            merged.sort(key=lambda result: result["rrf_score"], reverse=True)
+        else:
+            merged.sort(key=lambda result: result["distance"])
+
+        limit = limit or n_results * len(collections)
+        print(f"🔍 [Oracle DB] Retrieved {len(merged[:limit])} chunks from {len(collections)} collections")
+        return merged[:limit]
+
+    async def aquery_all(self, query: str, collections: Optional[List[str]] = None,
+                         n_results: int = 3, **kwargs) -> List[Dict[str, Any]]:
+        """Query several collections without blocking the event loop"""
+        return await asyncio.to_thread(self.query_all, query, collections, n_results, **kwargs)
+
+    def query_collection(self, collection_name: str, query: str, n_results: int = 3,
+                         approximate: Optional[bool] = None,
+                         metadata_filter: Optional[Dict[str, Any]] = None,
+                         metadata_fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Query a collection for the chunks nearest to a query
+
+        Args:
+            collection_name: Name of the collection (pdf_documents, web_documents, repository_documents, general_knowledge)
+            query: Query text
+            n_results: Number of chunks to return
+            approximate: Use FETCH APPROXIMATE so a vector index can answer;
+                defaults to ORACLE_DB_APPROXIMATE_SEARCH from config.yaml
+            metadata_filter: Metadata key/value pairs that must match, evaluated in SQL
+            metadata_fields: Metadata keys to return; None returns all metadata
+
+        Returns:
+            List of dictionaries with content, metadata and distance
+        """
+        table_name = self.COLLECTION_TABLES.get(collection_name)
+        if not table_name:
+            raise ValueError(f"Unknown collection name: {collection_name}")
+
+        label = self.COLLECTION_LABELS[collection_name]
+        print(f"🔍 [Oracle DB] Querying {label}")
+        results = self._query_table(
+            table_name, self._encode_query(query), n_results,
+            approximate=approximate, metadata_filter=metadata_filter, metadata_fields=metadata_fields
+        )
+        print(f"🔍 [Oracle DB] Retrieved {len(results)} chunks from {label}")
+        return results
+
+    def _query_table(self, table_name: str, vector: array.array, n_results: int,
+                     approximate: Optional[bool] = None,
+                     metadata_filter: Optional[Dict[str, Any]] = None,
+                     metadata_fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Run a top-k vector search against one collection table
+
+        Only the text, the requested metadata and the distance are selected;
+        the embedding column never leaves the database.
+        """
+        if approximate is None:
+            approximate = self.approximate_search
+
+        binds: Dict[str, Any] = {"nv": vector, "k": max(1, int(n_results))}
+
+        if metadata_fields is None:
+            columns = "Text, MetaData"
+        else:
+            projections = []
+            for i, field in enumerate(metadata_fields):
+                projections.append(f"JSON_VALUE(MetaData, '$.{self._json_key(field)}') AS m{i}")
+            columns = ", ".join(["Text"] + projections)
+
+        where = ""
+        if metadata_filter:
+            conditions = []
+            for i, (key, value) in enumerate(metadata_filter.items()):
+                conditions.append(f"JSON_VALUE(MetaData, '$.{self._json_key(key)}') = :f{i}")
+                # JSON_VALUE returns scalars as JSON text, e.g. true rather than True
+                binds[f"f{i}"] = value if isinstance(value, str) else json.dumps(value)
+            where = "WHERE " + " AND ".join(conditions)
+
+        fetch = "FETCH APPROXIMATE FIRST :k ROWS ONLY" if approximate else "FETCH FIRST :k ROWS ONLY"
+        sql = f"""
+            SELECT {columns}, VECTOR_DISTANCE(EMBEDDING, :nv, EUCLIDEAN) AS distance
+            FROM {table_name}
+            {where}
+            ORDER BY distance
+            {fetch}
             """
 
-        self.cursor.execute(sql, {"nv": new_vector})
+        with self.acquire_cursor() as cursor:
+            cursor.arraysize = binds["k"]
+            cursor.execute(sql, binds)
+            rows = cursor.fetchall()
 
-        # Fetch all rows
-        rows = self.cursor.fetchall()
-        
         # Format results
         formatted_results = []
         for row in rows:
-            result = {
-                "content": row[1],
-                "metadata": json.loads(row[2]) if isinstance(row[2], str) else row[2]
-            }
-            formatted_results.append(result)
-        
-        print(f"🔍 [Oracle DB] Retrieved {len(formatted_results)} chunks from PDF Collection")
+            if metadata_fields is None:
+                metadata = json.loads(row[1]) if isinstance(row[1], str) else row[1]
+            else:
+                metadata = {field: value for field, value in zip(metadata_fields, row[1:-1])}
+            formatted_results.append({
+                "content": row[0],
+                "metadata": metadata,
+                "distance": row[-1]
+            })
         return formatted_results
+
+    @staticmethod
+    def _json_key(key: str) -> str:
+        """Validate a metadata key before it is placed in a JSON path"""
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", key):
+            raise ValueError(f"Invalid metadata key: {key}")
+        return key
+
+    def query_pdf_collection(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
+        """Query the PDF documents collection"""
+        return self.query_collection("pdf_documents", query, n_results)
     
     def query_web_collection(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
         """Query the web documents collection"""
-        print("🔍 [Oracle DB] Querying Web Collection")
-        # Generate Embeddings
-        embeddings = self.encoder.encode(query, batch_size=32, show_progress_bar=True)
-        new_vector = array.array("f", embeddings)
-
-        sql = """
-            SELECT Id, Text, MetaData, Embedding
-            FROM WebCOLLECTION
-            ORDER BY VECTOR_DISTANCE(EMBEDDING, :nv, EUCLIDEAN) 
-            FETCH FIRST 10 ROWS ONLY
-            """
-
-        self.cursor.execute(sql, {"nv": new_vector})
-
-        # Fetch all rows
-        rows = self.cursor.fetchall()
-
-        # Format results
-        formatted_results = []
-        for row in rows:
-            result = {
-                "content": row[1],
-                "metadata": json.loads(row[2]) if isinstance(row[2], str) else row[2]
-            }
-            formatted_results.append(result)
-        
-        print(f"🔍 [Oracle DB] Retrieved {len(formatted_results)} chunks from Web Collection")
-        return formatted_results
+        return self.query_collection("web_documents", query, n_results)
     
     def query_general_collection(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
         """Query the general knowledge collection"""
-        print("🔍 [Oracle DB] Querying General Knowledge Collection")
-        # Generate Embeddings
-        embeddings = self.encoder.encode(query, batch_size=32, show_progress_bar=True)
-        new_vector = array.array("f", embeddings)
-
-        sql = """
-            SELECT Id, Text, MetaData, Embedding
-            FROM GeneralCollection
-            ORDER BY VECTOR_DISTANCE(EMBEDDING, :nv, EUCLIDEAN) 
-            FETCH FIRST 10 ROWS ONLY
-            """
-
-        self.cursor.execute(sql, {"nv": new_vector})
-
-        # Fetch all rows
-        rows = self.cursor.fetchall()
-
-        # Format results
-        formatted_results = []
-        for row in rows:
-            result = {
-                "content": row[1],
-                "metadata": json.loads(row[2]) if isinstance(row[2], str) else row[2]
-            }
-            formatted_results.append(result)
-        
-        print(f"🔍 [Oracle DB] Retrieved {len(formatted_results)} chunks from General Knowledge Collection")
-        return formatted_results
+        return self.query_collection("general_knowledge", query, n_results)
     
     def query_repo_collection(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
         """Query the repository documents collection"""
-        print("🔍 [Oracle DB] Querying Repository Collection")
-        # Generate Embeddings
-        embeddings = self.encoder.encode(query, batch_size=32, show_progress_bar=True)
-        new_vector = array.array("f", embeddings)
-
-        sql = """
-            SELECT Id, Text, MetaData, Embedding
-            FROM RepoCOLLECTION
-            ORDER BY VECTOR_DISTANCE(EMBEDDING, :nv, EUCLIDEAN) 
-            FETCH FIRST 10 ROWS ONLY
-            """
+        return self.query_collection("repository_documents", query, n_results)
 
-        self.cursor.execute(sql, {"nv": new_vector})
+    async def aquery_collection(self, collection_name: str, query: str, n_results: int = 3,
+                                **kwargs) -> List[Dict[str, Any]]:
+        """Query a collection without blocking the event loop"""
+        return await asyncio.to_thread(self.query_collection, collection_name, query, n_results, **kwargs)
+
+    async def aquery_pdf_collection(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
+        """Query the PDF documents collection without blocking the event loop"""
+        return await asyncio.to_thread(self.query_pdf_collection, query, n_results)
+
+    async def aquery_web_collection(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
+        """Query the web documents collection without blocking the event loop"""
+        return await asyncio.to_thread(self.query_web_collection, query, n_results)
+
+    async def aquery_general_collection(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
+        """Query the general knowledge collection without blocking the event loop"""
+        return await asyncio.to_thread(self.query_general_collection, query, n_results)
+
+    async def aquery_repo_collection(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
+        """Query the repository documents collection without blocking the event loop"""
+        return await asyncio.to_thread(self.query_repo_collection, query, n_results)
 
-        # Fetch all rows
-        rows = self.cursor.fetchall()
-        
-        # Format results
-        formatted_results = []
-        for row in rows:
-            result = {
-                "content": row[1],
-                "metadata": json.loads(row[2]) if isinstance(row[2], str) else row[2]
-            }
-            formatted_results.append(result)
-        
-        print(f"🔍 [Oracle DB] Retrieved {len(formatted_results)} chunks from Repository Collection")
-        return formatted_results
-        
     def get_collection_count(self, collection_name: str) -> int:
         """Get the total number of chunks in a collection
         
@@ -356,22 +540,15 @@ class OraDBVectorStore:
         Returns:
             Number of chunks in the collection
         """
-        # Map collection names to table names
-        collection_map = {
-            "pdf_documents": "PDFCollection",
-            "web_documents": "WebCollection",
-            "repository_documents": "RepoCollection", 
-            "general_knowledge": "GeneralCollection"
-        }
-        
-        table_name = collection_map.get(collection_name)
+        table_name = self.COLLECTION_TABLES.get(collection_name)
         if not table_name:
             raise ValueError(f"Unknown collection name: {collection_name}")
         
         # Count the rows in the table
         sql = f"SELECT COUNT(*) FROM {table_name}"
-        self.cursor.execute(sql)
-        count = self.cursor.fetchone()[0]
+        with self.acquire_cursor() as cursor:
+            cursor.execute(sql)
+            count = cursor.fetchone()[0]
         
         return count
     
@@ -384,23 +561,16 @@ class OraDBVectorStore:
         Returns:
             Dictionary containing the content and metadata of the latest chunk
         """
-        # Map collection names to table names
-        collection_map = {
-            "pdf_documents": "PDFCollection",
-            "web_documents": "WebCollection",
-            "repository_documents": "RepoCollection", 
-            "general_knowledge": "GeneralCollection"
-        }
-        
-        table_name = collection_map.get(collection_name)
+        table_name = self.COLLECTION_TABLES.get(collection_name)
         if not table_name:
             raise ValueError(f"Unknown collection name: {collection_name}")
         
         # Get the most recently inserted row (using ID as a proxy for insertion time)
         # This assumes IDs are assigned sequentially or have a timestamp component
         sql = f"SELECT Id, Text, MetaData FROM {table_name} ORDER BY ROWID DESC FETCH FIRST 1 ROW ONLY"
-        self.cursor.execute(sql)
-        row = self.cursor.fetchone()
+        with self.acquire_cursor() as cursor:
+            cursor.execute(sql)
+            row = cursor.fetchone()
         
         if not row:
             raise ValueError(f"No chunks found in collection: {collection_name}")
@@ -418,6 +588,8 @@ def main():
     parser.add_argument("--add", help="JSON file containing chunks to add")
     parser.add_argument("--add-web", help="JSON file containing web chunks to add")
     parser.add_argument("--query", help="Query to search for")
+    parser.add_argument("--mode", choices=OraDBVectorStore.WRITE_MODES, default="upsert",
+                        help="How to write added chunks (default: upsert)")
     
     args = parser.parse_args()
     store = OraDBVectorStore()
@@ -425,13 +597,13 @@ def main():
     if args.add:
         with open(args.add, 'r', encoding='utf-8') as f:
             chunks = json.load(f)
-        store.add_pdf_chunks(chunks, document_id=args.add)
+        store.add_pdf_chunks(chunks, document_id=args.add, mode=args.mode)
         print(f"✓ Added {len(chunks)} PDF chunks to Oracle DB vector store")
     
     if args.add_web:
         with open(args.add_web, 'r', encoding='utf-8') as f:
             chunks = json.load(f)
-        store.add_web_chunks(chunks, source_id=args.add_web)
+        store.add_web_chunks(chunks, source_id=args.add_web, mode=args.mode)
         print(f"✓ Added {len(chunks)} web chunks to Oracle DB vector store")
     
     if args.query:
@@ -0,0 +1,142 @@
+import copy
+import gc
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from agents.agent_factory import create_agents
+
+
+class _PoolEntry:
+    """A loaded agent plus the bookkeeping the pool needs to share it"""
+
+    def __init__(self, model_name: str, agent: Any, max_concurrency: int):
+        self.model_name = model_name
+        self.agents = {bool(getattr(agent, "use_cot", False)): agent}
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.in_use = 0
+        self.last_used = time.monotonic()
+
+    def variant(self, use_cot: bool) -> Any:
+        """Return the agent for a CoT setting, sharing the loaded model between both"""
+        agent = self.agents.get(use_cot)
+        if agent is None:
+            base = next(iter(self.agents.values()))
+            agent = copy.copy(base)
+            agent.use_cot = use_cot
+            agent.agents = create_agents(base.llm, base.vector_store) if use_cot else None
+            self.agents[use_cot] = agent
+        return agent
+
+
+class AgentPool:
+    """Registry of warm RAG agents, one loaded model per model name
+
+    Agents are built once by ``factory(model_name)`` (at startup via ``preload``
+    or on first use) and reused by later requests. At most ``capacity`` models
+    stay loaded; the least recently used idle model is unloaded to make room.
+    Each model serves at most ``max_concurrency`` queries at a time.
+    """
+
+    def __init__(self, factory: Callable[[str], Any], capacity: int = 2, max_concurrency: int = 1):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.factory = factory
+        self.capacity = capacity
+        self.max_concurrency = max_concurrency
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+
+    def register(self, model_name: str, agent: Any) -> None:
+        """Add an already constructed agent to the pool"""
+        with self._lock:
+            self._entries[model_name] = _PoolEntry(model_name, agent, self.max_concurrency)
+            self._entries.move_to_end(model_name)
+            self._evict_locked()
+
+    def preload(self, model_name: str) -> None:
+        """Load a model now so the first request does not pay for it"""
+        self._get_entry(model_name)
+
+    def _get_entry(self, model_name: str, reserve: bool = False) -> _PoolEntry:
+        """Look up or load the entry for a model
+
+        With ``reserve`` the entry's ``in_use`` count is raised under the same
+        lock hold that found it, so it cannot be evicted before the caller uses it.
+        """
+        with self._lock:
+            entry = self._entries.get(model_name)
+            if entry is not None:
+                self._entries.move_to_end(model_name)
+                if reserve:
+                    entry.in_use += 1
+                return entry
+            load_lock = self._loading.setdefault(model_name, threading.Lock())
+
+        # Only one thread builds a given model; the others wait and reuse it
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(model_name)
+                if entry is not None:
+                    self._entries.move_to_end(model_name)
+                    if reserve:
+                        entry.in_use += 1
+                    return entry
+
+            print(f"\nLoading agent for model {model_name}...")
+            agent = self.factory(model_name)
+
+            with self._lock:
+                entry = _PoolEntry(model_name, agent, self.max_concurrency)
+                if reserve:
+                    entry.in_use += 1
+                self._entries[model_name] = entry
+                self._loading.pop(model_name, None)
+                self._evict_locked(keep=model_name)
+                return entry
+
+    def _evict_locked(self, keep: Optional[str] = None) -> None:
+        """Unload least recently used idle models until within capacity"""
+        evicted = False
+        for name in list(self._entries):
+            if len(self._entries) <= self.capacity:
+                break
+            entry = self._entries[name]
+            if name == keep or entry.in_use:
+                continue
+            print(f"Unloading agent for model {name} (pool capacity {self.capacity})")
+            del self._entries[name]
+            evicted = True
+        if evicted:
+            gc.collect()
+            try:
+                import torch
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except ImportError:
+                pass
+
+    @contextmanager
+    def acquire(self, model_name: str, use_cot: bool = False):
+        """Borrow the agent for a model, waiting for a free concurrency slot"""
+        entry = self._get_entry(model_name, reserve=True)
+        try:
+            with entry.slots:
+                with self._lock:
+                    entry.last_used = time.monotonic()
+                    agent = entry.variant(use_cot)
+                yield agent
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                self._evict_locked()
+
+    def loaded_models(self) -> list:
+        """Names of currently loaded models, least recently used first"""
+        with self._lock:
+            return list(self._entries)
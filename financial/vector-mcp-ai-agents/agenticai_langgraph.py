@@ -193,15 +193,15 @@ class OracleMCPTools:
     def execute_sql_query(self, query: str) -> List[Dict[str, Any]]:
         """Execute SQL query on Oracle Database 23ai"""
         try:
-            if self.connection_available and self.vector_store and hasattr(self.vector_store, 'cursor'):
-                cursor = self.vector_store.cursor
-                cursor.execute(query)
-                
-                # Get column names
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                
-                # Fetch results and convert to dict
-                rows = cursor.fetchall()
+            if self.connection_available and self.vector_store and hasattr(self.vector_store, 'acquire_cursor'):
+                with self.vector_store.acquire_cursor() as cursor:
+                    cursor.execute(query)
+                    
+                    # Get column names
+                    columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                    
+                    # Fetch results and convert to dict
+                    rows = cursor.fetchall()
                 results = []
                 for row in rows:
                     if columns:
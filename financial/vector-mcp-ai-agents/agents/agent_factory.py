@@ -108,12 +108,10 @@ class ResearchAgent(Agent):
     def research(self, query: str, step: str) -> List[Dict[str, Any]]:
         logger.info(f"\n🔍 Researching for step: {step}")
         
-        # Query all collections
-        pdf_results = self.vector_store.query_pdf_collection(query)
-        repo_results = self.vector_store.query_repo_collection(query)
-        
-        # Combine results
-        all_results = pdf_results + repo_results
+        # Query all collections: one embedding, collections searched concurrently
+        all_results = self.vector_store.query_all(
+            query, collections=["pdf_documents", "repository_documents"]
+        )
         logger.info(f"Found {len(all_results)} relevant documents")
         
         if not all_results:
@@ -371,6 +371,7 @@ def create_interface():
             "PDF Collection",
             "Repository Collection", 
             "Web Knowledge Base",
+            "All Collections",
             "General Knowledge"
         ]
         
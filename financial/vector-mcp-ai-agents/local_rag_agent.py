@@ -1,7 +1,7 @@
 from typing import List, Dict, Any, Optional
 from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
 import torch
-from store import VectorStore
+from store import VectorStore, CONTEXT_COLLECTIONS
 from agents.agent_factory import create_agents
 import argparse
 import yaml
@@ -303,6 +303,10 @@ class LocalRAGAgent:
                 db_type = "Oracle DB" if self.use_oracle_db else "ChromaDB"
                 print(f"🔄 Using {db_type} for retrieving Web Knowledge Base context")
                 context = self.vector_store.query_web_collection(query)
+            elif self.collection == "All Collections":
+                db_type = "Oracle DB" if self.use_oracle_db else "ChromaDB"
+                print(f"🔄 Using {db_type} for retrieving context from all collections")
+                context = self.vector_store.query_all(query, collections=CONTEXT_COLLECTIONS)
             else:
                 context = []
             
@@ -406,6 +410,10 @@ class LocalRAGAgent:
                 db_type = "Oracle DB" if self.use_oracle_db else "ChromaDB"
                 print(f"🔄 Using {db_type} for retrieving Web Knowledge Base context")
                 context = self.vector_store.query_web_collection(query)
+            elif self.collection == "All Collections":
+                db_type = "Oracle DB" if self.use_oracle_db else "ChromaDB"
+                print(f"🔄 Using {db_type} for retrieving context from all collections")
+                context = self.vector_store.query_all(query, collections=CONTEXT_COLLECTIONS)
             else:
                 context = []
             
@@ -1,6 +1,8 @@
+import copy
 import os
-from typing import List, Optional
+from typing import List, Literal, Optional
 from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
@@ -10,6 +12,7 @@ from pdf_processor import PDFProcessor
 from store import VectorStore
 from local_rag_agent import LocalRAGAgent
 from rag_agent import RAGAgent
+from agent_pool import AgentPool
 
 # Load environment variables
 load_dotenv()
@@ -43,16 +46,33 @@ except ImportError:
     ollama_available = False
     print("\nOllama not installed. You can install it with: pip install ollama")
 
-# Initialize RAG agent - use OpenAI if API key is available, otherwise use local model or Ollama
+DEFAULT_LOCAL_MODEL = "mistralai/Mistral-7B-Instruct-v0.2"
 openai_api_key = os.getenv("OPENAI_API_KEY")
+
+def build_agent(model_name: str):
+    """Construct the RAG agent for a model name ("openai", "ollama:<name>" or a HuggingFace id)"""
+    if model_name == "openai":
+        return RAGAgent(vector_store=vector_store, openai_api_key=openai_api_key)
+    return LocalRAGAgent(vector_store=vector_store, model_name=model_name)
+
+# Loaded agents are kept warm and shared across requests
+agent_pool = AgentPool(
+    build_agent,
+    capacity=int(os.getenv("RAG_AGENT_POOL_SIZE", "2")),
+    max_concurrency=int(os.getenv("RAG_AGENT_MAX_CONCURRENCY", "1"))
+)
+
+# Initialize RAG agent - use OpenAI if API key is available, otherwise use local model or Ollama
 if openai_api_key:
     print("\nUsing OpenAI GPT-4 for RAG...")
-    rag_agent = RAGAgent(vector_store=vector_store, openai_api_key=openai_api_key)
+    default_model = "openai"
+    agent_pool.preload(default_model)
 else:
     # Try to use local Mistral model first
     try:
         print("\nTrying to use local Mistral model...")
-        rag_agent = LocalRAGAgent(vector_store=vector_store)
+        default_model = DEFAULT_LOCAL_MODEL
+        agent_pool.preload(default_model)
         print("Successfully initialized local Mistral model.")
     except Exception as e:
         print(f"\nFailed to initialize local Mistral model: {str(e)}")
@@ -61,7 +81,8 @@ else:
         if ollama_available:
             try:
                 print("\nFalling back to Ollama with llama3 model...")
-                rag_agent = LocalRAGAgent(vector_store=vector_store, model_name="ollama:llama3")
+                default_model = "ollama:llama3"
+                agent_pool.preload(default_model)
                 print("Successfully initialized Ollama with llama3 model.")
             except Exception as e:
                 print(f"\nFailed to initialize Ollama: {str(e)}")
@@ -71,10 +92,39 @@ else:
             print("\nNo available models. Please check your configuration.")
             raise e
 
+# Additional models to warm at startup, e.g. RAG_AGENT_PRELOAD="ollama:llama3,openai"
+for preload_model in filter(None, (m.strip() for m in os.getenv("RAG_AGENT_PRELOAD", "").split(","))):
+    try:
+        agent_pool.preload(preload_model)
+    except Exception as e:
+        print(f"\nFailed to preload model {preload_model}: {str(e)}")
+
+def resolve_model(requested: Optional[str]) -> str:
+    """Map the model named in a request to an agent pool key"""
+    if not requested:
+        return default_model
+    if requested.startswith("ollama:") and ollama_available:
+        return requested
+    if requested == "openai" and openai_api_key:
+        return "openai"
+    return DEFAULT_LOCAL_MODEL
+
+def run_query(model_name: str, query_text: str, use_cot: bool, collection: Optional[str] = None):
+    with agent_pool.acquire(model_name, use_cot=use_cot) as rag_agent:
+        if collection is not None:
+            # Pooled agents are shared between requests, so set the collection on a copy
+            rag_agent = copy.copy(rag_agent)
+            rag_agent.collection = collection
+        return rag_agent.process_query(query_text)
+
 class QueryRequest(BaseModel):
     query: str
     use_cot: bool = False
     model: Optional[str] = None  # Allow specifying model in the request
+    collection: Optional[Literal[
+        "PDF Collection", "Repository Collection", "Web Knowledge Base",
+        "All Collections", "General Knowledge",
+    ]] = None
 
 class QueryResponse(BaseModel):
     answer: str
@@ -118,38 +168,11 @@ async def upload_pdf(file: UploadFile = File(...)):
 async def query(request: QueryRequest):
     """Process a query using the RAG agent"""
     try:
-        # Determine which model to use
-        if request.model:
-            if request.model.startswith("ollama:") and ollama_available:
-                # Use specified Ollama model
-                rag_agent = LocalRAGAgent(vector_store=vector_store, model_name=request.model, use_cot=request.use_cot)
-            elif request.model == "openai" and openai_api_key:
-                # Use OpenAI
-                rag_agent = RAGAgent(vector_store=vector_store, openai_api_key=openai_api_key, use_cot=request.use_cot)
-            else:
-                # Use default local model
-                rag_agent = LocalRAGAgent(vector_store=vector_store, use_cot=request.use_cot)
-        else:
-            # Reinitialize agent with CoT setting using default model
-            if openai_api_key:
-                rag_agent = RAGAgent(vector_store=vector_store, openai_api_key=openai_api_key, use_cot=request.use_cot)
-            else:
-                # Try local Mistral first
-                try:
-                    rag_agent = LocalRAGAgent(vector_store=vector_store, use_cot=request.use_cot)
-                except Exception as e:
-                    print(f"Failed to initialize local Mistral model: {str(e)}")
-                    # Fall back to Ollama if available
-                    if ollama_available:
-                        try:
-                            rag_agent = LocalRAGAgent(vector_store=vector_store, model_name="ollama:llama3", use_cot=request.use_cot)
-                        except Exception as e2:
-                            raise Exception(f"Failed to initialize any model: {str(e2)}")
-                    else:
-                        raise e
-            
-        response = rag_agent.process_query(request.query)
-        return response
+        # Model loading and inference block, so keep them off the event loop
+        model_name = resolve_model(request.model)
+        return await run_in_threadpool(
+            run_query, model_name, request.query, request.use_cot, request.collection
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,7 +1,7 @@
 from typing import List, Dict, Any, Optional
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from store import VectorStore
+from store import VectorStore, CONTEXT_COLLECTIONS
 from agents.agent_factory import create_agents
 import os
 import argparse
@@ -91,6 +91,18 @@ class RAGAgent:
                 # Only log content preview at debug level
                 content_preview = chunk["content"][:150] + "..." if len(chunk["content"]) > 150 else chunk["content"]
                 logger.debug(f"Content preview for source [{i+1}]: {content_preview}")
+        elif self.collection == "All Collections":
+            logger.info(f"Retrieving context from all collections for query: '{query}'")
+            all_context = self.vector_store.query_all(query, collections=CONTEXT_COLLECTIONS)
+            initial_context.extend(all_context)
+            logger.info(f"Retrieved {len(all_context)} chunks from all collections")
+            # Log each chunk with citation number but not full content
+            for i, chunk in enumerate(all_context):
+                source = chunk["metadata"].get("source", "Unknown")
+                logger.info(f"Source [{i+1}]: {source} (collection: {chunk.get('collection', 'Unknown')})")
+                # Only log content preview at debug level
+                content_preview = chunk["content"][:150] + "..." if len(chunk["content"]) > 150 else chunk["content"]
+                logger.debug(f"Content preview for source [{i+1}]: {content_preview}")
         # For General Knowledge, no context is needed
         else:
             logger.info("Using General Knowledge collection, no context retrieval needed")
@@ -223,6 +235,17 @@ class RAGAgent:
                 # Only log content preview at debug level
                 content_preview = chunk["content"][:150] + "..." if len(chunk["content"]) > 150 else chunk["content"]
                 logger.debug(f"Content preview for source [{i+1}]: {content_preview}")
+        elif self.collection == "All Collections":
+            logger.info(f"Retrieving context from all collections for query: '{query}'")
+            context = self.vector_store.query_all(query, collections=CONTEXT_COLLECTIONS)
+            logger.info(f"Retrieved {len(context)} chunks from all collections")
+            # Log each chunk with citation number but not full content
+            for i, chunk in enumerate(context):
+                source = chunk["metadata"].get("source", "Unknown")
+                logger.info(f"Source [{i+1}]: {source} (collection: {chunk.get('collection', 'Unknown')})")
+                # Only log content preview at debug level
+                content_preview = chunk["content"][:150] + "..." if len(chunk["content"]) > 150 else chunk["content"]
+                logger.debug(f"Content preview for source [{i+1}]: {content_preview}")
         
         # Generate response using context if available, otherwise use general knowledge
         if context:
@@ -307,7 +330,7 @@ def main():
     parser.add_argument("--query", required=True, help="Query to process")
     parser.add_argument("--store-path", default="chroma_db", help="Path to the vector store")
     parser.add_argument("--use-cot", action="store_true", help="Enable Chain of Thought reasoning")
-    parser.add_argument("--collection", choices=["PDF Collection", "Repository Collection", "General Knowledge"], 
+    parser.add_argument("--collection", choices=["PDF Collection", "Repository Collection", "All Collections", "General Knowledge"], 
                         help="Specify which collection to query")
     parser.add_argument("--skip-analysis", action="store_true", help="Skip query analysis step")
     parser.add_argument("--verbose", action="store_true", help="Show full content of sources")
@@ -4,6 +4,9 @@ import json
 import argparse
 from chromadb.config import Settings
 
+# Collections searched for "All Collections" context
+CONTEXT_COLLECTIONS = ["pdf_documents", "repository_documents", "web_documents"]
+
 class VectorStore:
     def __init__(self, persist_directory: str = "embeddings"):
         """Initialize vector store with ChromaDB"""
@@ -194,6 +197,21 @@ class VectorStore:
         
         print(f"📊 [ChromaDB] Retrieved {len(formatted_results)} chunks from Repository Collection")
         return formatted_results
+    
+    def query_all(self, query: str, collections: List[str] = None, n_results: int = 3) -> List[Dict[str, Any]]:
+        """Query several collections and concatenate the results in collection order"""
+        queries = {
+            "pdf_documents": self.query_pdf_collection,
+            "web_documents": self.query_web_collection,
+            "repository_documents": self.query_repo_collection,
+            "general_knowledge": self.query_general_collection
+        }
+        results = []
+        for collection_name in collections or list(queries):
+            if collection_name not in queries:
+                raise ValueError(f"Unknown collection name: {collection_name}")
+            results.extend(queries[collection_name](query, n_results))
+        return results
 
 def main():
     parser = argparse.ArgumentParser(description="Manage vector store")
@@ -9,11 +9,13 @@ import mimetypes
 import os
 import re
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 from urllib.parse import unquote, urlparse
 
 import oracledb
@@ -52,6 +54,8 @@ TRACE_IDS = (
     "magic-trace-rain-3",
 )
 SKILL_ID = "magic-skill-rainy-evening"
+# Lock key for the unscoped concierge records (traces and guidelines).
+SHARED_SCOPE = "shared"
 
 
 def utc_iso(days_ago: int = 0) -> str:
@@ -74,6 +78,89 @@ def result_to_dict(result: Any) -> dict[str, Any]:
     }
 
 
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else default
+
+
+class ReadWriteLock:
+    """Many concurrent readers or one writer; waiting writers block new readers."""
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+
+class GuestLocks:
+    """Read/write locks keyed by guest id or shared scope.
+
+    Work on one guest no longer waits for another guest, and searches of the
+    same guest run side by side. Keys are always taken in sorted order so
+    operations spanning several scopes cannot deadlock.
+    """
+
+    def __init__(self) -> None:
+        self._locks: dict[str, ReadWriteLock] = {}
+        self._guard = threading.Lock()
+
+    def _lock(self, key: str) -> ReadWriteLock:
+        with self._guard:
+            return self._locks.setdefault(key, ReadWriteLock())
+
+    @contextmanager
+    def read(self, *keys: str) -> Iterator[None]:
+        locks = [self._lock(key) for key in sorted(set(keys))]
+        acquired: list[ReadWriteLock] = []
+        try:
+            for lock in locks:
+                lock.acquire_read()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release_read()
+
+    @contextmanager
+    def write(self, *keys: str) -> Iterator[None]:
+        locks = [self._lock(key) for key in sorted(set(keys))]
+        acquired: list[ReadWriteLock] = []
+        try:
+            for lock in locks:
+                lock.acquire_write()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release_write()
+
+
 class MagicMemoryService:
     """Scenario operations expressed through Oracle AI Agent Memory 26.6."""
 
@@ -88,9 +175,11 @@ class MagicMemoryService:
             config_dir=wallet,
             wallet_location=wallet,
             wallet_password=wallet_password,
-            min=1,
-            max=4,
-            increment=1,
+            min=env_int("MEMORY_DB_POOL_MIN", 1),
+            max=env_int("MEMORY_DB_POOL_MAX", 8),
+            increment=env_int("MEMORY_DB_POOL_INCREMENT", 1),
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=1000 * env_int("MEMORY_DB_POOL_TIMEOUT_SECONDS", 30),
         )
         self.memory = OracleAgentMemory(
             connection=self.pool,
@@ -111,7 +200,9 @@ class MagicMemoryService:
         self.ar = ArExperienceService(self.pool, self.memory)
         self.deep_security = DeepDataSecurityService()
         self.inspector = DatabaseInspector(self.pool)
-        self.lock = threading.RLock()
+        self.locks = GuestLocks()
+        # Guards the small in-process demo state below, never SDK calls.
+        self.state_lock = threading.Lock()
         self.last_context: dict[str, Any] | None = None
         self.last_next_day: dict[str, Any] | None = None
         self.events: list[dict[str, Any]] = []
@@ -151,7 +242,7 @@ class MagicMemoryService:
         }
 
     def reset(self) -> dict[str, Any]:
-        with self.lock:
+        with self.locks.write(AVA_ID, SHARED_SCOPE):
             try:
                 self.memory.delete_thread(AVA_THREAD_ID)
             except Exception:
@@ -161,14 +252,15 @@ class MagicMemoryService:
                     self.memory.delete_memory(record_id)
                 except Exception:
                     pass
-            self.last_context = None
-            self.last_next_day = None
-            self.events = [
-                {
-                    "stage": "reset",
-                    "detail": "Deleted the deterministic demo thread and shared records through the SDK.",
-                }
-            ]
+            with self.state_lock:
+                self.last_context = None
+                self.last_next_day = None
+                self.events = [
+                    {
+                        "stage": "reset",
+                        "detail": "Deleted the deterministic demo thread and shared records through the SDK.",
+                    }
+                ]
             return {
                 "stage": "reset",
                 "message": (
@@ -178,7 +270,7 @@ class MagicMemoryService:
             }
 
     def retain(self) -> dict[str, Any]:
-        with self.lock:
+        with self.locks.write(AVA_ID, SHARED_SCOPE):
             try:
                 self.memory.delete_thread(AVA_THREAD_ID)
             except Exception:
@@ -299,7 +391,7 @@ class MagicMemoryService:
                         "deidentification_method": "synthetic-generalized-demo-trace",
                     },
                 )
-            self.events.append(
+            self._record_event(
                 {
                     "stage": "retain",
                     "detail": (
@@ -317,11 +409,13 @@ class MagicMemoryService:
             }
 
     def recall(self) -> dict[str, Any]:
-        with self.lock:
+        with self.locks.read(AVA_ID):
             results = self._search_ava()
             memories = [result_to_dict(result) for result in results]
-            self.last_context = self._context_from_memories(memories)
-            self.events.append(
+            context = self._context_from_memories(memories)
+            with self.state_lock:
+                self.last_context = context
+            self._record_event(
                 {
                     "stage": "recall",
                     "detail": (
@@ -336,11 +430,11 @@ class MagicMemoryService:
                     f"Oracle AI Agent Memory returned {len(memories)} "
                     "eligible records and the app built a compact context card."
                 ),
-                "contextCard": self.last_context,
+                "contextCard": context,
             }
 
     def correct(self) -> dict[str, Any]:
-        with self.lock:
+        with self.locks.write(AVA_ID):
             self.memory.update_memory(
                 AVA_MEMORY_IDS[2],
                 content=(
@@ -354,10 +448,12 @@ class MagicMemoryService:
                     "guest_confirmed": True,
                 },
             )
-            self.last_context = self._context_from_memories(
+            context = self._context_from_memories(
                 [result_to_dict(result) for result in self._search_ava()]
             )
-            self.events.append(
+            with self.state_lock:
+                self.last_context = context
+            self._record_event(
                 {
                     "stage": "refine",
                     "detail": (
@@ -375,7 +471,7 @@ class MagicMemoryService:
             }
 
     def expire(self) -> dict[str, Any]:
-        with self.lock:
+        with self.locks.write(AVA_ID):
             try:
                 self.memory.update_memory(
                     AVA_MEMORY_IDS[4],
@@ -393,10 +489,12 @@ class MagicMemoryService:
                 # read. A deliberately expired update is therefore persisted but
                 # the post-update read reports that no active memory was found.
                 pass
-            self.last_context = self._context_from_memories(
+            context = self._context_from_memories(
                 [result_to_dict(result) for result in self._search_ava()]
             )
-            self.events.append(
+            with self.state_lock:
+                self.last_context = context
+            self._record_event(
                 {
                     "stage": "expire",
                     "detail": (
@@ -414,7 +512,7 @@ class MagicMemoryService:
             }
 
     def dream(self) -> dict[str, Any]:
-        with self.lock:
+        with self.locks.write(SHARED_SCOPE):
             traces = self._shared_search(
                 "Rain",
                 record_types=["memory"],
@@ -455,7 +553,7 @@ class MagicMemoryService:
                     "privacy_review": "required-before-sharing",
                 },
             )
-            self.events.append(
+            self._record_event(
                 {
                     "stage": "dream",
                     "detail": (
@@ -474,7 +572,7 @@ class MagicMemoryService:
             }
 
     def approve(self) -> dict[str, Any]:
-        with self.lock:
+        with self.locks.write(SHARED_SCOPE):
             approver = "AVA"
             deep_sec_enforced = self.deep_security.approve_guideline(approver)
             if not deep_sec_enforced:
@@ -489,7 +587,7 @@ class MagicMemoryService:
                         "approved_at": utc_iso(),
                     },
                 )
-            self.events.append(
+            self._record_event(
                 {
                     "stage": "approve",
                     "detail": (
@@ -514,7 +612,7 @@ class MagicMemoryService:
             }
 
     def next_day(self) -> dict[str, Any]:
-        with self.lock:
+        with self.locks.read(LEO_ID, SHARED_SCOPE):
             private_results = self.memory.search(
                 "quiet breakfast mobility lantern fireworks previous visit",
                 scope=SearchScope(
@@ -542,7 +640,7 @@ class MagicMemoryService:
                 {},
             )
             database_leak_count = leo_identity.get("avaPrivateRows")
-            self.events.append(
+            self._record_event(
                 {
                     "stage": "next-day",
                     "detail": (
@@ -554,7 +652,7 @@ class MagicMemoryService:
                     ),
                 }
             )
-            self.last_next_day = {
+            next_day = {
                 "stage": "next-day",
                 "guestId": LEO_ID,
                 "privateAvaMemoriesVisible": (
@@ -574,10 +672,12 @@ class MagicMemoryService:
                     "user-scoped memory remains unavailable."
                 ),
             }
-            return self.last_next_day
+            with self.state_lock:
+                self.last_next_day = next_day
+            return next_day
 
     def state(self) -> dict[str, Any]:
-        with self.lock:
+        with self.locks.read(AVA_ID, SHARED_SCOPE):
             ava_memories = self._search_ava(max_results=20)
             traces = self._shared_search(
                 "Rain",
@@ -589,16 +689,24 @@ class MagicMemoryService:
                 record_types=["guideline"],
                 metadata_filter={"kind": "procedural"},
             )
+            with self.state_lock:
+                events = list(self.events)
+                context = self.last_context
+                next_day = self.last_next_day
             return {
                 "memories": [result_to_dict(item) for item in ava_memories],
                 "traces": [result_to_dict(item) for item in traces],
                 "skills": [result_to_dict(item) for item in skills],
-                "contextCard": self.last_context,
-                "events": self.events,
-                "latestStage": self.events[-1] if self.events else None,
-                "nextDay": self.last_next_day,
+                "contextCard": context,
+                "events": events,
+                "latestStage": events[-1] if events else None,
+                "nextDay": next_day,
             }
 
+    def _record_event(self, event: dict[str, str]) -> None:
+        with self.state_lock:
+            self.events.append(event)
+
     def _add_ava_memory(
         self,
         memory_id: str,
@@ -867,10 +975,49 @@ class MagicRequestHandler(BaseHTTPRequestHandler):
             self.send_header("Access-Control-Allow-Origin", allowed)
 
 
+class WorkerPoolHTTPServer(ThreadingHTTPServer):
+    """Serve connections on a fixed worker pool instead of a thread each.
+
+    Size the pool a little above ``MEMORY_DB_POOL_MAX`` so workers queue for
+    database sessions rather than piling up unbounded threads under load.
+    """
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+        workers: int,
+    ) -> None:
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="memory-http"
+        )
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_server(port: int) -> ThreadingHTTPServer:
+    """Build the HTTP server selected by MEMORY_SERVER_MODE (pool or threading)."""
+    mode = os.environ.get("MEMORY_SERVER_MODE", "pool").strip().lower()
+    if mode == "threading":
+        return ThreadingHTTPServer(("127.0.0.1", port), MagicRequestHandler)
+    if mode != "pool":
+        raise ValueError("MEMORY_SERVER_MODE must be pool or threading")
+    workers = env_int(
+        "MEMORY_SERVER_WORKERS", env_int("MEMORY_DB_POOL_MAX", 8) * 2
+    )
+    return WorkerPoolHTTPServer(("127.0.0.1", port), MagicRequestHandler, workers)
+
+
 def main() -> None:
     port = int(os.environ.get("MEMORY_PYTHON_PORT", "8092"))
     service = MagicMemoryService()
-    server = ThreadingHTTPServer(("127.0.0.1", port), MagicRequestHandler)
+    server = create_server(port)
     server.service = service  # type: ignore[attr-defined]
     print(
         "Python Oracle AI Agent Memory demo listening on "
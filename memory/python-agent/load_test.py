@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Concurrent-guest load test for the Python Magic Memory demo.
+
+Start the app with ./run.sh, then in a second terminal:
+
+    python load_test.py --guests 16 --requests 20 --actions recall,retain
+
+Each simulated guest sends its share of requests to /api/actions/<action>,
+cycling through the chosen actions, and the harness reports per-action p50 and
+p99 latency and throughput. The demo actions are bound to the demo's guests,
+not to the caller: recall, retain, correct and expire all act on Ava, and only
+next-day reads as Leo. So every "guest" here is really another client of Ava's
+memory: recalls share her read lock while retains serialize on it. Add
+next-day to --actions to mix in Leo's reads. retain rewrites Ava's demo
+thread, so run /api/actions/reset or the browser's reset afterwards if you
+need a clean demo.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+
+
+def post(base_url: str, action: str, timeout: float) -> tuple[str, float, bool]:
+    request = Request(
+        f"{base_url}/api/actions/{action}",
+        data=b"{}",
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    start = time.perf_counter()
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            json.load(response)
+            ok = True
+    except (OSError, http.client.HTTPException, ValueError):
+        # OSError covers HTTP/URL errors, timeouts and dropped connections;
+        # ValueError covers bodies that are not JSON
+        ok = False
+    return action, (time.perf_counter() - start) * 1000, ok
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def guest(base_url: str, actions: list[str], requests: int, timeout: float) -> list[tuple[str, float, bool]]:
+    return [post(base_url, actions[index % len(actions)], timeout) for index in range(requests)]
+
+
+def report(results: list[tuple[str, float, bool]], elapsed: float) -> int:
+    print(f"{'action':<10} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    failures = 0
+    for action in sorted({result[0] for result in results}):
+        latencies = [latency for name, latency, ok in results if name == action and ok]
+        errors = sum(1 for name, _, ok in results if name == action and not ok)
+        failures += errors
+        if not latencies:
+            print(f"{action:<10} {errors:>6} {errors:>6} {'-':>9} {'-':>9} {'-':>9}")
+            continue
+        print(
+            f"{action:<10} {len(latencies) + errors:>6} {errors:>6} "
+            f"{percentile(latencies, 0.50):>9.1f} {percentile(latencies, 0.99):>9.1f} "
+            f"{statistics.mean(latencies):>9.1f}"
+        )
+    print(f"\n{len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:.1f} req/s)")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8092")
+    parser.add_argument("--guests", type=int, default=8, help="Concurrent simulated guests")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per guest")
+    parser.add_argument("--actions", default="recall,retain", help="Comma-separated demo actions")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip("/")
+    actions = [action.strip() for action in args.actions.split(",") if action.strip()]
+    # Seed Ava's memories so early recalls have something to return.
+    if "recall" in actions:
+        post(base_url, "retain", args.timeout)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.guests) as executor:
+        futures = [
+            # Stagger the action order so guests do not all retain at once.
+            executor.submit(guest, base_url, actions[index % len(actions):] + actions[: index % len(actions)],
+                            args.requests, args.timeout)
+            for index in range(args.guests)
+        ]
+        results = [result for future in futures for result in future.result()]
+    return 1 if report(results, time.perf_counter() - start) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,12 @@
 import sys
+import threading
 import unittest
 from pathlib import Path
 
 APP_DIR = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(APP_DIR))
 
-from app import MagicMemoryService, result_to_dict, utc_iso  # noqa: E402
+from app import GuestLocks, MagicMemoryService, result_to_dict, utc_iso  # noqa: E402
 from ar import ArExperienceService  # noqa: E402
 
 
@@ -71,6 +72,40 @@ class HelpersTest(unittest.TestCase):
         email.content = "Email ava@example.com after the covered route."
         self.assertFalse(MagicMemoryService._trace_is_shareable(email))
 
+    def test_guest_locks_share_reads_and_isolate_guests(self):
+        locks = GuestLocks()
+        with locks.read("AVA"):
+            entered = threading.Event()
+
+            def reader():
+                with locks.read("AVA"):
+                    entered.set()
+
+            thread = threading.Thread(target=reader)
+            thread.start()
+            self.assertTrue(entered.wait(1))
+            thread.join()
+
+        with locks.write("AVA"):
+            other_guest = threading.Event()
+            same_guest = threading.Event()
+
+            def leo_writer():
+                with locks.write("LEO"):
+                    other_guest.set()
+
+            def ava_reader():
+                with locks.read("AVA"):
+                    same_guest.set()
+
+            threads = [threading.Thread(target=leo_writer), threading.Thread(target=ava_reader)]
+            for thread in threads:
+                thread.start()
+            self.assertTrue(other_guest.wait(1))
+            self.assertFalse(same_guest.wait(0.1))
+        threads[1].join(1)
+        self.assertTrue(same_guest.is_set())
+
 
 if __name__ == "__main__":
     unittest.main()
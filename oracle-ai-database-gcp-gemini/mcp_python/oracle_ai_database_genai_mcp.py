@@ -13,172 +13,80 @@ import vertexai
 from vertexai.generative_models import GenerativeModel, Tool, FunctionDeclaration, Part
 from typing import Dict, Any, Optional
 
+from mcp_session_pool import MCPSessionError, MCPSessionPool, tool_result_text
+
 # Load environment variables from parent directory
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 class MCPClient:
-    """Manual MCP client using JSON-RPC over stdio"""
+    """MCP client using JSON-RPC over stdio, backed by a pool of SQLcl sessions
+
+    Sessions are started and initialized up front, requests are pipelined and
+    matched to responses by id, so independent tool calls overlap instead of
+    queueing behind one another.
+    """
     
-    def __init__(self, sqlcl_path: str, wallet_path: str):
+    def __init__(self, sqlcl_path: str, wallet_path: str,
+                 pool_size: int = None, max_pool_size: int = None, max_in_flight: int = None):
         self.sqlcl_path = sqlcl_path
         self.wallet_path = wallet_path
-        self.process = None
-        self.message_id = 0
+        self.pool_size = pool_size or int(os.getenv("SQLCL_MCP_POOL_SIZE", "1"))
+        self.max_pool_size = max(self.pool_size, max_pool_size or int(os.getenv("SQLCL_MCP_MAX_POOL_SIZE", "3")))
+        self.max_in_flight = max_in_flight or int(os.getenv("SQLCL_MCP_MAX_IN_FLIGHT", "4"))
+        self.pool = None
         self.initialized = False
         
     async def start(self):
-        """Start the MCP server process"""
+        """Start and initialize the pooled MCP server processes"""
         try:
-            print(f"  → Starting SQLcl MCP server: {self.sqlcl_path}")
-            
-            # Set up environment
-            env = os.environ.copy()
-            env['TNS_ADMIN'] = self.wallet_path
+            print(f"  → Starting SQLcl MCP server pool: {self.sqlcl_path} "
+                  f"({self.pool_size} warm, up to {self.max_pool_size})")
             
-            # Start SQLcl in MCP mode
-            self.process = await asyncio.create_subprocess_exec(
-                self.sqlcl_path,
-                "-mcp",
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
+            self.pool = MCPSessionPool(
+                [self.sqlcl_path, "-mcp"],
+                env={"TNS_ADMIN": self.wallet_path},
+                min_size=self.pool_size,
+                max_size=self.max_pool_size,
+                max_in_flight=self.max_in_flight,
+                client_name="oracle-genai-mcp-client",
             )
-            
-            # Initialize MCP session
-            await self._initialize()
+            await self.pool.start()
+            self.initialized = True
             
             print("  ✓ MCP server started and initialized")
             
         except Exception as e:
+            if self.pool:
+                await self.pool.close()
+                self.pool = None
             raise RuntimeError(f"Failed to start MCP server: {e}")
     
-    async def _initialize(self):
-        """Initialize MCP protocol"""
-        try:
-            # Send initialize request
-            init_request = {
-                "jsonrpc": "2.0",
-                "id": self._next_id(),
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {
-                        "name": "oracle-genai-mcp-client",
-                        "version": "1.0.0"
-                    }
-                }
-            }
-            
-            response = await self._send_request(init_request)
-            
-            if "error" in response:
-                raise RuntimeError(f"Initialize failed: {response['error']}")
-            
-            # Send initialized notification
-            initialized_notification = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized"
-            }
-            
-            await self._send_notification(initialized_notification)
-            
-            self.initialized = True
-            
-        except Exception as e:
-            raise RuntimeError(f"MCP initialization failed: {e}")
-    
-    def _next_id(self) -> int:
-        """Get next message ID"""
-        self.message_id += 1
-        return self.message_id
-    
-    async def _send_request(self, request: dict, timeout: float = 30.0) -> dict:
-        """Send JSON-RPC request and wait for response"""
-        if not self.process or not self.process.stdin:
-            raise RuntimeError("MCP server not started")
-        
-        try:
-            # Send request
-            request_line = json.dumps(request) + "\n"
-            self.process.stdin.write(request_line.encode())
-            await self.process.stdin.drain()
-            
-            # Read response with timeout
-            response_line = await asyncio.wait_for(
-                self.process.stdout.readline(),
-                timeout=timeout
-            )
-            
-            if not response_line:
-                raise RuntimeError("MCP server closed connection")
-            
-            response = json.loads(response_line.decode())
-            return response
-            
-        except asyncio.TimeoutError:
-            raise RuntimeError(f"MCP request timed out after {timeout}s")
-        except Exception as e:
-            raise RuntimeError(f"MCP request failed: {e}")
-    
-    async def _send_notification(self, notification: dict):
-        """Send JSON-RPC notification (no response expected)"""
-        if not self.process or not self.process.stdin:
-            raise RuntimeError("MCP server not started")
-        
-        notification_line = json.dumps(notification) + "\n"
-        self.process.stdin.write(notification_line.encode())
-        await self.process.stdin.drain()
-    
     async def list_tools(self) -> list:
         """List available MCP tools"""
-        request = {
-            "jsonrpc": "2.0",
-            "id": self._next_id(),
-            "method": "tools/list"
-        }
-        
-        response = await self._send_request(request)
-        
-        if "error" in response:
-            raise RuntimeError(f"Failed to list tools: {response['error']}")
-        
-        return response.get("result", {}).get("tools", [])
+        if not self.pool:
+            raise RuntimeError("MCP server not started")
+        try:
+            return await self.pool.list_tools()
+        except MCPSessionError as e:
+            raise RuntimeError(f"Failed to list tools: {e}")
     
     async def call_tool(self, tool_name: str, arguments: dict) -> Any:
         """Call an MCP tool"""
-        request = {
-            "jsonrpc": "2.0",
-            "id": self._next_id(),
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-        
-        response = await self._send_request(request, timeout=60.0)
-        
-        if "error" in response:
-            raise RuntimeError(f"Tool call failed: {response['error']}")
-        
-        result = response.get("result", {})
+        if not self.pool:
+            raise RuntimeError("MCP server not started")
+        try:
+            result = await self.pool.call_tool(tool_name, arguments, timeout=60.0)
+        except MCPSessionError as e:
+            raise RuntimeError(f"Tool call failed: {e}")
         
         # Extract content from MCP response
-        if "content" in result:
-            content_items = result["content"]
-            if isinstance(content_items, list) and len(content_items) > 0:
-                return content_items[0].get("text", "")
-        
-        return str(result)
+        return tool_result_text(result)
     
     async def stop(self):
-        """Stop the MCP server"""
-        if self.process:
-            self.process.terminate()
-            await self.process.wait()
-            self.process = None
+        """Stop the MCP server pool"""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
             self.initialized = False
 
 
@@ -407,30 +315,38 @@ Be helpful, technically accurate, and AUTONOMOUS - don't make users specify conn
             max_iterations = 10  # More iterations for multi-step MCP workflows
             iteration = 0
 
-            def _find_function_call(resp):
-                """Find the first function_call across all parts."""
-                for part in resp.candidates[0].content.parts:
-                    if part.function_call and part.function_call.name:
-                        return part.function_call
-                return None
+            def _find_function_calls(resp):
+                """Find all function_calls across all parts."""
+                return [
+                    part.function_call for part in resp.candidates[0].content.parts
+                    if part.function_call and part.function_call.name
+                ]
 
-            fc = _find_function_call(response)
-            while fc and iteration < max_iterations:
+            fcs = _find_function_calls(response)
+            while fcs and iteration < max_iterations:
                 iteration += 1
-                function_name = fc.name
-                function_args = dict(fc.args)
 
-                # Execute the function (async for MCP calls)
-                function_response = await self.execute_function_call(function_name, function_args)
+                # Execute the functions concurrently (parallel calls share the MCP session pool),
+                # but in order when the turn switches connections, so e.g. a run_sql after a
+                # connect in the same turn runs against the newly connected database
+                if any(fc.name in ("mcp_connect", "mcp_disconnect") for fc in fcs):
+                    function_responses = [
+                        await self.execute_function_call(fc.name, dict(fc.args)) for fc in fcs
+                    ]
+                else:
+                    function_responses = await asyncio.gather(*(
+                        self.execute_function_call(fc.name, dict(fc.args)) for fc in fcs
+                    ))
 
-                # Send function response back to model
-                response = chat.send_message(
+                # Send function responses back to model
+                response = chat.send_message([
                     Part.from_function_response(
-                        name=function_name,
+                        name=fc.name,
                         response={"result": function_response}
                     )
-                )
-                fc = _find_function_call(response)
+                    for fc, function_response in zip(fcs, function_responses)
+                ])
+                fcs = _find_function_calls(response)
 
             # Extract text from potentially multi-part response
             # (Gemini 2.5 may return text + function_call in one response)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Any, Mapping
+from typing import Any, AsyncIterator, Iterable, Mapping
 
 import oracledb
 
@@ -29,10 +33,16 @@ except Exception as exc:  # pragma: no cover - handled by deterministic fallback
 APP_NAME = "oracle-inventory-action"
 DEFAULT_MODEL_NAME = "gemini-2.0-flash"
 DEFAULT_PRODUCT_ID = "SKU-500"
+NO_EVIDENCE_STATUS = "no_evidence"
 PRODUCT_ID_PATTERN = re.compile(r"\b([A-Z]{2,}-\d+)\b")
 TRUTHY_VALUES = {"1", "true", "yes", "on"}
+DEFAULT_DB_POOL_MIN = 1
+DEFAULT_DB_POOL_MAX = 4
+DEFAULT_DB_POOL_TIMEOUT_SECONDS = 10
+DEFAULT_EVIDENCE_CACHE_TTL_SECONDS = 30
+DEFAULT_BATCH_SIZE = 200
 
-DATABASE_GRAPH_QUERY = """
+GRAPH_PATH_CTE = """
 WITH dependency_path AS (
     SELECT
         supplier_name,
@@ -59,8 +69,7 @@ WITH dependency_path AS (
                             -[e2 IS ships_via]-> (po IS port)
                             -[e3 IS routes_to]-> (w IS warehouse)
                             -[e4 IS stocks]-> (pr IS product)
-        WHERE pr.product_id = :product_id
-          AND s.active_flag = 'Y'
+        WHERE s.active_flag = 'Y'
           AND p.active_flag = 'Y'
           AND po.active_flag = 'Y'
           AND w.active_flag = 'Y'
@@ -68,7 +77,7 @@ WITH dependency_path AS (
           AND e1.is_current = 'Y'
           AND e2.is_current = 'Y'
           AND e3.is_current = 'Y'
-          AND e4.is_current = 'Y'
+          AND e4.is_current = 'Y'{product_predicate}
         COLUMNS (
             s.supplier_name AS supplier_name,
             s.tier_level AS tier_level,
@@ -90,7 +99,11 @@ WITH dependency_path AS (
         )
     )
 )
-SELECT
+"""
+
+DATABASE_GRAPH_QUERY = GRAPH_PATH_CTE.format(
+    product_predicate="\n          AND pr.product_id = :product_id"
+) + """SELECT
     dp.supplier_name,
     dp.tier_level,
     dp.supplier_region,
@@ -120,7 +133,51 @@ LEFT JOIN sc_alerts a
 FETCH FIRST 1 ROW ONLY
 """
 
-HOTSPOT_QUERY = """
+# Batch variant: one path per product, preferring the highest-risk alert.
+DATABASE_GRAPH_BATCH_QUERY = GRAPH_PATH_CTE.format(product_predicate="") + """, ranked_path AS (
+    SELECT
+        dp.*,
+        a.alert_name,
+        a.lane_name,
+        a.risk_score AS alert_risk,
+        ROW_NUMBER() OVER (
+            PARTITION BY dp.product_id
+            ORDER BY a.risk_score DESC NULLS LAST
+        ) AS path_rank
+    FROM dependency_path dp
+    LEFT JOIN sc_alert_port ap
+      ON ap.port_id = dp.port_id
+     AND ap.is_current = 'Y'
+    LEFT JOIN sc_alerts a
+      ON a.alert_id = ap.alert_id
+     AND a.active_flag = 'Y'
+    WHERE dp.product_id IN (SELECT column_value FROM TABLE(:product_ids))
+)
+SELECT
+    supplier_name,
+    tier_level,
+    supplier_region,
+    on_time_pct,
+    plant_name,
+    cycle_days,
+    utilization_pct,
+    port_name,
+    eta_hours,
+    delay_risk_score,
+    warehouse_name,
+    inventory_units,
+    fill_rate_pct,
+    product_id,
+    demand_change_pct,
+    margin_pct,
+    alert_name,
+    lane_name,
+    alert_risk
+FROM ranked_path
+WHERE path_rank = 1
+"""
+
+HOTSPOT_QUERY_TEMPLATE = """
 SELECT
     summary.product_id,
     product.product_name,
@@ -156,11 +213,16 @@ JOIN sc_warehouses warehouse
   ON warehouse.warehouse_id = snapshot.warehouse_id
 JOIN sc_warehouse_geo geo
   ON geo.warehouse_id = snapshot.warehouse_id
-WHERE summary.product_id = :product_id
+WHERE {product_predicate}
   AND summary.active_flag = 'Y'
-ORDER BY snapshot.hotspot_rank
+ORDER BY summary.product_id, snapshot.hotspot_rank
 """
 
+HOTSPOT_QUERY = HOTSPOT_QUERY_TEMPLATE.format(product_predicate="summary.product_id = :product_id")
+HOTSPOT_BATCH_QUERY = HOTSPOT_QUERY_TEMPLATE.format(
+    product_predicate="summary.product_id IN (SELECT column_value FROM TABLE(:product_ids))"
+)
+
 
 @dataclass(frozen=True)
 class GraphSnapshot:
@@ -237,6 +299,15 @@ class ExternalSignal:
     recommended_lead_time_action: str
 
 
+@dataclass(frozen=True)
+class EvidenceFetch:
+    """Graph and spatial snapshot queries for one product, running concurrently."""
+
+    graph: Future
+    spatial: Future
+    expires_at: float
+
+
 @dataclass
 class InventoryActionResult:
     response_text: str
@@ -244,6 +315,8 @@ class InventoryActionResult:
     orchestration_mode: str
     draft_action: dict[str, Any] = field(default_factory=dict)
     policy_result: dict[str, Any] = field(default_factory=dict)
+    product_id: str = ""
+    priority_score: float = 0.0
 
 
 SEEDED_GRAPH_SNAPSHOTS: dict[str, GraphSnapshot] = {
@@ -546,6 +619,15 @@ def truthy(value: str | None) -> bool:
     return str(value or "").strip().lower() in TRUTHY_VALUES
 
 
+def no_evidence(product_id: str, detail: str) -> dict[str, Any]:
+    return {
+        "status": NO_EVIDENCE_STATUS,
+        "productId": product_id,
+        "sourceMode": "none",
+        "sourceDetail": detail,
+    }
+
+
 def normalize_product_id(product_id: str | None) -> str:
     normalized = first_non_blank(product_id, DEFAULT_PRODUCT_ID).upper()
     return normalized or DEFAULT_PRODUCT_ID
@@ -562,6 +644,10 @@ def extract_product_id(user_input: str | None) -> str:
     return DEFAULT_PRODUCT_ID
 
 
+def extract_product_ids(user_input: str | None) -> list[str]:
+    return list(dict.fromkeys(PRODUCT_ID_PATTERN.findall((user_input or "").upper())))
+
+
 def string_value(value: Any) -> str:
     return "" if value is None else str(value)
 
@@ -687,30 +773,145 @@ def external_signal_for(product_id: str) -> ExternalSignal:
     )
 
 
+def graph_snapshot_from_record(record: Mapping[str, Any], product_id: str) -> GraphSnapshot:
+    return GraphSnapshot(
+        supplier_name=string_value(record.get("supplier_name")),
+        tier_level=record.get("tier_level"),
+        supplier_region=string_value(record.get("supplier_region")),
+        on_time_pct=record.get("on_time_pct"),
+        plant_name=string_value(record.get("plant_name")),
+        cycle_days=record.get("cycle_days"),
+        utilization_pct=record.get("utilization_pct"),
+        port_name=string_value(record.get("port_name")),
+        eta_hours=record.get("eta_hours"),
+        delay_risk_score=record.get("delay_risk_score"),
+        warehouse_name=string_value(record.get("warehouse_name")),
+        inventory_units=record.get("inventory_units"),
+        fill_rate_pct=record.get("fill_rate_pct"),
+        product_id=product_id,
+        demand_change_pct=record.get("demand_change_pct"),
+        margin_pct=record.get("margin_pct"),
+        alert_name=string_value(record.get("alert_name")),
+        lane_name=string_value(record.get("lane_name")),
+        alert_risk=record.get("alert_risk"),
+    )
+
+
+def spatial_snapshot_from_records(records: list[Mapping[str, Any]], product_id: str) -> SpatialSnapshot:
+    first = records[0]
+    summary = InventoryRiskSummary(
+        product_id=string_value(first.get("product_id")),
+        product_name=string_value(first.get("product_name")),
+        quarter_label=string_value(first.get("quarter_label")),
+        risk_level=string_value(first.get("overall_risk_level")),
+        stockout_probability=float(first.get("stockout_probability") or 0),
+        projected_revenue_impact_usd=float(first.get("projected_revenue_impact_usd") or 0),
+        primary_region=string_value(first.get("primary_region")),
+        recommendation_summary=string_value(first.get("recommendation_summary")),
+    )
+    hotspots = [
+        WarehouseHotspot(
+            product_id=string_value(record.get("product_id")),
+            warehouse_id=int_value(record.get("warehouse_id"), 0),
+            warehouse_code=string_value(record.get("warehouse_code")),
+            warehouse_name=string_value(record.get("warehouse_name")),
+            county_name=string_value(record.get("county_name")),
+            state_code=string_value(record.get("state_code")),
+            region_name=string_value(record.get("region_name")),
+            latitude=float(record.get("latitude") or 0),
+            longitude=float(record.get("longitude") or 0),
+            hotspot_rank=int_value(record.get("hotspot_rank"), 0),
+            hotspot_score=float(record.get("hotspot_score") or 0),
+            coverage_days=float(record.get("coverage_days") or 0),
+            backlog_units=int_value(record.get("backlog_units"), 0),
+            service_level_pct=float(record.get("service_level_pct") or 0),
+            at_risk_units=int_value(record.get("at_risk_units"), 0),
+            revenue_impact_usd=float(record.get("revenue_impact_usd") or 0),
+            risk_level=string_value(record.get("warehouse_risk_level")),
+            recommended_role=string_value(record.get("recommended_role")),
+        )
+        for record in records
+    ]
+    hotspots.sort(key=lambda hotspot: hotspot.hotspot_rank)
+    return SpatialSnapshot(
+        product_id=product_id,
+        summary=summary,
+        hotspots=hotspots,
+        source_mode="database",
+        source_detail="Oracle warehouse hotspot tables",
+        summary_text=build_summary_text(summary, hotspots),
+    )
+
+
+_CONNECTION_POOLS: dict[tuple[str, ...], oracledb.ConnectionPool] = {}
+_CONNECTION_POOLS_LOCK = threading.Lock()
+_EVIDENCE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="inventory-evidence")
+
+
+def connection_pool(environment: Mapping[str, str]) -> oracledb.ConnectionPool:
+    """Return the process-wide pool for the configured database, creating it once.
+
+    The wallet TLS handshake happens when pooled connections are created, so
+    tool calls reuse warm sessions instead of connecting on every lookup.
+    """
+    username = first_non_blank(environment.get("DB_USERNAME"))
+    password = first_non_blank(environment.get("DB_PASSWORD"))
+    dsn = first_non_blank(environment.get("DB_DSN"))
+    wallet_password = first_non_blank(environment.get("DB_WALLET_PASSWORD"))
+    tns_admin = first_non_blank(
+        environment.get("TNS_ADMIN"),
+        environment.get("DB_WALLET_DIR"),
+    )
+    if not username or not password or not dsn:
+        raise ValueError("DB_USERNAME, DB_PASSWORD, and DB_DSN must be configured for database access.")
+    if not tns_admin:
+        raise ValueError("TNS_ADMIN or DB_WALLET_DIR must be configured for database access.")
+
+    key = (username, password, dsn, tns_admin, wallet_password)
+    with _CONNECTION_POOLS_LOCK:
+        pool = _CONNECTION_POOLS.get(key)
+        if pool is None:
+            pool_max = max(1, int_value(environment.get("ACTION_DB_POOL_MAX"), DEFAULT_DB_POOL_MAX))
+            pool = oracledb.create_pool(
+                user=username,
+                password=password,
+                dsn=dsn,
+                config_dir=tns_admin,
+                wallet_location=tns_admin,
+                wallet_password=wallet_password or None,
+                ssl_server_dn_match=False,
+                min=min(pool_max, int_value(environment.get("ACTION_DB_POOL_MIN"), DEFAULT_DB_POOL_MIN)),
+                max=pool_max,
+                increment=1,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=1000 * int_value(
+                    environment.get("ACTION_DB_POOL_TIMEOUT_SECONDS"),
+                    DEFAULT_DB_POOL_TIMEOUT_SECONDS,
+                ),
+            )
+            _CONNECTION_POOLS[key] = pool
+        return pool
+
+
 class InventoryActionTools:
     def __init__(self, environment: Mapping[str, str] | None = None):
         self.environment = dict(environment or os.environ)
+        self.evidence_cache_ttl_seconds = max(
+            0,
+            int_value(
+                self.environment.get("ACTION_EVIDENCE_CACHE_TTL_SECONDS"),
+                DEFAULT_EVIDENCE_CACHE_TTL_SECONDS,
+            ),
+        )
+        self._evidence: dict[str, EvidenceFetch] = {}
+        self._evidence_lock = threading.Lock()
 
     def getGraphEvidence(self, productId: str) -> dict[str, Any]:
         """Look up supply-chain dependency evidence for a product and summarize the path and alert."""
         normalized_product_id = normalize_product_id(productId)
         try:
             snapshot, source_mode, source_detail = self._resolve_graph_snapshot(normalized_product_id)
-            nodes = self._graph_nodes_for(snapshot, normalized_product_id)
-            alert_node = first_node_of_type(nodes, "ALERT")
-            warehouse_node = first_node_of_type(nodes, "WAREHOUSE")
-            return {
-                "status": "ok",
-                "productId": normalized_product_id,
-                "dependencyPath": dependency_path(nodes),
-                "warehouse": warehouse_node.get("label", "Warehouse unavailable"),
-                "warehouseMetric": warehouse_node.get("metric", ""),
-                "activeAlert": alert_node.get("label", "Alert unavailable"),
-                "alertDetail": alert_node.get("detail", ""),
-                "alertMetric": alert_node.get("metric", ""),
-                "sourceMode": source_mode,
-                "sourceDetail": source_detail,
-            }
+            return self._graph_evidence(normalized_product_id, snapshot, source_mode, source_detail)
         except Exception as exc:
             return {
                 "status": "unavailable",
@@ -721,20 +922,7 @@ class InventoryActionTools:
     def getSpatialEvidence(self, productId: str) -> dict[str, Any]:
         """Return hotspot evidence and a suggested source and destination warehouse."""
         normalized_product_id = normalize_product_id(productId)
-        snapshot = self._resolve_spatial_snapshot(normalized_product_id)
-        destination = pick_destination_hotspot(snapshot.hotspots)
-        source = pick_source_hotspot(snapshot.hotspots)
-        return {
-            "status": "ok",
-            "productId": snapshot.product_id,
-            "hotspotRegion": snapshot.summary.primary_region,
-            "hotspotSummary": snapshot.summary_text,
-            "recommendedSourceWarehouse": f"Warehouse: {source.warehouse_name}",
-            "recommendedDestinationWarehouse": f"Warehouse: {destination.warehouse_name}",
-            "suggestedTransferUnits": 500,
-            "coverageRiskDays": destination.coverage_days,
-            "sourceDetail": snapshot.source_detail,
-        }
+        return self._spatial_evidence(self._resolve_spatial_snapshot(normalized_product_id))
 
     def getExternalSignals(self, productId: str) -> dict[str, Any]:
         """Return seeded outside-risk context that can change the timing or urgency of an action."""
@@ -805,18 +993,121 @@ class InventoryActionTools:
             "approvalState": "PENDING_APPROVAL" if normalized_units >= 400 else "STANDARD_REVIEW",
         }
 
+    def collect_evidence(self, product_ids: list[str]) -> dict[str, tuple[dict[str, Any], dict[str, Any]]]:
+        """Graph and spatial evidence for many products from two set-based queries.
+
+        Products without database rows, or every product when the database is
+        unavailable, get their own seeded data when there is some. Unlike the
+        single-product tools this never borrows the default product's seeded
+        data: a product with nothing of its own gets ``status: no_evidence``.
+        """
+        graph_snapshots: dict[str, GraphSnapshot] = {}
+        spatial_snapshots: dict[str, SpatialSnapshot] = {}
+        graph_error = ""
+        spatial_error = ""
+        if self._database_is_configured():
+            graph_future = _EVIDENCE_EXECUTOR.submit(self._database_graph_snapshots, product_ids)
+            spatial_future = _EVIDENCE_EXECUTOR.submit(self._database_spatial_snapshots, product_ids)
+            try:
+                graph_snapshots = graph_future.result()
+            except Exception as exc:
+                graph_error = str(exc)
+            try:
+                spatial_snapshots = spatial_future.result()
+            except Exception as exc:
+                spatial_error = str(exc)
+
+        evidence: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {}
+        for product_id in product_ids:
+            if product_id in graph_snapshots:
+                graph_evidence = self._graph_evidence(
+                    product_id,
+                    graph_snapshots[product_id],
+                    "database",
+                    "Oracle Database property graph",
+                )
+            else:
+                error = graph_error or (
+                    f"No Oracle graph path was found for productId {product_id}."
+                    if self._database_is_configured()
+                    else ""
+                )
+                if product_id in SEEDED_GRAPH_SNAPSHOTS:
+                    snapshot, source_mode, source_detail = self._seeded_graph_snapshot(product_id, error)
+                    graph_evidence = self._graph_evidence(product_id, snapshot, source_mode, source_detail)
+                else:
+                    graph_evidence = no_evidence(product_id, error or "No seeded graph data for this product.")
+
+            spatial_snapshot = spatial_snapshots.get(product_id)
+            if spatial_snapshot is not None:
+                spatial_evidence = self._spatial_evidence(spatial_snapshot)
+            else:
+                error = spatial_error or (
+                    f"No spatial hotspot rows were found for productId {product_id}."
+                    if self._database_is_configured()
+                    else ""
+                )
+                if product_id in SEEDED_SUMMARIES and product_id in SEEDED_HOTSPOTS:
+                    spatial_evidence = self._spatial_evidence(self._seeded_spatial_snapshot(product_id, error))
+                else:
+                    spatial_evidence = no_evidence(product_id, error or "No seeded hotspot data for this product.")
+            evidence[product_id] = (graph_evidence, spatial_evidence)
+        return evidence
+
+    def _graph_evidence(
+        self,
+        product_id: str,
+        snapshot: GraphSnapshot,
+        source_mode: str,
+        source_detail: str,
+    ) -> dict[str, Any]:
+        nodes = self._graph_nodes_for(snapshot, product_id)
+        alert_node = first_node_of_type(nodes, "ALERT")
+        warehouse_node = first_node_of_type(nodes, "WAREHOUSE")
+        return {
+            "status": "ok",
+            "productId": product_id,
+            "dependencyPath": dependency_path(nodes),
+            "warehouse": warehouse_node.get("label", "Warehouse unavailable"),
+            "warehouseMetric": warehouse_node.get("metric", ""),
+            "activeAlert": alert_node.get("label", "Alert unavailable"),
+            "alertDetail": alert_node.get("detail", ""),
+            "alertMetric": alert_node.get("metric", ""),
+            "sourceMode": source_mode,
+            "sourceDetail": source_detail,
+        }
+
+    def _spatial_evidence(self, snapshot: SpatialSnapshot) -> dict[str, Any]:
+        destination = pick_destination_hotspot(snapshot.hotspots)
+        source = pick_source_hotspot(snapshot.hotspots)
+        return {
+            "status": "ok",
+            "productId": snapshot.product_id,
+            "hotspotRegion": snapshot.summary.primary_region,
+            "hotspotSummary": snapshot.summary_text,
+            "recommendedSourceWarehouse": f"Warehouse: {source.warehouse_name}",
+            "recommendedDestinationWarehouse": f"Warehouse: {destination.warehouse_name}",
+            "suggestedTransferUnits": 500,
+            "coverageRiskDays": destination.coverage_days,
+            "stockoutProbability": snapshot.summary.stockout_probability,
+            "projectedRevenueImpactUsd": snapshot.summary.projected_revenue_impact_usd,
+            "sourceDetail": snapshot.source_detail,
+        }
+
     def _resolve_graph_snapshot(self, product_id: str) -> tuple[GraphSnapshot, str, str]:
         database_error = ""
         if self._database_is_configured():
             try:
                 return (
-                    self._database_graph_snapshot(product_id),
+                    self._cached_graph_snapshot(product_id),
                     "database",
                     "Oracle Database property graph",
                 )
             except Exception as exc:
                 database_error = str(exc)
+        return self._seeded_graph_snapshot(product_id, database_error)
 
+    def _seeded_graph_snapshot(self, product_id: str, database_error: str) -> tuple[GraphSnapshot, str, str]:
         seeded = SEEDED_GRAPH_SNAPSHOTS.get(product_id) or SEEDED_GRAPH_SNAPSHOTS.get(DEFAULT_PRODUCT_ID)
         if seeded is None:
             raise ValueError(f"No supply-chain evidence is available for productId {product_id}.")
@@ -898,10 +1189,12 @@ class InventoryActionTools:
         database_error = ""
         if self._database_is_configured():
             try:
-                return self._database_spatial_snapshot(product_id)
+                return self._cached_spatial_snapshot(product_id)
             except Exception as exc:
                 database_error = str(exc)
+        return self._seeded_spatial_snapshot(product_id, database_error)
 
+    def _seeded_spatial_snapshot(self, product_id: str, database_error: str) -> SpatialSnapshot:
         summary = SEEDED_SUMMARIES.get(product_id) or SEEDED_SUMMARIES[DEFAULT_PRODUCT_ID]
         hotspots = list(SEEDED_HOTSPOTS.get(product_id) or SEEDED_HOTSPOTS[DEFAULT_PRODUCT_ID])
         return SpatialSnapshot(
@@ -928,29 +1221,52 @@ class InventoryActionTools:
         )
         return all(value is not None and str(value).strip() for value in required) and bool(tns_admin)
 
+    def invalidate_evidence(self, product_id: str | None = None) -> None:
+        """Drop cached database evidence for one product, or for every product."""
+        with self._evidence_lock:
+            if product_id is None:
+                self._evidence.clear()
+            else:
+                self._evidence.pop(normalize_product_id(product_id), None)
+
+    def _cached_graph_snapshot(self, product_id: str) -> GraphSnapshot:
+        if not self.evidence_cache_ttl_seconds:
+            return self._database_graph_snapshot(product_id)
+        return self._evidence_fetch(product_id).graph.result()
+
+    def _cached_spatial_snapshot(self, product_id: str) -> SpatialSnapshot:
+        if not self.evidence_cache_ttl_seconds:
+            return self._database_spatial_snapshot(product_id)
+        return self._evidence_fetch(product_id).spatial.result()
+
+    def _evidence_fetch(self, product_id: str) -> EvidenceFetch:
+        # The graph and spatial specialists ask for the same product in one
+        # turn; whichever arrives first starts both queries on separate pooled
+        # connections and the other waits on the same futures.
+        now = time.monotonic()
+        with self._evidence_lock:
+            fetch = self._evidence.get(product_id)
+            if fetch is not None and fetch.expires_at > now:
+                return fetch
+            fetch = EvidenceFetch(
+                graph=_EVIDENCE_EXECUTOR.submit(self._database_graph_snapshot, product_id),
+                spatial=_EVIDENCE_EXECUTOR.submit(self._database_spatial_snapshot, product_id),
+                expires_at=now + self.evidence_cache_ttl_seconds,
+            )
+            self._evidence[product_id] = fetch
+        for future in (fetch.graph, fetch.spatial):
+            future.add_done_callback(lambda done: self._evict_failed(product_id, fetch, done))
+        return fetch
+
+    def _evict_failed(self, product_id: str, fetch: EvidenceFetch, future: Future) -> None:
+        # Failures fall back to seeded evidence; retry the database next time.
+        if future.exception() is not None:
+            with self._evidence_lock:
+                if self._evidence.get(product_id) is fetch:
+                    del self._evidence[product_id]
+
     def _open_connection(self) -> oracledb.Connection:
-        username = first_non_blank(self.environment.get("DB_USERNAME"))
-        password = first_non_blank(self.environment.get("DB_PASSWORD"))
-        dsn = first_non_blank(self.environment.get("DB_DSN"))
-        wallet_password = first_non_blank(self.environment.get("DB_WALLET_PASSWORD"))
-        tns_admin = first_non_blank(
-            self.environment.get("TNS_ADMIN"),
-            self.environment.get("DB_WALLET_DIR"),
-        )
-        if not username or not password or not dsn:
-            raise ValueError("DB_USERNAME, DB_PASSWORD, and DB_DSN must be configured for database access.")
-        if not tns_admin:
-            raise ValueError("TNS_ADMIN or DB_WALLET_DIR must be configured for database access.")
-
-        return oracledb.connect(
-            user=username,
-            password=password,
-            dsn=dsn,
-            config_dir=tns_admin,
-            wallet_location=tns_admin,
-            wallet_password=wallet_password or None,
-            ssl_server_dn_match=False,
-        )
+        return connection_pool(self.environment).acquire()
 
     def _database_graph_snapshot(self, product_id: str) -> GraphSnapshot:
         with self._open_connection() as connection:
@@ -960,28 +1276,7 @@ class InventoryActionTools:
                 if row is None:
                     raise ValueError(f"No Oracle graph path was found for productId {product_id}.")
                 columns = [description[0].lower() for description in cursor.description or []]
-        record = dict(zip(columns, row))
-        return GraphSnapshot(
-            supplier_name=string_value(record.get("supplier_name")),
-            tier_level=record.get("tier_level"),
-            supplier_region=string_value(record.get("supplier_region")),
-            on_time_pct=record.get("on_time_pct"),
-            plant_name=string_value(record.get("plant_name")),
-            cycle_days=record.get("cycle_days"),
-            utilization_pct=record.get("utilization_pct"),
-            port_name=string_value(record.get("port_name")),
-            eta_hours=record.get("eta_hours"),
-            delay_risk_score=record.get("delay_risk_score"),
-            warehouse_name=string_value(record.get("warehouse_name")),
-            inventory_units=record.get("inventory_units"),
-            fill_rate_pct=record.get("fill_rate_pct"),
-            product_id=product_id,
-            demand_change_pct=record.get("demand_change_pct"),
-            margin_pct=record.get("margin_pct"),
-            alert_name=string_value(record.get("alert_name")),
-            lane_name=string_value(record.get("lane_name")),
-            alert_risk=record.get("alert_risk"),
-        )
+        return graph_snapshot_from_record(dict(zip(columns, row)), product_id)
 
     def _database_spatial_snapshot(self, product_id: str) -> SpatialSnapshot:
         with self._open_connection() as connection:
@@ -991,50 +1286,35 @@ class InventoryActionTools:
                 if not rows:
                     raise ValueError(f"No spatial hotspot rows were found for productId {product_id}.")
                 columns = [description[0].lower() for description in cursor.description or []]
-        records = [dict(zip(columns, row)) for row in rows]
-        first = records[0]
-        summary = InventoryRiskSummary(
-            product_id=string_value(first.get("product_id")),
-            product_name=string_value(first.get("product_name")),
-            quarter_label=string_value(first.get("quarter_label")),
-            risk_level=string_value(first.get("overall_risk_level")),
-            stockout_probability=float(first.get("stockout_probability") or 0),
-            projected_revenue_impact_usd=float(first.get("projected_revenue_impact_usd") or 0),
-            primary_region=string_value(first.get("primary_region")),
-            recommendation_summary=string_value(first.get("recommendation_summary")),
-        )
-        hotspots = [
-            WarehouseHotspot(
-                product_id=string_value(record.get("product_id")),
-                warehouse_id=int_value(record.get("warehouse_id"), 0),
-                warehouse_code=string_value(record.get("warehouse_code")),
-                warehouse_name=string_value(record.get("warehouse_name")),
-                county_name=string_value(record.get("county_name")),
-                state_code=string_value(record.get("state_code")),
-                region_name=string_value(record.get("region_name")),
-                latitude=float(record.get("latitude") or 0),
-                longitude=float(record.get("longitude") or 0),
-                hotspot_rank=int_value(record.get("hotspot_rank"), 0),
-                hotspot_score=float(record.get("hotspot_score") or 0),
-                coverage_days=float(record.get("coverage_days") or 0),
-                backlog_units=int_value(record.get("backlog_units"), 0),
-                service_level_pct=float(record.get("service_level_pct") or 0),
-                at_risk_units=int_value(record.get("at_risk_units"), 0),
-                revenue_impact_usd=float(record.get("revenue_impact_usd") or 0),
-                risk_level=string_value(record.get("warehouse_risk_level")),
-                recommended_role=string_value(record.get("recommended_role")),
+        return spatial_snapshot_from_records([dict(zip(columns, row)) for row in rows], product_id)
+
+    def _database_graph_snapshots(self, product_ids: list[str]) -> dict[str, GraphSnapshot]:
+        records = self._fetch_for_products(DATABASE_GRAPH_BATCH_QUERY, product_ids)
+        return {
+            string_value(record.get("product_id")): graph_snapshot_from_record(
+                record, string_value(record.get("product_id"))
             )
             for record in records
-        ]
-        hotspots.sort(key=lambda hotspot: hotspot.hotspot_rank)
-        return SpatialSnapshot(
-            product_id=product_id,
-            summary=summary,
-            hotspots=hotspots,
-            source_mode="database",
-            source_detail="Oracle warehouse hotspot tables",
-            summary_text=build_summary_text(summary, hotspots),
-        )
+        }
+
+    def _database_spatial_snapshots(self, product_ids: list[str]) -> dict[str, SpatialSnapshot]:
+        grouped: dict[str, list[dict[str, Any]]] = {}
+        for record in self._fetch_for_products(HOTSPOT_BATCH_QUERY, product_ids):
+            grouped.setdefault(string_value(record.get("product_id")), []).append(record)
+        return {
+            product_id: spatial_snapshot_from_records(records, product_id)
+            for product_id, records in grouped.items()
+        }
+
+    def _fetch_for_products(self, query: str, product_ids: list[str]) -> list[dict[str, Any]]:
+        # Bind the whole id list as one collection so a batch is a single round trip.
+        with self._open_connection() as connection:
+            id_list = connection.gettype("SYS.ODCIVARCHAR2LIST").newobject(product_ids)
+            with connection.cursor() as cursor:
+                cursor.arraysize = 500
+                cursor.execute(query, product_ids=id_list)
+                columns = [description[0].lower() for description in cursor.description or []]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
 
 class InventoryActionCoordinator:
@@ -1059,6 +1339,136 @@ class InventoryActionCoordinator:
         except Exception as exc:
             return self._run_deterministic_fallback(normalized_input, exc)
 
+    async def run_batch(
+        self,
+        product_ids: Iterable[str],
+        batch_size: int | None = None,
+    ) -> AsyncIterator[InventoryActionResult]:
+        """Plan inventory actions for many products without per-product agent turns.
+
+        Products are split into batches whose graph paths and hotspots are
+        fetched with one set-based query each; every product is then scored by
+        expected revenue at risk and gets a policy check and draft transfer.
+        Results are yielded batch by batch as each completes, highest
+        priority first within a batch.
+        """
+        unique_ids = list(dict.fromkeys(normalize_product_id(product_id) for product_id in product_ids))
+        size = batch_size or max(1, int_value(self.environment.get("ACTION_BATCH_SIZE"), DEFAULT_BATCH_SIZE))
+        # Each batch holds two pooled connections while its queries run.
+        concurrency = max(1, int_value(self.environment.get("ACTION_DB_POOL_MAX"), DEFAULT_DB_POOL_MAX) // 2)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def plan(batch: list[str]) -> list[InventoryActionResult]:
+            async with semaphore:
+                return await asyncio.to_thread(self._plan_batch, batch)
+
+        tasks = [
+            asyncio.create_task(plan(unique_ids[start:start + size]))
+            for start in range(0, len(unique_ids), size)
+        ]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                for result in await completed:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _plan_batch(self, product_ids: list[str]) -> list[InventoryActionResult]:
+        evidence = self.tools.collect_evidence(product_ids)
+        results = []
+        for product_id in product_ids:
+            graph_evidence, spatial_evidence = evidence[product_id]
+            missing = [
+                item for item in (graph_evidence, spatial_evidence)
+                if item.get("status") == NO_EVIDENCE_STATUS
+            ]
+            if missing:
+                # Nothing to score or draft from; rank it last rather than guess
+                results.append(
+                    InventoryActionResult(
+                        response_text=(
+                            f"{product_id}: no evidence found, no transfer drafted. "
+                            + " ".join(string_value(item.get("sourceDetail")) for item in missing)
+                        ).strip(),
+                        trace=[
+                            f"graphEvidence={graph_evidence}",
+                            f"spatialEvidence={spatial_evidence}",
+                        ],
+                        orchestration_mode="batch",
+                        product_id=product_id,
+                        priority_score=0.0,
+                    )
+                )
+                continue
+            external_signals = self.tools.getExternalSignals(product_id)
+            policy_result, draft_result = self._draft_transfer(
+                product_id, graph_evidence, spatial_evidence, external_signals
+            )
+            priority_score = round(
+                float(spatial_evidence.get("stockoutProbability") or 0)
+                * float(spatial_evidence.get("projectedRevenueImpactUsd") or 0),
+                2,
+            )
+            approval_line = (
+                "Approval is required before execution."
+                if policy_result.get("requiresApproval") is True
+                else "Only standard review is required before execution."
+            )
+            results.append(
+                InventoryActionResult(
+                    response_text=(
+                        f"{product_id}: transfer {draft_result['units']} units from "
+                        f"{draft_result['sourceWarehouse']} to {draft_result['destinationWarehouse']} "
+                        f"(expected revenue at risk ${priority_score:,.0f}). {approval_line}"
+                    ),
+                    trace=[
+                        f"graphEvidence={graph_evidence}",
+                        f"spatialEvidence={spatial_evidence}",
+                        f"externalSignals={external_signals}",
+                        f"policyResult={policy_result}",
+                        f"draftResult={draft_result}",
+                    ],
+                    orchestration_mode="batch",
+                    draft_action=draft_result,
+                    policy_result=policy_result,
+                    product_id=product_id,
+                    priority_score=priority_score,
+                )
+            )
+        results.sort(key=lambda result: result.priority_score, reverse=True)
+        return results
+
+    def _draft_transfer(
+        self,
+        product_id: str,
+        graph_evidence: dict[str, Any],
+        spatial_evidence: dict[str, Any],
+        external_signals: dict[str, Any],
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        source_warehouse = string_value(spatial_evidence.get("recommendedSourceWarehouse"))
+        destination_warehouse = string_value(spatial_evidence.get("recommendedDestinationWarehouse"))
+        units = int_value(spatial_evidence.get("suggestedTransferUnits"), 250)
+        reason = combined_reason(
+            string_value(graph_evidence.get("activeAlert")),
+            string_value(external_signals.get("signalSummary")),
+        )
+        policy_result = self.tools.checkTransferPolicy(
+            product_id,
+            source_warehouse,
+            destination_warehouse,
+            units,
+            reason,
+        )
+        draft_result = self.tools.draftInventoryTransferAction(
+            product_id,
+            source_warehouse,
+            destination_warehouse,
+            units,
+            reason,
+        )
+        return policy_result, draft_result
+
     async def _run_adk(self, normalized_input: str, context_id: str | None) -> InventoryActionResult:
         runner = self._ensure_runner()
         user_id = first_non_blank(context_id, "inventory-action-user")
@@ -1116,29 +1526,15 @@ class InventoryActionCoordinator:
         graph_evidence = self.tools.getGraphEvidence(product_id)
         spatial_evidence = self.tools.getSpatialEvidence(product_id)
         external_signals = self.tools.getExternalSignals(product_id)
+        policy_result, draft_result = self._draft_transfer(
+            product_id, graph_evidence, spatial_evidence, external_signals
+        )
 
         source_warehouse = string_value(spatial_evidence.get("recommendedSourceWarehouse"))
         destination_warehouse = string_value(spatial_evidence.get("recommendedDestinationWarehouse"))
         units = int_value(spatial_evidence.get("suggestedTransferUnits"), 250)
-
         active_alert = string_value(graph_evidence.get("activeAlert"))
         signal_summary = string_value(external_signals.get("signalSummary"))
-        reason = combined_reason(active_alert, signal_summary)
-
-        policy_result = self.tools.checkTransferPolicy(
-            product_id,
-            source_warehouse,
-            destination_warehouse,
-            units,
-            reason,
-        )
-        draft_result = self.tools.draftInventoryTransferAction(
-            product_id,
-            source_warehouse,
-            destination_warehouse,
-            units,
-            reason,
-        )
 
         approval_line = (
             "Approval is required before execution."
@@ -26,6 +26,7 @@ from inventory_action_service import (
     InventoryActionCoordinator,
     InventoryActionResult,
     build_rpc_url,
+    extract_product_ids,
 )
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -40,7 +41,7 @@ COORDINATOR = InventoryActionCoordinator(os.environ)
 def build_agent_card() -> AgentCard:
     return AgentCard(
         capabilities=AgentCapabilities(
-            streaming=False,
+            streaming=True,
             pushNotifications=False,
             stateTransitionHistory=False,
             extensions=[],
@@ -80,6 +81,19 @@ def build_agent_card() -> AgentCard:
                 outputModes=["application/json", "text/plain"],
                 tags=["llm", "tools", "inventory"],
             ),
+            AgentSkill(
+                description=(
+                    "Given several product ids (in the text or as a productIds data part), fetch "
+                    "their evidence with set-based queries and stream back one scored draft "
+                    "inventory move per product as each batch completes."
+                ),
+                examples=[],
+                id="oracle_inventory_action_agent-triageInventoryActions",
+                inputModes=["text/plain", "application/json"],
+                name="triageInventoryActions",
+                outputModes=["application/json", "text/plain"],
+                tags=["inventory", "batch"],
+            ),
         ],
         supportsAuthenticatedExtendedCard=False,
         url=RPC_URL,
@@ -105,9 +119,21 @@ def response_metadata(result: InventoryActionResult) -> dict[str, object]:
     if result.draft_action:
         metadata["actionType"] = result.draft_action.get("actionType")
         metadata["draftActionId"] = result.draft_action.get("draftActionId")
+    if result.product_id:
+        metadata["productId"] = result.product_id
+        metadata["priorityScore"] = result.priority_score
     return metadata
 
 
+def requested_product_ids(context) -> list[str]:
+    message = getattr(context, "message", None)
+    for part in getattr(message, "parts", None) or []:
+        root = getattr(part, "root", None)
+        if isinstance(root, DataPart) and isinstance(root.data.get("productIds"), list):
+            return [str(product_id) for product_id in root.data["productIds"]]
+    return extract_product_ids(context.get_user_input(""))
+
+
 class InventoryActionExecutor(AgentExecutor):
     async def execute(self, context, event_queue) -> None:
         updater = TaskUpdater(event_queue, context.task_id, context.context_id)
@@ -117,6 +143,35 @@ class InventoryActionExecutor(AgentExecutor):
         await updater.start_work()
 
         try:
+            product_ids = requested_product_ids(context)
+            if len(product_ids) > 1:
+                planned = 0
+                without_evidence = 0
+                async for result in COORDINATOR.run_batch(product_ids):
+                    await updater.add_artifact(
+                        response_parts(result),
+                        name=f"inventory-action-{result.product_id}",
+                        metadata=response_metadata(result),
+                    )
+                    if result.draft_action:
+                        planned += 1
+                    else:
+                        without_evidence += 1
+                summary = f"Drafted inventory actions for {planned} products."
+                if without_evidence:
+                    summary += f" {without_evidence} products had no inventory evidence and were not planned."
+                await updater.complete(
+                    updater.new_agent_message(
+                        [Part(root=TextPart(text=summary))],
+                        metadata={
+                            "coordinator": "batch",
+                            "productCount": planned,
+                            "noEvidenceCount": without_evidence,
+                        },
+                    )
+                )
+                return
+
             result = await COORDINATOR.run(
                 context.get_user_input(""),
                 context.context_id,
@@ -9,12 +9,13 @@ from __future__ import annotations
 
 import json
 import os
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from urllib.parse import urlparse
 
 import httpx
 from fastapi import FastAPI, Header, HTTPException, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 
 PRIVATE_ORACLE_A2A_URL = os.environ.get("PRIVATE_ORACLE_A2A_URL", "").rstrip("/")
@@ -29,6 +30,11 @@ ORACLE_TOKEN_URL = os.environ.get(
 )
 MAX_REQUEST_BYTES = int(os.environ.get("MAX_REQUEST_BYTES", "1048576"))
 UPSTREAM_TIMEOUT_SECONDS = float(os.environ.get("UPSTREAM_TIMEOUT_SECONDS", "120"))
+UPSTREAM_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("UPSTREAM_CONNECT_TIMEOUT_SECONDS", "10"))
+UPSTREAM_HTTP2 = os.environ.get("UPSTREAM_HTTP2", "true").lower() in {"1", "true", "yes"}
+UPSTREAM_MAX_CONNECTIONS = int(os.environ.get("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get("UPSTREAM_KEEPALIVE_EXPIRY_SECONDS", "60"))
 
 ALLOWED_METHODS = frozenset({"message/send", "message/stream", "tasks/get", "tasks/cancel"})
 
@@ -42,10 +48,28 @@ def validate_configuration() -> None:
         raise RuntimeError("PRIVATE_ORACLE_A2A_URL must use an Oracle ADB hostname")
 
 
+def create_upstream_client() -> httpx.AsyncClient:
+    # One client per process so TCP/TLS connections to the private endpoint
+    # are reused across requests instead of handshaking on every relay call.
+    return httpx.AsyncClient(
+        http2=UPSTREAM_HTTP2,
+        timeout=httpx.Timeout(UPSTREAM_TIMEOUT_SECONDS, connect=UPSTREAM_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
 @asynccontextmanager
-async def lifespan(_app: FastAPI):
+async def lifespan(app: FastAPI):
     validate_configuration()
-    yield
+    app.state.upstream = create_upstream_client()
+    try:
+        yield
+    finally:
+        await app.state.upstream.aclose()
 
 
 app = FastAPI(
@@ -67,7 +91,7 @@ def agent_card() -> dict:
         "url": PUBLIC_A2A_URL,
         "version": "1.0.0",
         "capabilities": {
-            "streaming": False,
+            "streaming": True,
             "pushNotifications": False,
             "stateTransitionHistory": False,
         },
@@ -113,6 +137,16 @@ async def get_agent_card() -> dict:
     return agent_card()
 
 
+async def relay_stream(upstream: httpx.Response) -> AsyncIterator[bytes]:
+    # Closing in finally also returns the connection to the pool when the
+    # caller disconnects mid-stream.
+    try:
+        async for chunk in upstream.aiter_bytes():
+            yield chunk
+    finally:
+        await upstream.aclose()
+
+
 @app.post("/")
 async def relay(
     request: Request,
@@ -143,11 +177,25 @@ async def relay(
     if request_id:
         headers["X-Request-Id"] = request_id[:128]
 
-    async with httpx.AsyncClient(timeout=UPSTREAM_TIMEOUT_SECONDS) as client:
-        upstream = await client.post(PRIVATE_ORACLE_A2A_URL, content=body, headers=headers)
+    client: httpx.AsyncClient = request.app.state.upstream
+    upstream_request = client.build_request("POST", PRIVATE_ORACLE_A2A_URL, content=body, headers=headers)
+    upstream = await client.send(upstream_request, stream=True)
 
     content_type = upstream.headers.get("content-type", "application/json")
-    return Response(content=upstream.content, status_code=upstream.status_code, media_type=content_type)
+    if content_type.startswith("text/event-stream"):
+        # Pass message/stream events through as they arrive.
+        return StreamingResponse(
+            relay_stream(upstream),
+            status_code=upstream.status_code,
+            media_type=content_type,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    try:
+        content = await upstream.aread()
+    finally:
+        await upstream.aclose()
+    return Response(content=content, status_code=upstream.status_code, media_type=content_type)
 
 
 @app.exception_handler(httpx.RequestError)
@@ -20,6 +20,7 @@ def test_card_advertises_public_relay_and_oauth():
     card = response.json()
     assert card["url"] == "https://relay.example.test"
     assert card["security"][0]["oauth2"] == ["openid"]
+    assert card["capabilities"]["streaming"] is True
 
 
 def test_relay_requires_bearer_token():
@@ -36,3 +37,58 @@ def test_relay_rejects_unapproved_method():
             json={"jsonrpc": "2.0", "method": "admin/delete", "id": "1"},
         )
     assert response.status_code == 400
+
+
+def use_upstream(client, handler):
+    client.app.state.upstream = main.httpx.AsyncClient(transport=main.httpx.MockTransport(handler))
+
+
+def test_relay_reuses_shared_upstream_client(monkeypatch):
+    seen = []
+    senders = []
+    created = []
+
+    def handler(request):
+        seen.append(request.headers["authorization"])
+        return main.httpx.Response(200, json={"jsonrpc": "2.0", "id": "1", "result": {}})
+
+    class RecordingClient(main.httpx.AsyncClient):
+        async def send(self, request, **kwargs):
+            senders.append(self)
+            return await super().send(request, **kwargs)
+
+    def create_upstream_client():
+        created.append(RecordingClient(transport=main.httpx.MockTransport(handler)))
+        return created[-1]
+
+    monkeypatch.setattr(main, "create_upstream_client", create_upstream_client)
+    with TestClient(main.app) as client:
+        for _ in range(2):
+            response = client.post(
+                "/",
+                headers={"Authorization": "Bearer not-a-real-token"},
+                json={"jsonrpc": "2.0", "method": "tasks/get", "id": "1"},
+            )
+            assert response.status_code == 200
+            assert response.json()["result"] == {}
+    assert seen == ["Bearer not-a-real-token"] * 2
+    assert len(created) == 1
+    assert senders == [created[0], created[0]]
+
+
+def test_relay_streams_event_stream_responses():
+    events = b'data: {"kind": "status-update"}\n\ndata: {"kind": "artifact-update"}\n\n'
+
+    def handler(_request):
+        return main.httpx.Response(200, headers={"content-type": "text/event-stream"}, content=events)
+
+    with TestClient(main.app) as client:
+        use_upstream(client, handler)
+        with client.stream(
+            "POST",
+            "/",
+            headers={"Authorization": "Bearer not-a-real-token"},
+            json={"jsonrpc": "2.0", "method": "message/stream", "id": "1"},
+        ) as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            assert b"".join(response.iter_bytes()) == events